@@ -0,0 +1,52 @@
+#!/usr/bin/env python
+"""
+Measures the number of assertions per second recorded by a testcase
+result object for each code location capture mode.
+
+Usage: python scripts/benchmarks/assertions.py [--count 100000]
+"""
+
+import argparse
+import inspect
+import time
+
+from testplan.testing.multitest import result as result_mod
+from testplan.testing.multitest.result import Result, CaptureMode
+
+
+def stack_capture_location(entry, mode, depth=2):
+    """Former capture using ``inspect.stack()``, kept as a reference."""
+    caller_frame = inspect.stack()[depth]
+    entry.file_path = caller_frame[1]
+    entry.line_no = caller_frame[2]
+
+
+def run(count, capture_mode):
+    result = Result(capture_mode=capture_mode)
+    start = time.time()
+    for idx in range(count):
+        result.equal(idx, idx)
+    return count / (time.time() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--count', type=int, default=100000)
+    args = parser.parse_args()
+
+    rates = [(mode, run(args.count, mode))
+             for mode in (CaptureMode.FULL, CaptureMode.OFF)]
+
+    capture_location = result_mod.capture_location
+    result_mod.capture_location = stack_capture_location
+    try:
+        rates.append(('inspect.stack', run(args.count, CaptureMode.FULL)))
+    finally:
+        result_mod.capture_location = capture_location
+
+    for mode, rate in rates:
+        print('{:<15} {:>12,.0f} assertions/sec'.format(mode, rate))
+
+
+if __name__ == '__main__':
+    main()
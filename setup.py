@@ -35,7 +35,8 @@ REQUIRED = [
     'sklearn',
     'numpy',
     'matplotlib',
-    'requests>=2.4.3'
+    'requests>=2.4.3',
+    'msgpack'
 ]
 
 
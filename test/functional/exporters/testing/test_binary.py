@@ -0,0 +1,78 @@
+import os
+
+from testplan.testing.multitest import MultiTest, testsuite, testcase
+
+from testplan import Testplan
+from testplan.common.utils.testing import (
+    log_propagation_disabled, argv_overridden
+)
+from testplan.exporters.testing import BinaryExporter
+from testplan.logger import TESTPLAN_LOGGER
+from testplan.report.testing.binary import BinaryReportReader
+from testplan.report.testing.schemas import TestReportSchema
+
+
+@testsuite
+class Alpha(object):
+
+    @testcase
+    def test_comparison(self, env, result):
+        result.equal(1, 1, 'equality description')
+
+    @testcase
+    def test_membership(self, env, result):
+        result.contain(1, [1, 2, 3])
+
+
+@testsuite
+class Beta(object):
+
+    @testcase
+    def test_failure(self, env, result):
+        result.equal(1, 2, 'failing assertion')
+        result.equal(5, 10)
+
+
+def test_binary_exporter(tmpdir):
+    """
+    Binary Exporter should generate a report at the given `binary_path`
+    that loads back to the same serialized report.
+    """
+    binary_path = tmpdir.mkdir('reports').join('report.bin').strpath
+
+    with log_propagation_disabled(TESTPLAN_LOGGER):
+        plan = Testplan(
+            name='plan', parse_cmdline=False,
+            exporters=BinaryExporter(binary_path=binary_path)
+        )
+        multitest_1 = MultiTest(name='Primary', suites=[Alpha()])
+        multitest_2 = MultiTest(name='Secondary', suites=[Beta()])
+        plan.add(multitest_1)
+        plan.add(multitest_2)
+        plan.run()
+
+    assert os.path.exists(binary_path)
+
+    schema = TestReportSchema(strict=True)
+    with BinaryReportReader(binary_path) as reader:
+        assert schema.dump(reader.load()).data == \
+            schema.dump(plan.report).data
+
+
+def test_implicit_exporter_initialization(tmpdir):
+    """
+        An implicit binary report should be generated if `binary_path` is
+        available via cmdline args but no exporters were declared
+        programmatically.
+    """
+    binary_path = tmpdir.mkdir('reports').join('report.bin').strpath
+
+    with log_propagation_disabled(TESTPLAN_LOGGER):
+        with argv_overridden('--binary', binary_path):
+            plan = Testplan(name='plan')
+            multitest_1 = MultiTest(name='Primary', suites=[Alpha()])
+            plan.add(multitest_1)
+            plan.run()
+
+    assert os.path.exists(binary_path)
+    assert os.stat(binary_path).st_size > 0
@@ -1,4 +1,8 @@
 import os
+import gzip
+import json
+
+import pytest
 
 from testplan.testing.multitest import MultiTest, testsuite, testcase
 
@@ -8,6 +12,7 @@ from testplan.common.utils.testing import (
 )
 from testplan.exporters.testing import JSONExporter
 from testplan.logger import TESTPLAN_LOGGER
+from testplan.report.testing.schemas import TestReportSchema
 
 
 @testsuite
@@ -72,3 +77,29 @@ def test_implicit_exporter_initialization(tmpdir):
 
     assert os.path.exists(json_path)
     assert os.stat(json_path).st_size > 0
+
+
+@pytest.mark.parametrize('filename', ('report.json', 'report.json.gz'))
+def test_json_exporter_stream(tmpdir, filename):
+    """
+    Streamed JSON report, gzip compressed for `.gz` paths, should load to
+    the same data as the report serialization.
+    """
+    json_path = tmpdir.mkdir('reports').join(filename).strpath
+
+    with log_propagation_disabled(TESTPLAN_LOGGER):
+        plan = Testplan(
+            name='plan', parse_cmdline=False,
+            exporters=JSONExporter(json_path=json_path)
+        )
+        plan.add(MultiTest(name='Primary', suites=[Alpha()]))
+        plan.add(MultiTest(name='Secondary', suites=[Beta()]))
+        plan.run()
+
+    opener = gzip.open if filename.endswith('.gz') else open
+    with opener(json_path, 'rb') as json_file:
+        data = json.loads(json_file.read().decode('utf-8'))
+
+    expected = json.loads(
+        json.dumps(TestReportSchema(strict=True).dump(plan.report).data))
+    assert data == expected
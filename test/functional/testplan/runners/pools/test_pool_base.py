@@ -1,13 +1,17 @@
 """TODO."""
 
 import os
+import time
 
 from testplan.common.utils.testing import log_propagation_disabled
+from testplan.common.utils.history import DurationHistory, history_key
 
 from testplan import Testplan, Task
 from testplan.testing.multitest import MultiTest, testsuite, testcase
 from testplan.testing.multitest.base import MultiTestConfig
 from testplan.runners.pools.base import Pool, Worker
+from testplan.testing.multitest.driver.base import Driver
+from testplan.testing.filtering import Pattern
 from testplan.logger import TESTPLAN_LOGGER
 
 
@@ -87,3 +91,205 @@ def test_pool_custom_worker():
     class ThreadWorker(Worker):
         pass
     schedule_tests_to_pool(Pool, worker_type=ThreadWorker, size=1)
+
+
+def test_pool_prefetch():
+    schedule_tests_to_pool(Pool, size=2, max_inflight_per_worker=3)
+
+
+def test_duration_history(tmpdir):
+    """Runner records test durations that its pools reuse on next run."""
+    history_path = os.path.join(str(tmpdir), 'history.db')
+
+    def run_plan():
+        plan = Testplan(name='Plan', parse_cmdline=False,
+                        runpath=os.path.join(str(tmpdir), 'runpath'),
+                        duration_history=history_path)
+        pool = Pool(name='MyPool', size=2)
+        plan.add_resource(pool)
+        for idx in range(3):
+            plan.schedule(Task(target=get_mtest_named, args=(idx,)),
+                          resource='MyPool')
+        with log_propagation_disabled(TESTPLAN_LOGGER):
+            assert plan.run().run is True
+        return plan, pool
+
+    plan, pool = run_plan()
+    history = DurationHistory(path=history_path)
+    signatures = [Task(target=get_mtest_named, args=(idx,)).signature
+                  for idx in range(3)]
+    for signature in signatures:
+        assert signature in history
+        assert history.keys(prefix=signature) == [
+            signature,
+            history_key(signature, 'MySuite'),
+            history_key(signature, 'MySuite', 'test_comparison')]
+    assert len(history.keys()) == 9  # 3 tasks with a suite and testcase
+    history.close()
+
+    plan, pool = run_plan()
+    assert all(pool.task_cost(uid) is not None for uid in pool.tasks)
+
+
+def test_duration_history_default(tmpdir):
+    """No history database is created unless a path is given."""
+    runpath = os.path.join(str(tmpdir), 'runpath')
+    plan = Testplan(name='Plan', parse_cmdline=False, runpath=runpath)
+    pool = Pool(name='MyPool', size=2)
+    plan.add_resource(pool)
+    plan.schedule(Task(target=get_mtest_named, args=(0,)), resource='MyPool')
+    with log_propagation_disabled(TESTPLAN_LOGGER):
+        assert plan.run().run is True
+    assert plan.history.path is None
+    assert os.listdir(str(tmpdir)) == ['runpath']
+
+
+def get_mtest_named(idx):
+    return MultiTest(name='MTest{}'.format(idx), suites=[MySuite()])
+
+
+def test_filtered_tasks_materialized_once():
+    """Tasks materialized to apply test filters are not created again."""
+    created = []
+
+    def get_counted_mtest(idx):
+        created.append(idx)
+        return get_mtest_named(idx)
+
+    plan = Testplan(name='Plan', parse_cmdline=False,
+                    test_filter=Pattern('MTest1') | Pattern('MTest3'))
+    plan.add_resource(Pool(name='MyPool', size=2))
+    for idx in range(4):
+        plan.schedule(Task(target=get_counted_mtest, args=(idx,)),
+                      resource='MyPool')
+
+    with log_propagation_disabled(TESTPLAN_LOGGER):
+        assert plan.run().run is True
+
+    assert plan.report.passed is True
+    assert sorted(entry.name for entry in plan.report.entries) ==\
+        ['MTest1', 'MTest3']
+    assert sorted(created) == [0, 1, 2, 3]
+
+
+def test_filtered_tasks_not_cached_for_process_workers():
+    """Tasks executed in other processes do not keep a cached target."""
+    class ChildWorker(Worker):
+        IN_PROCESS = False
+
+    plan = Testplan(name='Plan', parse_cmdline=False,
+                    test_filter=Pattern('MTest1'))
+    plan.add_resource(Pool(name='ThreadPool', size=1))
+    plan.add_resource(Pool(name='ChildPool', size=1, worker_type=ChildWorker))
+    tasks = {name: Task(target=get_mtest_named, args=(1,))
+             for name in ('ThreadPool', 'ChildPool')}
+    for name, task in tasks.items():
+        plan.schedule(task, resource=name)
+
+    cached = tasks['ThreadPool']._materialized
+    assert cached.parent is None and cached.cfg.parent is None
+    assert tasks['ChildPool']._materialized is None
+
+
+@testsuite
+class SlowSuite(object):
+
+    @testcase
+    def test_slow(self, env, result):
+        time.sleep(0.2)
+        result.true(True)
+
+
+def get_slow_mtest(idx):
+    return MultiTest(name='SlowMTest{}'.format(idx), suites=[SlowSuite()])
+
+
+def test_work_stealing():
+    """Idle pool executes tasks scheduled to a busy pool."""
+    plan = Testplan(name='Plan', parse_cmdline=False, work_stealing=True)
+    busy = Pool(name='Busy', size=1)
+    idle = Pool(name='Idle', size=2)
+    plan.add_resource(busy)
+    plan.add_resource(idle)
+    uids = [plan.schedule(Task(target=get_slow_mtest, args=(idx,)),
+                          resource='Busy')
+            for idx in range(6)]
+
+    with log_propagation_disabled(TESTPLAN_LOGGER):
+        assert plan.run().run is True
+
+    assert plan.report.passed is True
+    assert sorted(entry.name for entry in plan.report.entries) ==\
+        sorted('SlowMTest{}'.format(idx) for idx in range(6))
+    assert idle.results
+    assert len(busy.results) + len(idle.results) == len(uids)
+
+
+def test_work_stealing_check():
+    """Tasks are not moved if the steal check rejects them."""
+    plan = Testplan(name='Plan', parse_cmdline=False, work_stealing=True)
+    busy = Pool(name='Busy', size=1)
+    idle = Pool(name='Idle', size=2)
+    plan.add_resource(busy)
+    plan.add_resource(idle)
+    plan.set_steal_check(lambda task, source, target: False)
+    for idx in range(3):
+        plan.schedule(Task(target=get_slow_mtest, args=(idx,)),
+                      resource='Busy')
+
+    with log_propagation_disabled(TESTPLAN_LOGGER):
+        assert plan.run().run is True
+
+    assert len(busy.results) == 3
+    assert not idle.results
+
+
+class CountingDriver(Driver):
+    """Driver that records its starts, resets and stops."""
+
+    events = []
+
+    def starting(self):
+        super(CountingDriver, self).starting()
+        self.events.append(('start', self.cfg.name))
+
+    def stopping(self):
+        super(CountingDriver, self).stopping()
+        self.events.append(('stop', self.cfg.name))
+
+    def reset(self):
+        self.events.append(('reset', self.cfg.name))
+
+
+@testsuite
+class DriverSuite(object):
+
+    @testcase
+    def test_driver(self, env, result):
+        result.equal(env.driver.status.tag, env.driver.STATUS.STARTED)
+
+
+def get_driver_mtest(idx, timeout):
+    return MultiTest(name='DriverMTest{}'.format(idx), suites=[DriverSuite()],
+                     environment=[CountingDriver(name='driver',
+                                                 timeout=timeout)],
+                     shared_environment=True)
+
+
+def test_shared_environment():
+    """Workers reuse the environment of consecutive equivalent MultiTests."""
+    CountingDriver.events = []
+    plan = Testplan(name='Plan', parse_cmdline=False)
+    plan.add_resource(Pool(name='MyPool', size=1))
+    for idx, timeout in enumerate((5, 5, 5, 6)):
+        plan.schedule(Task(target=get_driver_mtest, args=(idx, timeout)),
+                      resource='MyPool')
+
+    with log_propagation_disabled(TESTPLAN_LOGGER):
+        assert plan.run().run is True
+
+    assert plan.report.passed is True
+    assert plan.report.counts.passed == 4
+    assert CountingDriver.events == [
+        ('start', 'driver'), ('reset', 'driver'), ('reset', 'driver'),
+        ('stop', 'driver'), ('start', 'driver'), ('stop', 'driver')]
@@ -22,6 +22,14 @@ def test_pool_basic():
                            heartbeats_miss_limit=2)
 
 
+def test_pool_prefetch():
+    """Workers pull and execute tasks in batches."""
+    schedule_tests_to_pool('ProcPlan', ProcessPool,
+                           worker_heartbeat=2,
+                           heartbeats_miss_limit=2,
+                           max_inflight_per_worker=3)
+
+
 def test_kill_one_worker():
     """Kill one worker but pass after reassigning task."""
     pool_name = ProcessPool.__name__
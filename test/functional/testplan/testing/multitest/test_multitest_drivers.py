@@ -2,6 +2,9 @@
 
 import os
 
+import pytest
+from schema import SchemaError
+
 from testplan.testing.multitest import MultiTest, testsuite, testcase
 
 from testplan import Testplan
@@ -135,3 +138,43 @@ def test_multitest_drivers_in_testplan():
         assert client.runpath == os.path.join(mtest.runpath, client.uid())
         assert server.status.tag == ResourceStatus.STOPPED
         assert client.status.tag == ResourceStatus.STOPPED
+
+
+def test_multitest_drivers_parallel_start():
+    """Drivers started concurrently in dependency order."""
+    server = TCPServer(name='server')
+    client = TCPClient(name='client',
+                       host=context(server.cfg.name, '{{host}}'),
+                       port=context(server.cfg.name, '{{port}}'))
+    other = TCPServer(name='other', depends_on=[])
+    mtest = MultiTest(name='Mtest', suites=[MySuite()],
+                      environment=[server, client, other],
+                      initial_context={'test_key': 'test_value'},
+                      parallel_start=True)
+    assert mtest.resources.dependencies() == {
+        'server': [], 'client': ['server'], 'other': []}
+    mtest.run()
+    res = mtest.result
+    assert res.run is True
+    assert not mtest.resources.start_exceptions
+    assert not mtest.resources.stop_exceptions
+    for driver in (server, client, other):
+        assert driver.status.tag == ResourceStatus.STOPPED
+
+    # Only the owners of an environment accept the option.
+    with pytest.raises(SchemaError):
+        TCPServer(name='server', parallel_start=True)
+
+
+def test_multitest_drivers_circular_dependencies():
+    """Circular dependencies are reported as a start failure."""
+    first = TCPServer(name='first', depends_on=['second'])
+    second = TCPServer(name='second', depends_on=['first'])
+    mtest = MultiTest(name='Mtest', suites=[MySuite()],
+                      environment=[first, second], parallel_start=True)
+    mtest.run()
+    exceptions = list(mtest.resources.start_exceptions.values())
+    assert len(exceptions) == 1
+    assert 'Circular resource dependencies' in exceptions[0]
+    assert first.status.tag == ResourceStatus.NONE
+    assert second.status.tag == ResourceStatus.NONE
@@ -0,0 +1,136 @@
+"""Concurrent execution of suites and testcases within a MultiTest."""
+
+import threading
+
+from testplan import Testplan
+from testplan.common.utils.testing import log_propagation_disabled
+from testplan.logger import TESTPLAN_LOGGER
+from testplan.report.testing import Status
+from testplan.testing.multitest import MultiTest, testsuite, testcase
+
+
+def rendezvous(own, other, timeout=5):
+    """Passes only if the other side runs at the same time."""
+    own.set()
+    return other.wait(timeout)
+
+
+@testsuite
+class GroupedSuite(object):
+
+    def __init__(self):
+        self.first = threading.Event()
+        self.second = threading.Event()
+
+    @testcase(execution_group='group')
+    def case_first(self, env, result):
+        result.true(rendezvous(self.first, self.second))
+
+    @testcase
+    def case_serial(self, env, result):
+        result.false(self.first.is_set() or self.second.is_set())
+
+    @testcase(execution_group='group')
+    def case_second(self, env, result):
+        result.true(rendezvous(self.second, self.first))
+
+
+@testsuite
+class FirstSuite(object):
+
+    def __init__(self, own, other):
+        self.own = own
+        self.other = other
+
+    @testcase
+    def case(self, env, result):
+        result.true(rendezvous(self.own, self.other))
+
+
+@testsuite
+class SecondSuite(object):
+
+    def __init__(self, own, other):
+        self.own = own
+        self.other = other
+
+    @testcase
+    def case(self, env, result):
+        result.true(rendezvous(self.own, self.other))
+
+
+@testsuite
+class FailingGroupSuite(object):
+
+    @testcase(execution_group='group')
+    def case_error(self, env, result):
+        raise RuntimeError('Grouped testcase error.')
+
+    @testcase(execution_group='group')
+    def case_pass(self, env, result):
+        result.true(True)
+
+    @testcase(execution_group='other')
+    def case_not_run(self, env, result):
+        result.true(True)
+
+
+def run_multitest(**options):
+    plan = Testplan(name='Plan', parse_cmdline=False)
+    plan.add(MultiTest(name='MTest', **options))
+    with log_propagation_disabled(TESTPLAN_LOGGER):
+        plan.run()
+    return plan.report.entries[0]
+
+
+def test_execution_group():
+    """
+    Testcases of a group run together, after the other testcases, and are
+    reported in their definition order.
+    """
+    report = run_multitest(suites=[GroupedSuite()], thread_pool_size=2)
+    assert report.passed is True
+    assert [entry.name for entry in report.entries[0].entries] == \
+        ['case_first', 'case_serial', 'case_second']
+
+
+def test_execution_group_no_thread_pool():
+    """Execution groups are ignored without a thread pool."""
+    suite = GroupedSuite()
+    suite.first.set()
+    suite.second.set()
+    report = run_multitest(suites=[suite])
+    assert [entry.name for entry in report.entries[0].entries] == \
+        ['case_first', 'case_serial', 'case_second']
+
+
+def test_parallel_suites():
+    """Suites run together, reports keep the suites order."""
+    first, second = threading.Event(), threading.Event()
+    report = run_multitest(
+        suites=[FirstSuite(first, second), SecondSuite(second, first)],
+        thread_pool_size=2, parallel_suites=True)
+    assert report.passed is True
+    assert [entry.name for entry in report.entries] == \
+        ['FirstSuite', 'SecondSuite']
+
+
+def test_execution_group_error():
+    """Suite execution stops after the group of a testcase that raised."""
+    report = run_multitest(suites=[FailingGroupSuite()], thread_pool_size=2)
+    suite_report = report.entries[0]
+    assert [entry.name for entry in suite_report.entries] == \
+        ['case_error', 'case_pass']
+    assert suite_report.entries[0].status == Status.ERROR
+    assert suite_report.entries[1].passed is True
+
+
+def test_parallel_suites_no_testcases():
+    """Parallel suites with all testcases filtered out."""
+    from testplan.testing.filtering import Pattern
+
+    report = run_multitest(
+        suites=[GroupedSuite()], thread_pool_size=2, parallel_suites=True,
+        test_filter=Pattern('MTest:OtherSuite'))
+    assert report.status != Status.ERROR
+    assert report.entries == []
@@ -318,3 +318,30 @@ class TestReportGroup(object):
 
         assert filtered.entries[1].name == 'beta'
         assert filtered.entries[1].entries == []  # children filtered out, names don't match
+
+    def test_filter_shares_leaf_entries(self):
+        """
+        Filter operation should copy the report nodes without modifying
+        the original, and share the kept leaf entries with it.
+        """
+        entry = {'value': 1}
+        child_1 = DummyReport(name='foo', entries=[entry, {'value': 2}])
+        child_2 = DummyReport(name='bar', entries=[])
+        root = DummyReportGroup(name='root', entries=[child_1, child_2])
+
+        filtered = root.filter(
+            lambda obj: not isinstance(obj, report.Report) or
+            obj.name != 'bar',
+            lambda obj: isinstance(obj, dict) and obj['value'] == 1)
+
+        assert [child.name for child in filtered] == ['foo']
+        assert filtered.entries[0] is not child_1
+        assert filtered.entries[0].entries[0] is entry
+        assert filtered.get_by_uid(child_1.uid) is filtered.entries[0]
+
+        assert root.entries == [child_1, child_2]
+        assert len(child_1.entries) == 2
+        assert root.get_by_uid(child_1.uid) is child_1
+
+        filtered.entries[0].logger.info('filtered only')
+        assert child_1.logs == []
@@ -0,0 +1,141 @@
+"""Tests for FIX message framing and batching of the FIX server and client."""
+
+import time
+
+import pytest
+
+from testplan.common.utils.sockets.fix.client import Client
+from testplan.common.utils.sockets.fix.server import Server
+from testplan.common.utils.sockets.fix.utils import FixFramer, SOH
+
+
+class DummyFixMessage(dict):
+    """Minimal FIX message with the wire format of pyfixmsg messages."""
+
+    def __setitem__(self, tag, value):
+        if not isinstance(value, bytes):
+            value = str(value).encode('utf-8')
+        super(DummyFixMessage, self).__setitem__(int(tag), value)
+
+    @classmethod
+    def from_dict(cls, tags):
+        msg = cls()
+        for tag, value in tags.items():
+            msg[tag] = value
+        return msg
+
+    @classmethod
+    def from_buffer(cls, data, codec):
+        return cls.from_dict(dict(
+            field.split(b'=', 1) for field in data.split(SOH)[:-1]))
+
+    def tag_exact(self, tag, value):
+        return self.get(tag) == value
+
+    def to_wire(self, codec):
+        body = b''.join(
+            str(tag).encode('utf-8') + b'=' + self[tag] + SOH
+            for tag in [35] + sorted(set(self) - {8, 9, 10, 35}))
+        head = b'8=' + self[8] + SOH + \
+            b'9=' + str(len(body)).encode('utf-8') + SOH
+        checksum = sum(bytearray(head + body)) % 256
+        return head + body + b'10=' + '{:03d}'.format(
+            checksum).encode('utf-8') + SOH
+
+
+def wire(**tags):
+    msg = DummyFixMessage.from_dict({8: 'FIX.4.2', 35: 'D'})
+    for tag, value in tags.items():
+        msg[tag[1:]] = value
+    return msg.to_wire(None)
+
+
+def test_framer():
+    """Messages should be framed across reads by BodyLength and CheckSum."""
+    msgs = [wire(_11=idx, _58='text with 10=fake' * idx) for idx in range(5)]
+    data = b''.join(msgs)
+
+    framer = FixFramer()
+    assert framer.feed(data) == msgs
+    assert framer.pending == 0
+
+    for size in (1, 7, 64):
+        framer = FixFramer()
+        received = []
+        for idx in range(0, len(data), size):
+            received.extend(framer.feed(data[idx:idx + size]))
+        assert received == msgs
+        assert framer.pending == 0
+
+    framer = FixFramer()
+    assert framer.feed(msgs[0] + msgs[1][:-3]) == [msgs[0]]
+    assert framer.pending == len(msgs[1]) - 3
+    assert framer.feed(msgs[1][-3:]) == [msgs[1]]
+
+    with pytest.raises(ValueError):
+        FixFramer().feed(b'35=D' + SOH)
+    with pytest.raises(ValueError):
+        FixFramer().feed(msgs[0].replace(b'35=D', b'35=DX'))
+
+
+def test_server_client_bursts():
+    """Coalesced and split messages should be received one by one."""
+    server = Server(msgclass=DummyFixMessage, codec=None)
+    server.start()
+    client = Client(msgclass=DummyFixMessage, codec=None, host=server.ip,
+                    port=server.port, sender='ISLD', target='TW')
+    try:
+        client.connect()
+        client.sendlogon()
+        assert client.receive(timeout=5).tag_exact(35, b'A')
+
+        msgs = [client._populate_tags(DummyFixMessage.from_dict(
+            {35: 'D', 11: idx, 58: 'x' * 100 * idx})) for idx in range(20)]
+        data = b''.join(msg.to_wire(None) for msg in msgs)
+        client.socket.sendall(data[:len(data) // 2 + 3])
+        time.sleep(0.1)
+        client.socket.sendall(data[len(data) // 2 + 3:])
+
+        for idx in range(20):
+            assert server.receive(timeout=5)[11] == str(idx).encode('utf-8')
+
+        for idx in range(20):
+            server.send(DummyFixMessage.from_dict({35: '8', 11: idx}))
+        for idx in range(20):
+            assert client.receive(timeout=5)[11] == str(idx).encode('utf-8')
+    finally:
+        client.close()
+        server.stop()
+
+
+def test_server_client_many():
+    """Batches of messages should be stamped, sent and received in order."""
+    server = Server(msgclass=DummyFixMessage, codec=None)
+    server.start()
+    client = Client(msgclass=DummyFixMessage, codec=None, host=server.ip,
+                    port=server.port, sender='ISLD', target='TW')
+    try:
+        client.connect()
+        client.sendlogon()
+        assert client.receive(timeout=5).tag_exact(35, b'A')
+
+        client.send_many([DummyFixMessage.from_dict({35: 'D', 11: idx})
+                          for idx in range(50)])
+        received = server.receive_many(50, timeout=5)
+        assert [msg[11] for msg in received] == [
+            str(idx).encode('utf-8') for idx in range(50)]
+        assert [int(msg[34]) for msg in received] == list(range(2, 52))
+        assert server.receive_many(1, timeout=0.1) == []
+        assert server.receive_many(1, timeout=0) == []
+        assert client.receive_many(1, timeout=0) == []
+
+        sent = server.send_many([DummyFixMessage.from_dict({35: '8', 11: idx})
+                                 for idx in range(50)])
+        assert len(set(msg[52] for msg in sent)) == 1
+        received = client.receive_many(60, timeout=0.5)
+        assert [msg[11] for msg in received] == [
+            str(idx).encode('utf-8') for idx in range(50)]
+        assert [int(msg[34]) for msg in received] == list(range(2, 52))
+    finally:
+        client.close()
+        server.stop()
@@ -1,6 +1,14 @@
 """TODO."""
 
+import os
+import socket
+import threading
+
+import pytest
+import six
+
 from testplan.common.utils.sockets import Server, Client
+from testplan.common.utils.sockets.buffer import frame
 
 
 def test_basic_server_client():
@@ -83,3 +91,82 @@ def test_two_clients():
     client2.close()
     server.close()
 
+
+
+def test_framed_messages():
+    server = Server()
+    server.bind()
+    server.serve()
+    client = Client(host=server.ip, port=server.port)
+    client.connect()
+    conn_idx = server.accept_connection()
+
+    try:
+        # Several delimited and length prefixed messages in a single write
+        client.send(b'first\r\nsecond\r\n' + frame(b'third') + b'tail')
+        assert server.receive_until(b'\r\n', conn_idx=conn_idx) == b'first'
+        assert server.receive_until(b'\r\n', conn_idx=conn_idx) == b'second'
+        assert server.receive_frame(conn_idx=conn_idx) == b'third'
+        assert server.receive(4, conn_idx=conn_idx) == b'tail'
+
+        # Partial data is kept on timeout
+        client.send(b'no delimiter')
+        with pytest.raises(socket.timeout):
+            server.receive_until(b'\r\n', conn_idx=conn_idx, timeout=0.1)
+        client.send(b'\r\n')
+        assert server.receive_until(
+            b'\r\n', conn_idx=conn_idx) == b'no delimiter'
+
+        with pytest.raises(socket.timeout):
+            server.receive(10, conn_idx=conn_idx, timeout=0)
+
+        # Payload larger than the initial buffer, received in pieces
+        payload = os.urandom(3 * 1024 * 1024 + 5)
+
+        def send():
+            server.send_frame(payload, conn_idx=conn_idx)
+            server.send(b'end', conn_idx=conn_idx)
+
+        sender = threading.Thread(target=send)
+        sender.start()
+        assert client.receive_frame() == payload
+        assert client.receive(3, wait_full_size=True) == b'end'
+        sender.join()
+    finally:
+        client.close()
+        server.close()
+
+
+@pytest.mark.skipif(six.PY2, reason='Event loop requires Python 3.')
+def test_async_receive_until_buffered(monkeypatch):
+    """Delimited reads do not rely on StreamReader.readuntil."""
+    import asyncio
+    from testplan.common.utils.sockets.aio import (
+        AsyncServer, AsyncClient, Blocking, EventLoopThread)
+
+    monkeypatch.delattr(asyncio.StreamReader, 'readuntil', raising=False)
+    owner = object()
+    event_loop = EventLoopThread.acquire(owner)
+    server = Blocking(AsyncServer(), event_loop)
+    try:
+        server.start()
+        client = Blocking(AsyncClient(host=server.ip, port=server.port),
+                          event_loop)
+        client.connect()
+        assert server.accept_connection() == 0
+
+        client.send(b'first\r')
+        client.send(b'\nsecond\r\nrest')
+        assert server.receive_until(b'\r\n') == b'first'
+        assert server.receive_until(b'\r\n') == b'second'
+        with pytest.raises(socket.timeout):
+            server.receive_until(b'\r\n', timeout=0.1)
+        assert server.receive(4) == b'rest'
+
+        client.send(b'toolong\n')
+        with pytest.raises(ValueError):
+            server.receive_until(b'\n', max_size=3)
+        client.close()
+    finally:
+        server.close()
+        EventLoopThread.release(owner)
@@ -1,3 +1,7 @@
+import re
+import random
+import itertools
+
 import pytest
 from testplan.common.utils import comparison as cmp
 
@@ -91,3 +95,95 @@ def test_comparator_composition(
 ):
     assert composed_callable(value) == expected
     assert str(composed_callable) == description
+
+
+def permutation_cost(grid, permutation):
+    return sum(grid[row][col] for row, col in enumerate(permutation))
+
+
+@pytest.mark.parametrize(
+    'solver',
+    (
+        cmp._assignment,
+        pytest.param(
+            cmp._assignment_numpy,
+            marks=pytest.mark.skipif(
+                cmp.numpy is None, reason='NumPy is not installed')),
+    )
+)
+def test_assignment(solver):
+    rand = random.Random(0)
+    for _ in range(500):
+        size = rand.randint(1, 6)
+        grid = [[rand.choice((0, 100, 5000, 100000, rand.randint(0, 10000)))
+                 for _ in range(size)] for _ in range(size)]
+        permutation = solver(grid)
+        assert sorted(permutation) == list(range(size))
+        assert permutation_cost(grid, permutation) == min(
+            permutation_cost(grid, perm)
+            for perm in itertools.permutations(range(size)))
+
+
+def test_unordered_compare_large():
+    rand = random.Random(0)
+    values = [{'id': idx, 'qty': idx * 10, 'side': idx % 2}
+              for idx in range(200)]
+    expected = [cmp.Expected(dict(value)) for value in values]
+    rand.shuffle(values)
+
+    results = cmp.unordered_compare('match', values, expected)
+    assert len(results) == 200
+    assert all(result['passed'] for result in results)
+    for msg_idx, result in enumerate(results):
+        assert expected[result['comparison_index']].value == values[msg_idx]
+
+
+def test_unordered_compare_limit():
+    values = [{'id': idx} for idx in range(cmp.MAX_UNORDERED_COMPARE + 1)]
+    with pytest.raises(Exception):
+        cmp.unordered_compare('match', values, [])
+
+
+def orders(size):
+    return [{11: 'ID{}'.format(idx), 38: idx * 10, 54: idx % 2}
+            for idx in range(size)]
+
+
+def test_unordered_compare_key_index():
+    rand = random.Random(0)
+    values = orders(50)
+    expected = [cmp.Expected(dict(value)) for value in values]
+    # Mismatch on a non index key, absent and unexpected messages.
+    expected[3].value[38] = -1
+    expected.append(cmp.Expected({11: 'ID50', 38: 0, 54: 0}))
+    values.append({11: 'ID51', 38: 0, 54: 0})
+    rand.shuffle(values)
+
+    full = cmp.unordered_compare('match', values, expected)
+    indexed = cmp.unordered_compare('match', values, expected, key_index=[11])
+    assert indexed == full
+    assert sum(not result['passed'] for result in indexed) == 2
+
+
+def test_unordered_compare_key_index_comparator():
+    values = orders(3)
+    expected = [cmp.Expected({11: 'ID2', 38: 20, 54: 0}),
+                cmp.Expected({11: re.compile('ID.*'), 38: 10, 54: 1}),
+                cmp.Expected({11: 'ignored', 38: 0, 54: 0}, ignore=[11])]
+    results = cmp.unordered_compare('match', values, expected, key_index=[11])
+    assert all(result['passed'] for result in results)
+    assert [result['comparison_index'] for result in results] == [2, 1, 0]
+
+
+def test_unordered_compare_processes(monkeypatch):
+    monkeypatch.setattr(cmp, 'PROCESS_POOL_MIN_PAIRS', 1)
+    values = orders(20)
+    expected = [cmp.Expected(dict(value)) for value in reversed(values)]
+    serial = cmp.unordered_compare('match', values, expected)
+    assert cmp.unordered_compare(
+        'match', values, expected, processes=2) == serial
+
+    # Comparators that cannot be pickled are evaluated in process.
+    expected[0].value[38] = lambda value: value == 190
+    results = cmp.unordered_compare('match', values, expected, processes=2)
+    assert all(result['passed'] for result in results)
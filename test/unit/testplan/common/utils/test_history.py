@@ -0,0 +1,62 @@
+import os
+
+from testplan.common.utils.history import DurationHistory, history_key
+from testplan.report.testing import TestGroupReport, TestCaseReport
+
+
+def test_in_memory():
+    history = DurationHistory()
+    assert history.get('key') is None
+    assert history.get('key', default=1) == 1
+    assert 'key' not in history
+
+    history.record('key', 2)
+    history.record_many([('key', 4), ('other', 1.5)])
+
+    assert 'key' in history
+    assert history.get('key') == 3
+    assert history.get('other') == 1.5
+
+
+def test_window():
+    history = DurationHistory(window=2)
+    history.record_many([('key', 10), ('key', 2), ('key', 4)])
+    assert history.get('key') == 3
+
+
+def test_persisted(tmpdir):
+    path = os.path.join(str(tmpdir), 'nested', 'durations.db')
+    history = DurationHistory(path=path)
+    history.record('key', 5)
+    history.close()
+
+    assert os.path.exists(path)
+    assert DurationHistory(path=path).get('key') == 5
+
+
+def test_record_report():
+    testcase = TestCaseReport(name='case')
+    with testcase.timer.record('run'):
+        pass
+    not_run = TestCaseReport(name='not_run')
+    suite = TestGroupReport(name='Suite', entries=[testcase, not_run])
+    with suite.timer.record('run'):
+        pass
+    mtest = TestGroupReport(name='MTest', entries=[suite])
+    other = TestGroupReport(name='MTestOther')
+    with other.timer.record('run'):
+        pass
+
+    history = DurationHistory()
+    history.record_report(mtest)
+    history.record_report(other)
+
+    assert history.keys() == [
+        history_key('MTest', 'Suite'),
+        history_key('MTest', 'Suite', 'case'),
+        'MTestOther']
+    assert history.keys(prefix='MTest') == [
+        history_key('MTest', 'Suite'),
+        history_key('MTest', 'Suite', 'case')]
+    durations = history.get_many(history.keys(prefix='MTest'))
+    assert all(duration >= 0 for duration in durations.values())
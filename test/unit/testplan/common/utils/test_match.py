@@ -0,0 +1,81 @@
+import os
+import re
+import threading
+
+from testplan.common.utils.match import (LogWatcher, FileEventWaiter,
+                                         match_regexps_in_file)
+
+
+def test_log_watcher_incremental(tmpdir):
+    path = os.path.join(str(tmpdir), 'app.log')
+    regexps = [re.compile(r'.*started.*'),
+               re.compile(r'.*port=(?P<port>\d+)')]
+    watcher = LogWatcher(path, regexps)
+    assert watcher.update() is False
+    assert watcher.unmatched == regexps
+
+    with open(path, 'w') as log:
+        log.write('App started\nlistening ')
+    assert watcher.update() is False
+    assert watcher.unmatched == [regexps[1]]
+
+    with open(path, 'a') as log:
+        log.write('on port=123')
+    # Partial lines are not matched until complete.
+    assert watcher.update() is False
+    assert watcher.extracted_values == {}
+
+    with open(path, 'a') as log:
+        log.write('4\n')
+    assert watcher.update() is True
+    assert watcher.extracted_values == {'port': '1234'}
+    assert match_regexps_in_file(path, regexps) == (True, {'port': '1234'})
+
+
+def test_log_watcher_unterminated_line(tmpdir):
+    """Last line without newline matches once the file stops growing."""
+    path = os.path.join(str(tmpdir), 'app.log')
+    regexps = [re.compile(r'.*port (?P<port>\d+)')]
+    watcher = LogWatcher(path, regexps)
+    with open(path, 'w') as log:
+        log.write('starting\nListening on port 1234')
+    assert watcher.update() is False
+    assert watcher.update() is True
+    assert watcher.extracted_values == {'port': '1234'}
+    assert match_regexps_in_file(path, regexps) == (True, {'port': '1234'})
+
+
+def test_log_watcher_truncated(tmpdir):
+    path = os.path.join(str(tmpdir), 'app.log')
+    regexps = [re.compile(r'.*value=(?P<value>\w+)')]
+    with open(path, 'w') as log:
+        log.write('padding\n' * 10)
+    watcher = LogWatcher(path, regexps, chunk_size=7)
+    assert watcher.update() is False
+
+    with open(path, 'w') as log:
+        log.write('value=new\n')
+    assert watcher.update() is True
+    assert watcher.extracted_values == {'value': 'new'}
+
+
+def test_file_event_waiter(tmpdir):
+    path = os.path.join(str(tmpdir), 'app.log')
+    waiter = FileEventWaiter([path])
+    try:
+        if not waiter.active:
+            # No inotify, waits for the timeout.
+            assert waiter.wait(0.01) is False
+            return
+        assert waiter.wait(0.01) is False
+
+        def write():
+            with open(path, 'w') as log:
+                log.write('started\n')
+
+        thread = threading.Timer(0.1, write)
+        thread.start()
+        assert waiter.wait(5) is True
+        thread.join()
+    finally:
+        waiter.close()
@@ -1,4 +1,7 @@
+import copy
 import functools
+import gzip
+import json
 
 import pytest
 import mock
@@ -7,7 +10,11 @@ from testplan.common.utils.testing import disable_log_propagation
 
 from testplan.report.testing.base import (
     Status, BaseReportGroup, TestCaseReport, TestGroupReport, TestReport)
-from testplan.report.testing.schemas import TestReportSchema
+from testplan.report.testing.schemas import (
+    TestReportSchema, TestGroupReportSchema, TestCaseReportSchema)
+from testplan.report.testing.loader import ReportLoader
+from testplan.report.testing import binary
+from testplan.exporters.testing.json import ReportStreamer
 from testplan.common import report
 from testplan.common.utils.testing import check_report
 
@@ -149,6 +156,54 @@ class TestBaseReportGroup(object):
         parent_orig.merge(parent_clone, strict=False)
         assert parent_orig.entries == [child_orig_1, child_clone_2]
 
+    def test_cached_status_and_counts(self):
+        """
+        Cached status and counts should follow appended children and
+        changes of the descendant reports.
+        """
+        passing = TestCaseReport(name='passing')
+        suite = TestGroupReport(name='suite', entries=[passing])
+        multitest = TestGroupReport(name='multitest', entries=[suite])
+        plan = TestReport(name='plan', entries=[multitest])
+
+        assert plan.status == suite.status == Status.PASSED
+        assert plan.counts.passed == 1 and plan.counts.total == 1
+
+        failing = TestCaseReport(name='failing', entries=[{'passed': False}])
+        suite.append(failing)
+        assert plan.status == multitest.status == Status.FAILED
+        assert plan.counts.failed == 1 and plan.counts.total == 2
+
+        empty = TestGroupReport(name='empty')
+        multitest.append(empty)
+        assert empty.status == Status.PASSED
+        empty.append(TestCaseReport(name='skipped'))
+        empty.entries[0].status_override = Status.SKIPPED
+        assert empty.status == Status.SKIPPED
+        assert plan.counts.skipped == 1 and plan.counts.total == 3
+
+        failing.status_override = Status.ERROR
+        assert plan.status == Status.ERROR
+        assert plan.counts == (1, 0, 0, 1, 1)
+
+        failing.entries = []
+        failing.status_override = None
+        assert plan.status == Status.PASSED
+        assert plan.counts.passed == 2
+
+        passing.append({'passed': False})
+        assert plan.status == Status.FAILED
+
+        suite.status_override = Status.ERROR
+        assert plan.status == Status.ERROR
+        assert plan.counts.failed == 1
+
+        copied = copy.deepcopy(multitest)
+        assert copied.entries[0]._parent is copied
+        copied.entries[0].status_override = None
+        assert copied.status == Status.FAILED
+        assert plan.status == Status.ERROR
+
 
 class TestTestCaseReport(object):
 
@@ -281,6 +336,120 @@ def test_report_json_serialization(dummy_test_plan_report):
     check_report(actual=deserialized_report, expected=dummy_test_plan_report)
 
 
+@pytest.mark.parametrize('filename, writer', (
+    ('report.json', 'streamer'),
+    ('report.json.gz', 'streamer'),
+    ('report.json', 'sorted_keys'),
+))
+def test_report_loader(tmpdir, dummy_test_plan_report, filename, writer):
+    """Reports loaded by uid from a JSON file should equal the originals."""
+    rep = dummy_test_plan_report
+    group_2 = rep.entries[0]
+    group_1, case_3 = group_2.entries
+    case_1, case_2 = group_1.entries
+    case_3.extend([{
+        'type': 'Group', 'uid': 'not a report', 'entries': [
+            {'type': 'TestCaseReport', 'description': '"{[a]}" \\'}]}])
+
+    path = tmpdir.join(filename).strpath
+    opener = gzip.open if filename.endswith('.gz') else open
+    with opener(path, 'wb') as json_file:
+        if writer == 'streamer':
+            ReportStreamer(json_file).write(rep)
+        else:
+            json_file.write(json.dumps(
+                rep.serialize(), sort_keys=True).encode('utf-8'))
+
+    loader = ReportLoader(path, chunk_size=7)
+    uids = [group_2.uid, group_1.uid, case_1.uid, case_2.uid, case_3.uid]
+    assert loader.uids == [str(uid) for uid in uids]
+    assert loader.entries == [str(group_2.uid)]
+    assert loader.children(group_2.uid) == [
+        str(group_1.uid), str(case_3.uid)]
+    assert loader.parent(group_2.uid) is None
+    assert loader.parent(case_1.uid) == str(group_1.uid)
+
+    for original in (group_2, group_1, case_1, case_3):
+        schema = TestGroupReportSchema if isinstance(
+            original, TestGroupReport) else TestCaseReportSchema
+        loaded = loader.get_by_uid(original.uid)
+        assert schema(strict=True).dump(loaded).data ==\
+            schema(strict=True).dump(original).data
+
+    shallow = loader.get_by_uid(group_2.uid, shallow=True)
+    assert shallow.name == group_2.name
+    assert shallow.entries == []
+
+    with pytest.raises(KeyError):
+        loader.get_by_uid('unknown')
+
+
+@pytest.mark.parametrize('codec, compress', (
+    (binary.CODEC_JSON, False),
+    (binary.CODEC_JSON, True),
+    (binary.CODEC_MSGPACK, True),
+))
+def test_binary_report(tmpdir, dummy_test_plan_report, codec, compress):
+    """Binary reports should round trip and load lazily by uid."""
+    if codec == binary.CODEC_MSGPACK and binary.msgpack is None:
+        pytest.skip('msgpack is not installed')
+
+    rep = dummy_test_plan_report
+    group_2 = rep.entries[0]
+    group_1, case_3 = group_2.entries
+    case_1, case_2 = group_1.entries
+
+    path = tmpdir.join('report.bin').strpath
+    with open(path, 'wb') as binary_file:
+        binary.BinaryReportWriter(
+            binary_file, codec=codec, compress=compress).write(rep)
+
+    with binary.BinaryReportReader(path) as reader:
+        check_report(actual=reader.load(), expected=rep)
+
+        uids = [group_2.uid, group_1.uid, case_1.uid, case_2.uid, case_3.uid]
+        assert reader.uids == [str(uid) for uid in uids]
+        assert len(reader) == 5 and str(case_2.uid) in reader
+        assert reader.entries == [str(group_2.uid)]
+        assert reader.children(group_2.uid) == [
+            str(group_1.uid), str(case_3.uid)]
+        assert reader.parent(group_2.uid) is None
+        assert reader.parent(case_1.uid) == str(group_1.uid)
+        assert reader.testcase_entries(case_3.uid) == case_3.entries
+
+        for original in (group_2, group_1, case_1, case_3):
+            schema = TestGroupReportSchema if isinstance(
+                original, TestGroupReport) else TestCaseReportSchema
+            loaded = reader.get_by_uid(original.uid)
+            assert schema(strict=True).dump(loaded).data ==\
+                schema(strict=True).dump(original).data
+
+        shallow = reader.get_by_uid(group_2.uid, shallow=True)
+        assert shallow.name == group_2.name
+        assert shallow.entries == []
+
+        with pytest.raises(KeyError):
+            reader.get_by_uid('unknown')
+        with pytest.raises(ValueError):
+            reader.testcase_entries(group_1.uid)
+
+    with open(path, 'r+b') as binary_file:
+        binary_file.write(b'NOTAREPORT')
+    with pytest.raises(ValueError):
+        binary.BinaryReportReader(path)
+
+
+def test_binary_report_no_msgpack(tmpdir, monkeypatch):
+    """Writer falls back to JSON with a warning when msgpack is missing."""
+    monkeypatch.setattr(binary, 'msgpack', None)
+    monkeypatch.setattr(binary, '_MSGPACK_IMPORT_ERROR',
+                        ImportError('No module named msgpack'), raising=False)
+    with open(tmpdir.join('report.bin').strpath, 'wb') as binary_file:
+        with pytest.warns(UserWarning):
+            writer = binary.BinaryReportWriter(binary_file)
+    assert writer.codec == binary.CODEC_JSON
+
+
 class TestReportTags(object):
 
     def get_reports(self):
@@ -394,3 +563,28 @@ class TestReportTags(object):
         assert tg_rep_3.tags_index == {'simple': {'foo'}}
         assert tc_rep_1.tags_index == {'simple': {'foo', 'bar', 'baz'}}
         assert tc_rep_2.tags_index == {'simple': {'foo', 'bar', 'bat'}}
+
+    def test_filter_by_tags_copies_nodes_only(self):
+        """
+        Tag filtered reports should share serialized entries with the
+        original report, which should not be affected by changes on them.
+        """
+        tg_rep_1, tg_rep_2, tg_rep_3, tc_rep_1, tc_rep_2 = self.get_reports()
+        tc_rep_1.extend([{'passed': True}])
+        tc_rep_2.extend([{'passed': False}])
+        plan = TestReport(name='plan', entries=[tg_rep_1])
+
+        filtered = plan.filter_by_tags({'simple': 'baz'})
+        new_tc_rep_1 = filtered.entries[0].entries[0].entries[0]
+
+        assert new_tc_rep_1 is not tc_rep_1
+        assert new_tc_rep_1.entries[0] is tc_rep_1.entries[0]
+        assert filtered.status == Status.PASSED
+        assert plan.status == Status.FAILED
+
+        filtered.meta['report_tags_any'] = 'baz'
+        new_tc_rep_1.status_override = Status.ERROR
+        assert filtered.status == Status.ERROR
+        assert plan.meta == {}
+        assert plan.status == Status.FAILED
+        assert tc_rep_1._parent is tg_rep_2
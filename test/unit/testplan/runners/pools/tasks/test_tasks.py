@@ -1,6 +1,7 @@
 """Unit test for task classes."""
 
 import os
+import pickle
 from testplan.runners.pools.tasks import (Task, RunnableTaskAdaptor,
                                           TaskDeserializationError,
                                           TaskSerializationError)
@@ -210,6 +211,14 @@ class TestTaskInitAndMaterialization(object):
                     args=(2,), module='sample_tasks', path=path)
         materialized_task_result(task, 4)
 
+    def test_cached_target(self):  # pylint: disable=R0201
+        """Cached target is returned once instead of a new one."""
+        task = Task('RunnableWithArg', module=__name__, args=(2,))
+        target = task.materialize()
+        task.cache(target)
+        assert task.materialize() is target
+        assert task.materialize() is not target
+
 
 # pylint: disable=R0201
 class TestTaskSerialization(object):
@@ -251,3 +260,13 @@ class TestTaskSerialization(object):
             raise Exception('Should raise.')
         except TaskDeserializationError:
             pass
+
+    def test_cached_target_not_pickled(self):
+        """Pickled task does not carry its cached target."""
+        task = Task('RunnableWithArg', module=__name__, args=(3,))
+        task.cache(RunnableTaskAdaptor(lambda x: x * 2, 3))
+        loaded = pickle.loads(pickle.dumps(task))
+        assert loaded.uid() == task.uid()
+        assert loaded.materialize().run() == 3
+        # Pickling leaves the cached target of the original task.
+        assert task.materialize().run() == 6
@@ -34,3 +34,128 @@ def test_pool_basic():
            pool.results[task1.uid()].result == 10
     assert pool.get(task2.uid()).result ==\
            pool.results[task2.uid()].result == 30
+
+
+def test_connection_manager_wakes_on_request():
+    """Pool accept returns as soon as a worker sends, without polling."""
+    import threading
+    import time
+
+    from testplan.runners.pools.base import ConnectionManager, Worker
+    from testplan.runners.pools.communication import Message
+
+    conn = ConnectionManager(cfg=None)
+    worker = Worker(index=0)
+    conn.register(worker)
+
+    assert conn.accept() is None
+    assert conn.accept(timeout=0.01) is None
+
+    message = Message(index=0).make(Message.TaskPullRequest, data=1)
+    sender = threading.Timer(0.1, worker.transport.send, args=(message,))
+    start = time.time()
+    sender.start()
+    received = conn.accept(timeout=5)
+    assert received is message
+    assert time.time() - start < 1
+
+    worker.respond(Message().make(Message.Ack))
+    assert worker.transport.receive().cmd == Message.Ack
+
+
+def test_tcp_connection_manager_close_while_accepting():
+    """The socket is closed by the accepting thread, not the caller."""
+    import threading
+
+    from testplan.runners.pools.connection import TCPConnectionManager
+
+    class Config(object):
+        host = '127.0.0.1'
+        port = 0
+
+    conn = TCPConnectionManager(Config())
+    accepting = threading.Thread(target=conn.accept, kwargs={'timeout': 0.5})
+    accepting.start()
+    while not conn._accepting:
+        pass
+    conn.close()
+    assert not conn._sock.closed
+    accepting.join()
+    assert conn._sock.closed
+    assert conn.accept(timeout=0.1) is None
+
+    conn = TCPConnectionManager(Config())
+    conn.close()
+    assert conn._sock.closed
+
+
+def test_pool_holds_idle_pulls():
+    """Idle workers wait on the pool for tasks instead of polling it."""
+    import time
+
+    from testplan.runners.pools.communication import Message
+
+    class CountingPool(Pool):
+        pulls = 0
+
+        def handle_request(self, request):
+            if request.cmd == Message.TaskPullRequest:
+                CountingPool.pulls += 1
+            super(CountingPool, self).handle_request(request)
+
+    pool = CountingPool(name='MyPool', size=2, runpath=default_runpath,
+                        pull_timeout=5)
+    with pool:
+        time.sleep(0.5)
+        assert CountingPool.pulls == 2
+
+        task = Task(target=Runnable(5))
+        start = time.time()
+        pool.add(task, uid=task.uid())
+        while pool.ongoing:
+            time.sleep(0.01)
+        assert time.time() - start < 1
+        assert pool.results[task.uid()].result == 10
+
+
+def test_tcp_connection_manager_routes_responses():
+    """A held request does not prevent responding to other workers."""
+    import pickle
+
+    import zmq
+
+    from testplan.runners.pools.communication import Message
+    from testplan.runners.pools.connection import TCPConnectionManager
+    from testplan.runners.pools.process import ProcessWorker
+
+    class Config(object):
+        host = '127.0.0.1'
+        port = 0
+
+    conn = TCPConnectionManager(Config())
+    workers = [ProcessWorker(index=str(idx)) for idx in range(2)]
+    context = zmq.Context()
+    sockets = []
+    for worker in workers:
+        conn.register(worker)
+        sock = context.socket(zmq.REQ)
+        sock.connect('tcp://{}'.format(worker.transport.address))
+        sockets.append(sock)
+
+    try:
+        for idx, sock in enumerate(sockets):
+            sock.send(pickle.dumps(Message(index=str(idx)).make(
+                Message.TaskPullRequest, data=1)))
+        received = [conn.accept(timeout=5) for _ in sockets]
+        assert sorted(msg.sender_metadata['index']
+                      for msg in received) == ['0', '1']
+
+        workers[1].respond(Message().make(Message.Ack, data=1))
+        assert pickle.loads(sockets[1].recv()).data == 1
+        workers[0].respond(Message().make(Message.Ack, data=0))
+        assert pickle.loads(sockets[0].recv()).data == 0
+    finally:
+        for sock in sockets:
+            sock.close(linger=0)
+        conn.close()
+        context.term()
@@ -0,0 +1,99 @@
+"""Pool scheduling policies unit tests."""
+
+from testplan import Task, TaskResult
+from testplan.runners.pools.base import Pool
+from testplan.runners.pools.scheduling import (FIFOScheduler,
+                                               LongestFirstScheduler)
+
+
+def make_pool(scheduler, durations):
+    pool = Pool(name='MyPool', scheduler=scheduler)
+    for name in sorted(durations):
+        task = Task(target='get_mtest', module='tasks', kwargs=dict(name=name))
+        pool._input[task.uid()] = task
+        pool.unassigned.append(task.uid())
+        if durations[name] is not None:
+            pool.history.record(task.signature, durations[name])
+    return pool
+
+
+def scheduled_names(pool):
+    names = []
+    while pool.unassigned:
+        uid = pool.scheduler.pop(pool)
+        names.append(pool._input[uid].kwargs['name'])
+    return names
+
+
+def test_fifo():
+    pool = make_pool(FIFOScheduler, {'a': 1, 'b': 5, 'c': 3})
+    assert scheduled_names(pool) == ['a', 'b', 'c']
+
+
+def test_longest_first():
+    pool = make_pool(LongestFirstScheduler, {'a': 1, 'b': 5, 'c': 3})
+    assert scheduled_names(pool) == ['b', 'c', 'a']
+
+
+def test_longest_first_unknown_costs():
+    pool = make_pool(LongestFirstScheduler,
+                     {'a': 1, 'b': None, 'c': 3, 'd': None})
+    assert scheduled_names(pool) == ['b', 'c', 'd', 'a']
+
+    pool = make_pool(LongestFirstScheduler, {'a': None, 'b': None})
+    assert scheduled_names(pool) == ['a', 'b']
+
+
+def test_longest_first_queue_changes():
+    pool = make_pool(LongestFirstScheduler, {'a': 1, 'b': 5, 'c': 3, 'd': 2})
+    uids = {pool._input[uid].kwargs['name']: uid for uid in pool.tasks}
+    assert pool.scheduler.pop(pool) == uids['b']
+
+    # Removed tasks are skipped, re-added ones keep their cost.
+    pool.unassigned.remove(uids['c'])
+    pool.unassigned.append(uids['b'])
+    assert pool.scheduler.pop(pool) == uids['b']
+
+    # A new duration recorded by the pool reorders the queued tasks.
+    pool._record_duration(TaskResult(
+        task=pool._input[uids['a']], status=True, duration=41))
+    assert pool.task_cost(uids['a']) == 21
+    assert scheduled_names(pool) == ['a', 'd']
+
+
+def test_longest_first_unknown_cost_follows_max():
+    pool = make_pool(LongestFirstScheduler, {'a': 1, 'b': None})
+    task = Task(target='get_mtest', module='tasks', kwargs=dict(name='c'))
+    pool.history.record(task.signature, 3)
+    pool._input[task.uid()] = task
+    pool.unassigned.append(task.uid())
+    assert scheduled_names(pool) == ['b', 'c', 'a']
+
+
+def test_task_signature():
+    task1 = Task(target='get_mtest', module='tasks', kwargs=dict(name=1))
+    task2 = Task(target='get_mtest', module='tasks', kwargs=dict(name=1))
+    task3 = Task(target='get_mtest', module='tasks', kwargs=dict(name=2))
+    assert task1.uid() != task2.uid()
+    assert task1.signature == task2.signature
+    assert task1.signature != task3.signature
+
+
+def test_task_signature_unstable_args():
+    class Arg(object):
+        pass
+
+    assert Task(target='get_mtest', module='tasks',
+                args=(Arg(),)).signature is None
+    assert Task(target='get_mtest', module='tasks',
+                kwargs=dict(names=[1, Arg()])).signature is None
+    assert Task(target=make_pool).signature == '{}.make_pool((), {{}})'.format(
+        __name__)
+    assert Task(target=Arg()).signature is None
+
+
+def test_scheduler_per_pool():
+    pool1 = Pool(name='Pool1')
+    pool2 = Pool(name='Pool2')
+    assert isinstance(pool1.scheduler, LongestFirstScheduler)
+    assert pool1.scheduler is not pool2.scheduler
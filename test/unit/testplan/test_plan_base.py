@@ -4,6 +4,8 @@ import os
 import sys
 import uuid
 
+from schema import SchemaError
+
 from testplan import Testplan, TestplanResult
 from testplan.common.entity import (Resource, ResourceStatus,
                                     Runnable, RunnableResult)
@@ -12,6 +14,7 @@ from testplan.runners.local import LocalRunner
 from testplan.runnable import TestRunnerStatus, TestRunner
 from testplan.common.utils.exceptions import should_raise
 from testplan.report import TestGroupReport
+from testplan.exporters.testing import Exporter
 
 from testplan.common.utils.testing import (
     argv_overridden, log_propagation_disabled)
@@ -58,6 +61,15 @@ class DummyTest(Runnable):
         self._add_step(self.run_tests)
 
 
+class PidExporter(Exporter):
+    """Records the exporting process, fails for ``fail`` reports."""
+
+    def export(self, source):
+        if source.name == 'fail':
+            raise ValueError('Cannot export')
+        self.url = 'pid:{}'.format(os.getpid())
+
+
 class MyPool(LocalRunner):  # Start is async
     def __init__(self, name=None):
         super(MyPool, self).__init__()
@@ -193,3 +205,29 @@ def test_testplan_runpath():
     assert plan.runpath is None
     plan.run()
     assert plan.runpath == runpath_maker(plan._runnable)
+
+
+def test_testplan_exporter_processes():
+    """Exporters should run in child processes with exporter_processes."""
+    for name, processes in (('MyPlan', 0), ('MyPlan', 2), ('fail', 2)):
+        exporters = [PidExporter(), PidExporter()]
+        with log_propagation_disabled(TESTPLAN_LOGGER):
+            plan = Testplan(name=name, parse_cmdline=False,
+                            exporters=exporters,
+                            exporter_processes=processes)
+            res = plan.run()
+
+        assert [exp_res.exporter for exp_res in res.exporter_results] == \
+            exporters
+        for exp_res in res.exporter_results:
+            assert exp_res.timer['run'].elapsed >= 0
+            if name == 'fail':
+                assert 'Cannot export' in exp_res.traceback
+            elif processes:
+                assert exp_res.success
+                assert exp_res.exporter.url != 'pid:{}'.format(os.getpid())
+            else:
+                assert exp_res.exporter.url == 'pid:{}'.format(os.getpid())
+
+    should_raise(SchemaError, Testplan, kwargs=dict(
+        name='MyPlan', parse_cmdline=False, exporter_processes=-1))
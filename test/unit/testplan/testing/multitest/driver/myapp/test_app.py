@@ -146,3 +146,25 @@ def test_echo_hello():
 
     with open(app.std.out_path, 'r') as fobj:
         assert fobj.read().startswith('hello')
+
+
+def test_extract_with_inotify():
+    log_regexps = [re.compile(r'.*Binary started.*'),
+                   re.compile(r'.*Binary=(?P<value>[a-zA-Z0-9]*).*')]
+    binary = os.path.join(os.path.abspath(os.path.dirname(__file__)),
+                          'example_binary.py')
+    app = App(name='App', binary=binary, pre_args=[sys.executable],
+              log_regexps=log_regexps, log_inotify=True)
+    with app:
+        assert app.extracts['value'] == 'started'
+
+
+def test_extract_unterminated_line():
+    """Readiness line without a trailing newline is matched."""
+    code = ('import sys, time; sys.stdout.write("Listening on port 1234");'
+            ' sys.stdout.flush(); time.sleep(60)')
+    app = App(name='App', binary=sys.executable, args=['-c', code],
+              stdout_regexps=[re.compile(r'.*port (?P<port>\d+)')],
+              timeout=10)
+    with app:
+        assert app.extracts['port'] == '1234'
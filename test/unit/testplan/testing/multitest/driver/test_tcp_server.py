@@ -1,12 +1,18 @@
 """TODO."""
 
 import os
+import sys
 import shutil
+import subprocess
+
+import pytest
+import six
 
 from testplan.common.entity.base import Environment
 from testplan.common.utils.context import context
 from testplan.common.utils.exceptions import should_raise
 from testplan.common.utils.sockets import Message, Codec
+from testplan.common.utils.timing import TimeoutException
 from testplan.testing.multitest.driver.tcp import TCPServer, TCPClient
 
 
@@ -30,10 +36,11 @@ def test_basic_runpath():
     # Server runpath
     server = TCPServer(name='server', runpath=svr_path)
     assert_obj_runpath(server, svr_path)
-    # Client runpath
+    # Client runpath, the server is stopped so the client does not connect
     client = TCPClient(name='client', runpath=cli_path,
                        host=server._host,
-                       port=server._port)
+                       port=server._port,
+                       connect_at_start=False)
     assert_obj_runpath(client, cli_path)
     shutil.rmtree(svr_path, ignore_errors=True)
     shutil.rmtree(cli_path, ignore_errors=True)
@@ -122,3 +129,75 @@ def test_send_receive_with_context():
     for item in reversed(list(rcxt)):
         item.stop()
         item._wait_stopped()
+
+
+def test_event_loop_not_imported():
+    """Asyncio helpers are only imported by drivers using the event loop."""
+    code = ('import sys; import testplan.testing.multitest.driver.tcp; '
+            'assert "testplan.common.utils.sockets.aio" not in sys.modules')
+    subprocess.check_call([sys.executable, '-c', code])
+
+
+@pytest.mark.skipif(six.PY2, reason='Event loop requires Python 3.')
+def test_send_receive_event_loop():
+    import asyncio
+
+    rcxt = Environment()
+    server = TCPServer(name='server', host='localhost', port=0,
+                       event_loop=True)
+    rcxt.add(server)
+    clients = [TCPClient(name='client{}'.format(idx),
+                         host=context('server', '{{host}}'),
+                         port=context('server', '{{port}}'),
+                         event_loop=True)
+               for idx in range(20)]
+    for client in clients:
+        rcxt.add(client)
+
+    for item in rcxt:
+        item.start()
+        item._wait_started()
+    try:
+        event_loop = server.event_loop
+        assert all(client.event_loop is event_loop for client in clients)
+
+        # Sync API
+        send_receive_message(server, clients[0])
+        clients[0].send_frame(b'frame')
+        assert server.receive_frame() == b'frame'
+        with pytest.raises(TimeoutException):
+            server.receive(1, timeout=0.1)
+        assert server.receive(timeout=None) is None
+
+        # Async API, all connections served concurrently by the loop thread
+        conn_idxs = [server.accept_connection() for _ in clients[1:]]
+        assert conn_idxs == list(range(1, len(clients)))
+
+        @asyncio.coroutine
+        def echo(conn_idx):
+            data = yield from server.async_server.receive_until(
+                b'\n', conn_idx=conn_idx)
+            yield from server.async_server.send(data + b'\n', conn_idx)
+
+        @asyncio.coroutine
+        def request(client):
+            msg = client.name.encode('utf-8')
+            yield from client.async_client.send(msg + b'\n')
+            return (yield from client.async_client.receive_until(b'\n'))
+
+        @asyncio.coroutine
+        def run_all():
+            results = yield from asyncio.gather(
+                *([request(client) for client in clients[1:]] +
+                  [echo(conn_idx) for conn_idx in conn_idxs]))
+            return results[:len(clients) - 1]
+
+        assert event_loop.run(run_all()) == [
+            client.name.encode('utf-8') for client in clients[1:]]
+    finally:
+        for item in reversed(list(rcxt)):
+            item.stop()
+            item._wait_stopped()
+
+    assert server.event_loop is None
+    assert not event_loop._thread.is_alive()
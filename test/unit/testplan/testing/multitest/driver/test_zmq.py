@@ -252,3 +252,27 @@ def test_flush():
         client.receive(timeout=0.2)
 
     stop_devices([server, client])
+
+
+def test_multipart_and_receive_many():
+    server = create_server('server', '127.0.0.1', 0, zmq.PAIR)
+    client = create_client('client', [server.host], [server.port], zmq.PAIR)
+
+    client.send_multipart([b'Hello', b'World'], timeout=TIMEOUT)
+    assert server.receive_multipart(timeout=TIMEOUT) == [b'Hello', b'World']
+
+    for idx in range(10):
+        client.send(data=str(idx).encode('utf-8'), timeout=TIMEOUT)
+    received = server.receive_many(10, timeout=TIMEOUT)
+    assert received == [str(idx).encode('utf-8') for idx in range(10)]
+
+    start = time.time()
+    assert server.receive_many(1, timeout=0.2) == []
+    assert time.time() - start >= 0.2
+
+    server.send(data=b'zero copy', timeout=TIMEOUT)
+    frame = client.receive(timeout=TIMEOUT, copy=False)
+    assert isinstance(frame, zmq.Frame)
+    assert frame.bytes == b'zero copy'
+
+    stop_devices([server, client])
@@ -1,11 +1,14 @@
 """TODO."""
 
+import os
 import re
+import inspect
 
 import pytest
 
 from testplan.testing.multitest.suite import testcase, testsuite
 from testplan.testing.multitest import MultiTest
+from testplan.testing.multitest.result import Result, CaptureMode
 
 
 @testsuite
@@ -45,3 +48,94 @@ def test_assertion_orders():
     for idx, entry in enumerate(assertions):
         assert entry['description'] == expected[idx]
 
+
+def test_capture_location():
+    result = Result()
+    line_no = inspect.currentframe().f_lineno + 1
+    result.equal(1, 1)
+    result.regex.match('foo', 'foobar')
+    with result.raises(KeyError):
+        {}['key']
+    with result.group() as group:
+        group.true(True)
+
+    assert [entry.line_no for entry in result.entries[:2]] == \
+        [line_no, line_no + 1]
+    # Either the `with` statement or the line that raised.
+    assert result.entries[2].line_no in (line_no + 2, line_no + 3)
+    assert result.entries[3].entries[0].line_no == line_no + 5
+    for entry in result.entries[:3]:
+        assert entry.file_path == os.path.abspath(__file__.rstrip('c'))
+
+
+def test_capture_location_off():
+    result = Result(capture_mode=CaptureMode.OFF)
+    result.equal(1, 1)
+    with result.raises(KeyError):
+        {}['key']
+    with result.group() as group:
+        group.true(True)
+
+    for entry in result.entries[:2] + result.entries[2].entries:
+        assert entry.file_path is None
+        assert entry.line_no is None
+
+
+@testsuite
+class CaptureModeSuite(object):
+
+    @testcase
+    def case(self, env, result):
+        result.equal(1, 1)
+
+
+@pytest.mark.parametrize('capture_mode', (CaptureMode.FULL, CaptureMode.OFF))
+def test_multitest_capture_mode(capture_mode):
+    mtest = MultiTest(name='CaptureMode', suites=[CaptureModeSuite()],
+                      capture_mode=capture_mode)
+    mtest.run()
+    entry = mtest.report.flatten()[-1]
+    assert (entry['line_no'] is None) == (capture_mode == CaptureMode.OFF)
+
+
+class CustomResult(Result):
+    """Result type that does not accept all options of its base class."""
+
+    def __init__(self, stdout_style=None, _scratch=None):
+        super(CustomResult, self).__init__(
+            stdout_style=stdout_style, _scratch=_scratch)
+
+
+@pytest.mark.parametrize('capture_mode', (CaptureMode.FULL, CaptureMode.OFF))
+def test_multitest_custom_result(capture_mode):
+    mtest = MultiTest(name='CustomResult', suites=[CaptureModeSuite()],
+                      result=CustomResult, capture_mode=capture_mode)
+    mtest.run()
+    assert mtest.report.passed is True
+    entry = mtest.report.flatten()[-1]
+    assert (entry['line_no'] is None) == (capture_mode == CaptureMode.OFF)
+
+
+def test_serialized_entries_cached_schemas():
+    """Cached schemas serialize entries the same as new schema instances."""
+    from testplan.testing.multitest.entries.schemas.base import registry
+
+    result = Result()
+    result.equal(1, 2, 'equal')
+    result.contain(1, [1, 2])
+    result.regex.match('foo', 'foobar')
+    result.dict.match({'a': 1}, {'a': 1})
+    result.table.match([['a'], [1]], [['a'], [1]])
+    result.log('message')
+    with result.raises(KeyError):
+        {}['key']
+    with result.group(description='group') as group:
+        group.true(True)
+        with group.group() as nested:
+            nested.fail('failure')
+
+    expected = [registry[entry](strict=True).dump(entry).data
+                for entry in result]
+    assert result.serialized_entries == expected
+    # Second pass reuses the cached instances.
+    assert result.serialized_entries == expected
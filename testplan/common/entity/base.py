@@ -5,6 +5,7 @@ configuration, start/stop/run/abort, create results and have some state.
 
 import os
 import signal
+import hashlib
 import time
 import uuid
 import threading
@@ -17,12 +18,33 @@ from schema import Or, And, Use
 from testplan.common.globals import get_logger
 from testplan.common.config import Config
 from testplan.common.config import ConfigOption
+from testplan.common.utils.context import is_context, referenced_drivers
 from testplan.common.utils.exceptions import format_trace
 from testplan.common.utils.thread import execute_as_thread
 from testplan.common.utils.timing import wait
 from testplan.common.utils.path import makeemptydirs, makedirs, default_runpath
 
 
+def _config_repr(value):
+    """
+    Representation of a config option value that does not depend on object
+    identities for context values, regexps, functions and classes.
+    """
+    if isinstance(value, dict):
+        return '{{{}}}'.format(', '.join(sorted(
+            '{}: {}'.format(_config_repr(key), _config_repr(val))
+            for key, val in value.items())))
+    if isinstance(value, (list, tuple)):
+        return '[{}]'.format(', '.join(_config_repr(item) for item in value))
+    if is_context(value):
+        return 'context({!r}, {!r})'.format(value.driver, value.value.content)
+    if hasattr(value, 'pattern') and hasattr(value, 'flags'):
+        return 're({!r}, {})'.format(value.pattern, value.flags)
+    if inspect.isfunction(value) or inspect.isclass(value):
+        return '{}.{}'.format(value.__module__, value.__name__)
+    return repr(value)
+
+
 class Environment(object):
     """
     A collection of resources that can be started/stopped.
@@ -87,6 +109,10 @@ class Environment(object):
     def first(self):
         return next(uid for uid in self._resources.keys())
 
+    def items(self):
+        """Uid and resource pairs, in the order resources were added."""
+        return list(self._resources.items())
+
     def __getattr__(self, item):
         context = self.__getattribute__('_resources')
 
@@ -128,8 +154,13 @@ class Environment(object):
 
     def start(self):
         """
-        Start all resources sequentially and log errors.
+        Start all resources sequentially and log errors, or concurrently in
+        dependency order if the parent has ``parallel_start`` set.
         """
+        if getattr(self.cfg, 'parallel_start', False):
+            self._start_parallel()
+            return
+
         # Trigger start all resources
         for resource in self._resources.values():
             try:
@@ -157,8 +188,14 @@ class Environment(object):
 
     def stop(self, reversed=False):
         """
-        Stop all resources in reverse order and log exceptions.
+        Stop all resources in reverse order and log exceptions, or
+        concurrently in reverse dependency order if the parent has
+        ``parallel_start`` set.
         """
+        if getattr(self.cfg, 'parallel_start', False):
+            self._stop_parallel()
+            return
+
         resources = list(self._resources.values())
         if reversed is True:
             resources = resources[::-1]
@@ -188,6 +225,147 @@ class Environment(object):
             else:
                 resource.wait(resource.STATUS.STOPPED)
 
+    def reset(self):
+        """
+        Reset all started resources sequentially, so that the environment can
+        be reused, and log errors.
+        """
+        for resource in self._resources.values():
+            try:
+                self.logger.debug('Resetting {}'.format(resource))
+                resource.reset()
+            except Exception as exc:
+                msg = 'While resetting resource [{}]{}{}'.format(
+                    resource.cfg.name, os.linesep,
+                    format_trace(inspect.trace(), exc))
+                self.start_exceptions[resource] = msg
+                # Environment reset failure. Won't reset the rest.
+                break
+
+    def config_key(self):
+        """
+        Hash of the classes and config options of the resources and of the
+        initial context, environments with the same key are equivalent.
+        Options values without a stable representation, like instances of
+        arbitrary classes, make the key unique to the environment.
+
+        :return: Hexadecimal digest.
+        :rtype: ``str``
+        """
+        parts = [_config_repr(
+            self.cfg.initial_context if self.cfg is not None else {})]
+        for uid, resource in self._resources.items():
+            # pylint: disable=protected-access
+            parts.append('{}.{}({!r}, {})'.format(
+                resource.__class__.__module__, resource.__class__.__name__,
+                uid, _config_repr(resource.cfg._cfg_input)))
+        return hashlib.sha1(
+            os.linesep.join(parts).encode('utf-8')).hexdigest()
+
+    def dependencies(self):
+        """
+        Uids of the resources each resource depends on, dependencies to
+        names of the initial context are not included.
+
+        :return: Resource uid to dependency uids mapping.
+        :rtype: ``OrderedDict`` of ``str`` to ``list`` of ``str``
+        :raises ValueError: On unknown or circular dependencies.
+        """
+        initial = self.cfg.initial_context if self.cfg is not None else {}
+        graph = OrderedDict()
+        for uid, resource in self._resources.items():
+            graph[uid] = []
+            for dependency in resource.dependencies():
+                if dependency in self._resources:
+                    if dependency != uid:
+                        graph[uid].append(dependency)
+                elif dependency not in initial:
+                    raise ValueError(
+                        'Resource {} depends on unknown resource {}.'.format(
+                            uid, dependency))
+
+        # Depth first search for cycles.
+        visited = set()
+        def visit(uid, path):
+            if uid in path:
+                raise ValueError('Circular resource dependencies: {}'.format(
+                    ' -> '.join(path[path.index(uid):] + [uid])))
+            if uid not in visited:
+                for dependency in graph[uid]:
+                    visit(dependency, path + [uid])
+                visited.add(uid)
+
+        for uid in graph:
+            visit(uid, [])
+        return graph
+
+    def _run_parallel(self, func, waits_for, exceptions, label):
+        """
+        Runs ``func`` with each resource in its own thread, once the
+        resources it waits for are done, and records raised exceptions.
+        """
+        done = {uid: threading.Event() for uid in self._resources}
+
+        def run(uid, resource):
+            try:
+                for other in waits_for[uid]:
+                    done[other].wait()
+                func(resource)
+            except Exception as exc:
+                exceptions[resource] = 'While {} resource [{}]{}{}'.format(
+                    label, resource.cfg.name, os.linesep,
+                    format_trace(inspect.trace(), exc))
+            finally:
+                done[uid].set()
+
+        threads = [threading.Thread(target=run, args=item)
+                   for item in self._resources.items()]
+        for thread in threads:
+            thread.daemon = True
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    def _start_parallel(self):
+        try:
+            graph = self.dependencies()
+        except ValueError as exc:
+            self.start_exceptions[self.parent] = str(exc)
+            return
+
+        def start(resource):
+            # Environment start failure. Won't start the rest.
+            if self.start_exceptions:
+                return
+            self.logger.debug('Starting {}'.format(resource))
+            resource.start()
+            resource.wait(resource.STATUS.STARTED)
+            self.logger.debug('Started {}'.format(resource))
+
+        self._run_parallel(start, graph, self.start_exceptions, 'starting')
+
+    def _stop_parallel(self):
+        try:
+            graph = self.dependencies()
+        except ValueError:
+            # Not started, stop all concurrently.
+            graph = {uid: [] for uid in self._resources}
+        dependents = {uid: [] for uid in graph}
+        for uid, dependencies in graph.items():
+            for dependency in dependencies:
+                dependents[dependency].append(uid)
+
+        def stop(resource):
+            if resource.status.tag is None:
+                # Skip resources not even triggered to start.
+                return
+            self.logger.debug('Stopping {}'.format(resource))
+            resource.stop()
+            resource.wait(resource.STATUS.STOPPED)
+            self.logger.debug('Stopped {}'.format(resource))
+
+        self._run_parallel(stop, dependents, self.stop_exceptions, 'stopping')
+
     def __enter__(self):
         self.start()
         return self
@@ -733,7 +911,8 @@ class ResourceConfig(EntityConfig):
     def get_options(cls):
         """Resource specific config options."""
         return {
-            ConfigOption('async_start', default=True): bool
+            ConfigOption('async_start', default=True): bool,
+            ConfigOption('depends_on', default=None): Or(None, [str])
         }
 
 
@@ -780,6 +959,11 @@ class Resource(Entity):
 
     :param async_start: Resource can start asynchronously.
     :type async_start: ``bool``
+    :param depends_on: Uids of the resources of the same environment that
+      need to be started before this one, if the environment starts them in
+      parallel. By default the drivers referenced by ``context`` values of
+      the resource options.
+    :type depends_on: ``list`` of ``str``
 
     Also inherits all
     :py:class:`~testplan.common.entity.base.Entity` options.
@@ -804,6 +988,19 @@ class Resource(Entity):
         """Set the Resource context."""
         self._context = context
 
+    def dependencies(self):
+        """
+        Uids of the resources this resource depends on, ``depends_on`` option
+        or the drivers referenced by context values of its options.
+
+        :return: Resource uids.
+        :rtype: ``list`` of ``str``
+        """
+        if self.cfg.depends_on is not None:
+            return list(self.cfg.depends_on)
+        # pylint: disable=protected-access
+        return sorted(referenced_drivers(self.cfg._cfg_input))
+
     def start(self):
         """
         Triggers the start logic of a Resource by executing
@@ -841,6 +1038,14 @@ class Resource(Entity):
         """
         raise NotImplementedError()
 
+    def reset(self):
+        """
+        Reset the state of the started resource so that it can be reused by
+        another test, i.e by a MultiTest with ``shared_environment`` set. Does
+        nothing by default, resources that keep state between tests should
+        override this.
+        """
+
     def restart(self, timeout=None):
         """Stop and start the resource."""
         self.stop()
@@ -1,16 +1,24 @@
 """TODO."""
 import inspect
+import multiprocessing
+
+from six.moves import cPickle
 
 from testplan.common.config import Config, Configurable
+from testplan.common.utils import timing
 from testplan.common.utils.exceptions import format_trace
 
 
 class ExporterResult(object):
+    """
+    Result of an export operation, ``timer['run']`` records its duration.
+    """
 
     def __init__(self, exporter, type):
         self.exporter = exporter
         self.type = type
         self.traceback = None
+        self.timer = timing.Timer()
 
     @property
     def success(self):
@@ -20,12 +28,91 @@ class ExporterResult(object):
     def run_exporter(cls, exporter, source, type):
         result = ExporterResult(exporter=exporter, type=type)
 
+        with result.timer.record('run'):
+            try:
+                exporter.export(source)
+            except Exception as exc:
+                result.traceback = format_trace(inspect.trace(), exc)
+        return result
+
+
+# Export source of the current exporter pool process.
+_POOL_SOURCE = None
+
+
+def _init_pool(source):
+    global _POOL_SOURCE  # pylint: disable=global-statement
+    _POOL_SOURCE = source
+
+
+def _run_pool_exporter(exporter, type):
+    return ExporterResult.run_exporter(
+        exporter=exporter, source=_POOL_SOURCE, type=type)
+
+
+def run_exporters(exporters, source, type, processes=None):
+    """
+    Runs export operations of the exporters on the same source.
+
+    If ``processes`` is greater than 1, exporters run concurrently in a
+    pool of child processes, which get the source once at start up.
+    Attributes set on the exporters during export (e.g. ``url``) are copied
+    back to the given exporter objects. Exporters that cannot be pickled
+    (e.g. lambdas in their configuration) are run in this process instead.
+
+    :param exporters: Exporters to run.
+    :type exporters: ``list`` of
+      :py:class:`BaseExporter <testplan.common.exporters.BaseExporter>`
+    :param source: Source of the export operations, e.g. test report.
+    :type source: ``object``
+    :param type: Export type.
+    :type type: ``str``
+    :param processes: Maximum number of exporter processes.
+    :type processes: ``int``
+    :return: Results of the export operations, in exporter order.
+    :rtype: ``list`` of :py:class:`ExporterResult`
+    """
+    if processes and processes > 1 and len(exporters) > 1:
         try:
-            exporter.export(source)
-        except Exception as exc:
-            result.traceback = format_trace(inspect.trace(), exc)
+            cPickle.dumps(exporters, -1)
+        except Exception:
+            pass
+        else:
+            pool = multiprocessing.Pool(
+                min(processes, len(exporters)),
+                initializer=_init_pool, initargs=(source,))
+            try:
+                pending = [
+                    pool.apply_async(_run_pool_exporter, (exporter, type))
+                    for exporter in exporters]
+                return [
+                    _pool_result(exporter, type, async_result)
+                    for exporter, async_result in zip(exporters, pending)]
+            finally:
+                pool.close()
+                pool.join()
+
+    return [
+        ExporterResult.run_exporter(
+            exporter=exporter, source=source, type=type)
+        for exporter in exporters]
+
+
+def _pool_result(exporter, type, async_result):
+    """Result of an exporter pool task, for the original exporter."""
+    try:
+        result = async_result.get()
+    except Exception as exc:
+        result = ExporterResult(exporter=exporter, type=type)
+        result.traceback = format_trace(inspect.trace(), exc)
         return result
 
+    state = dict(result.exporter.__dict__)
+    state.pop('_cfg', None)
+    exporter.__dict__.update(state)
+    result.exporter = exporter
+    return result
+
 
 class ExporterConfig(Config):
 
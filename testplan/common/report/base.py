@@ -153,15 +153,27 @@ class Report(object):
         """Extend ``self.entries`` with ``items``, no restrictions."""
         self.entries.extend(items)
 
+    def _copy(self):
+        """
+        Shallow copy of the report, used by filter operations. Entries are
+        shared with the original report, but not the ``logs`` list.
+        """
+        report_obj = copy.copy(self)
+        report_obj.logs = list(self.logs)
+        return report_obj
+
     def filter(self, *functions, **kwargs):
         """
         Filtering report's entries in place using the given functions.
         If any of the functions return ``True``
         for a given entry, it will be kept.
+
+        Unless called with ``__copy=False``, the result is a copy of this
+        report which shares the kept entries with the original.
         """
         report_obj = self
         if kwargs.get('__copy', True):
-            report_obj = copy.deepcopy(self)
+            report_obj = self._copy()
 
         report_obj.entries = [
             e for e in self.entries
@@ -270,22 +282,28 @@ class ReportGroup(Report):
             self.append(item)
 
     def filter(self, *functions, **kwargs):
-        """Recursively filter report entries and sub-entries."""
+        """
+        Recursively filter report entries and sub-entries.
+
+        Kept child reports are copied shallowly before being filtered, so
+        the original report is not modified and the filtered report shares
+        leaf entries (e.g. serialized assertions) with it instead of
+        duplicating the whole tree.
+        """
         is_root = kwargs.get('__copy', True)
-        report_obj = copy.deepcopy(self) if is_root else self
+        report_obj = self._copy() if is_root else self
 
         entries = []
-        for entry in report_obj.entries:
+        for entry in self.entries:
             if any(func(entry) for func in functions):
 
                 if isinstance(entry, Report):
-                    entry = entry.filter(*functions, __copy=False)
+                    entry = entry._copy().filter(*functions, __copy=False)
 
                 entries.append(entry)
 
         report_obj.entries = entries
-        if is_root:
-            report_obj.build_index(recursive=True)
+        report_obj.build_index()
 
         return report_obj
 
@@ -235,6 +235,7 @@ class GenericNested(fields.Field):
         self.schema_context = schema_context
         self.type_field = type_field
         self.many = kwargs.get('many', False)
+        self._schemas = None
         super(GenericNested, self).__init__(default=default, **kwargs)
 
     def _get_schema_obj(self, schema_value):
@@ -262,7 +263,16 @@ class GenericNested(fields.Field):
 
     @property
     def schemas(self):
-        """Return schema mapping in `<CLASS_NAME>: <SCHEMA_OBJECT>` format."""
+        """
+        Return schema mapping in `<CLASS_NAME>: <SCHEMA_OBJECT>` format.
+        Schema objects are created once per field, using the parent schema
+        context at the time.
+        """
+        if self._schemas is None:
+            self._schemas = self._make_schemas()
+        return self._schemas
+
+    def _make_schemas(self):
         result = {}
         for object_type, schema_value in self.schema_context.items():
             if isinstance(object_type, six.string_types):
@@ -1,9 +1,110 @@
+import threading
+
 from marshmallow import Schema
+from marshmallow.decorators import PRE_DUMP, POST_DUMP
+from marshmallow.utils import missing
 
 from testplan.common.utils.registry import Registry
 
 from . import fields as custom_fields
 
+
+class _CachedSchema(object):
+    """
+    Strict schema instance kept for reuse, along with the plan of fields to
+    dump if the schema allows to bypass the generic marshmallow dump.
+    """
+
+    def __init__(self, schema_class):
+        self.schema = schema_class(strict=True)
+        self.plan = self._dump_plan(self.schema)
+
+    @staticmethod
+    def _dump_plan(schema):
+        """
+        Output key, attribute name and field of the fields to dump, or None
+        for schemas with dump hooks, key prefixes or implicit fields.
+        """
+        # pylint: disable=protected-access
+        if schema.many or schema.prefix or schema.opts.fields or \
+                schema.opts.additional or \
+                type(schema).handle_error is not Schema.handle_error:
+            return None
+        if any(tag[0] in (PRE_DUMP, POST_DUMP)
+               for tag in schema.__processors__):
+            return None
+        return [(field.dump_to or name, name, field)
+                for name, field in schema.fields.items()
+                if not field.load_only]
+
+    def dump(self, obj):
+        """Same result as ``schema.dump(obj).data``."""
+        if self.plan is None:
+            return self.schema.dump(obj).data
+        accessor = self.schema.get_attribute
+        result = self.schema.dict_class()
+        for key, name, field in self.plan:
+            value = field.serialize(name, obj, accessor=accessor)
+            if value is not missing:
+                result[key] = value
+        return result
+
+
+_CACHE = threading.local()
+
+
+def _cached_schemas(schema_class):
+    """
+    Idle instances of the schema class for the current thread. Instances
+    keep (un)marshalling state, they are taken out of the list while in use
+    so that nested and concurrent calls do not share them.
+    """
+    try:
+        schemas = _CACHE.schemas
+    except AttributeError:
+        schemas = _CACHE.schemas = {}
+    return schemas.setdefault(schema_class, [])
+
+
+def cached_dump(schema_class, obj):
+    """
+    Serializes an object with a cached strict instance of the schema class,
+    instead of creating a schema per object.
+
+    :param schema_class: Schema class.
+    :type schema_class: ``type``
+    :param obj: Object to serialize.
+    :type obj: ``object``
+    :return: Serialized data.
+    :rtype: ``dict``
+    """
+    idle = _cached_schemas(schema_class)
+    cached = idle.pop() if idle else _CachedSchema(schema_class)
+    try:
+        return cached.dump(obj)
+    finally:
+        idle.append(cached)
+
+
+def cached_load(schema_class, data):
+    """
+    Deserializes data with a cached strict instance of the schema class,
+    instead of creating a schema per object.
+
+    :param schema_class: Schema class.
+    :type schema_class: ``type``
+    :param data: Serialized data.
+    :type data: ``dict``
+    :return: Deserialized object.
+    :rtype: ``object``
+    """
+    idle = _cached_schemas(schema_class)
+    cached = idle.pop() if idle else _CachedSchema(schema_class)
+    try:
+        return cached.schema.load(data).data
+    finally:
+        idle.append(cached)
+
 def load_tree_data(
     data,
     node_schema,
@@ -26,15 +127,14 @@ def load_tree_data(
 
         if obj_type == node_type:
             child_data = _data.pop(nodes_field)
-            res = node_schema(strict=True).load(_data)
-            obj = res.data
+            obj = cached_load(node_schema, _data)
 
             nodes = [_load(c_data) for c_data in child_data]
             setattr(obj, nodes_attr_name, nodes)
             return obj
 
         elif obj_type == leaf_type:
-            return leaf_schema(strict=True).load(_data).data
+            return cached_load(leaf_schema, _data)
         else:
             raise ValueError('Invalid object type: {}'.format(obj_type))
     return _load(data)
@@ -64,4 +164,4 @@ class SchemaRegistry(Registry):
     """
 
     def serialize(self, obj):
-        return self[obj](strict=True).dump(obj).data
+        return cached_dump(self[obj], obj)
@@ -1,10 +1,18 @@
 import operator
 import decimal
 import inspect
+import multiprocessing
 from collections import Mapping, Iterable
 
+from six.moves import cPickle
+
 import six
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
 from .exceptions import format_trace
 from .reporting import Absent, fmt, NATIVE_TYPES, callable_name
 
@@ -298,9 +306,22 @@ class Custom(Callable):
 ########################################################################
 
 
-# Do not change unless you know what you are doing
-# Making this larger will considerably slow down the comparison
-MAX_UNORDERED_COMPARE = 16
+# Every value is compared with every expectation, so the comparison time
+# grows with the square of this limit.
+MAX_UNORDERED_COMPARE = 1000
+
+# Smaller error grids are faster to solve in pure python.
+NUMPY_MIN_GRID = 64
+
+# Fewer value/expectation comparisons are faster to evaluate in process.
+PROCESS_POOL_MIN_PAIRS = 1000
+
+# Error of a missed or extra message, see `_to_error`.
+MISSED_ERROR = 100000
+
+# Error of a value and an expectation that differ on index keys, same as
+# every key being wrong between existing messages.
+UNINDEXED_ERROR = 10000
 
 
 def compare_with_callable(callable_obj, value):
@@ -723,68 +744,137 @@ def _best_permutation(grid):
     value vs. expected value, finds the permutation which
     associates actual vs expected with the least error.
 
-    Be careful running this on of large grids, as the
-    runtime is expotential O(a^n). Sample run times on desktop hardware::
+    This is the assignment problem, solved with the shortest augmenting path
+    variant of the Hungarian algorithm (Jonker-Volgenant) in O(n^3) time.
+    If NumPy is installed it is used for grids larger than 64. Sample run
+    times on desktop hardware::
 
-      size:  0, ms:    0.002  size:  1, ms:    0.010  size:  2, ms:    0.022
-      size:  3, ms:    0.046  size:  4, ms:    0.105  size:  5, ms:    0.207
-      size:  6, ms:    0.434  size:  7, ms:    0.540  size:  8, ms:    1.351
-      size:  9, ms:    2.338  size: 10, ms:    5.470  size: 11, ms:    9.398
-      size: 12, ms:   21.651  size: 13, ms:   36.114  size: 14, ms:   79.871
-      size: 15, ms:  166.488  size: 16, ms:  363.120  size: 17, ms:  943.494
-      size: 18, ms: 1818.761  size: 19, ms: 2370.988  size: 20, ms: 9989.508
+      python  size:  16, ms:  0.6  size:  64, ms:  9.2  size: 200, ms: 234.3
+      numpy   size:  16, ms:  1.9  size:  64, ms:  8.4  size: 200, ms:  94.6
 
     e.g. for the grid::
 
       >>> grid = [[1000, 2000, 2000],
       ...         [1000, 2000, 2000],
       ...         [   0, 2000, 2000]]
-      [1, 2, 0]
+      [2, 1, 0]
 
-    Where [1, 2, 0] is a list of indices mapping::
+    Where [2, 1, 0] is a list of indices mapping::
 
-      - row 0 to col 1
-      - row 1 to col 2
+      - row 0 to col 2
+      - row 1 to col 1
       - row 2 to col 0
 
     """
+    if not grid:
+        return []
+    if numpy is not None and len(grid) > NUMPY_MIN_GRID:
+        return _assignment_numpy(grid)
+    return _assignment(grid)
 
-    def bp_loop(outstanding, level, grid, grid_len, cache):
-        """
-            Recursively finds a solution by
-            progressively excluding poor permutations "paths"
-        """
-        if not outstanding:
-            return 0, []
-
-        # [(cost:int, indx:int)]
-        level_permutations = [(grid[level][indx], indx)
-                              for indx in outstanding]
-        level_permutations.sort()
-        min_cost = None
-        min_path = None
-        for cost, indx in level_permutations:
-            remaining = outstanding - frozenset([indx])
-            # memoise calls, for large grids
-            # this cuts down the amount of calls significantly
-            pair = cache.get(remaining, None)
-            if pair is None:
-                pair = bp_loop(remaining, level + 1, grid, grid_len, cache)
-                cache[remaining] = pair
-            sub_cost, sub_path = pair
-            this_cost = cost + sub_cost
-            this_path = [indx] + sub_path
-            if (min_cost is None) or (this_cost < min_cost):
-                min_cost = this_cost
-                min_path = this_path
-        return min_cost, min_path
-
-    grid_len = len(grid)
-
-    cache = {}
-
-    # list of int indices
-    return bp_loop(frozenset(range(grid_len)), 0, grid, grid_len, cache)[1]
+
+def _assignment(grid):
+    """
+    Pure python assignment solver used by :py:func:`_best_permutation`.
+
+    Rows are added one at a time and the cheapest augmenting path from the new
+    row to a free column is found with Dijkstra's algorithm on reduced costs.
+    Arrays are 1-indexed, column 0 is a sentinel that holds the new row.
+    """
+    size = len(grid)
+    inf = float('inf')
+    row_pot = [0] * (size + 1)  # u
+    col_pot = [0] * (size + 1)  # v
+    col_row = [0] * (size + 1)  # row assigned to each column
+    way = [0] * (size + 1)  # previous column on the augmenting path
+
+    for row in range(1, size + 1):
+        col_row[0] = row
+        col = 0
+        min_cost = [inf] * (size + 1)
+        used = [False] * (size + 1)
+        while True:
+            used[col] = True
+            cur_row = col_row[col]
+            costs = grid[cur_row - 1]
+            delta = inf
+            next_col = 0
+            for idx in range(1, size + 1):
+                if not used[idx]:
+                    cost = costs[idx - 1] - row_pot[cur_row] - col_pot[idx]
+                    if cost < min_cost[idx]:
+                        min_cost[idx] = cost
+                        way[idx] = col
+                    if min_cost[idx] < delta:
+                        delta = min_cost[idx]
+                        next_col = idx
+            for idx in range(size + 1):
+                if used[idx]:
+                    row_pot[col_row[idx]] += delta
+                    col_pot[idx] -= delta
+                else:
+                    min_cost[idx] -= delta
+            col = next_col
+            if col_row[col] == 0:
+                break
+        _augment(col_row, way, col)
+
+    return _to_permutation(col_row)
+
+
+def _assignment_numpy(grid):
+    """
+    Same algorithm as :py:func:`_assignment`, with the scan of each row over
+    the columns done by NumPy array operations.
+    """
+    size = len(grid)
+    costs = numpy.zeros((size + 1, size + 1))
+    costs[1:, 1:] = grid
+    row_pot = numpy.zeros(size + 1)
+    col_pot = numpy.zeros(size + 1)
+    col_row = numpy.zeros(size + 1, dtype=int)
+
+    for row in range(1, size + 1):
+        col_row[0] = row
+        col = 0
+        min_cost = numpy.full(size + 1, numpy.inf)
+        way = numpy.zeros(size + 1, dtype=int)
+        free = numpy.ones(size + 1, dtype=bool)
+        while True:
+            free[col] = False
+            cur_row = col_row[col]
+            reduced = costs[cur_row] - row_pot[cur_row] - col_pot
+            better = free & (reduced < min_cost)
+            min_cost[better] = reduced[better]
+            way[better] = col
+            candidates = numpy.where(free, min_cost, numpy.inf)
+            col = candidates.argmin()
+            delta = candidates[col]
+            used = ~free
+            row_pot[col_row[used]] += delta
+            col_pot[used] -= delta
+            min_cost[free] -= delta
+            if col_row[col] == 0:
+                break
+        _augment(col_row, way, col)
+
+    return _to_permutation(col_row.tolist())
+
+
+def _augment(col_row, way, col):
+    """Flips the assignments along the augmenting path ending at ``col``."""
+    while col:
+        prev_col = way[col]
+        col_row[col] = col_row[prev_col]
+        col = prev_col
+
+
+def _to_permutation(col_row):
+    """Converts 1-indexed column to row assignments to row to column."""
+    permutation = [0] * (len(col_row) - 1)
+    for col, row in enumerate(col_row[1:]):
+        permutation[row - 1] = col
+    return permutation
 
 
 # helper func, used to generate errors matrix
@@ -815,7 +905,7 @@ def _to_error(cmpr_tuple, weights):
     if pass_flag is True:
         return 0 # perfect match
     if pass_flag is False and is_missed_message(comparisons):
-        return 100000 # missed message
+        return MISSED_ERROR # missed message
 
     # worst possible error: value to normalise against
     worst_error = 0
@@ -857,8 +947,125 @@ class Expected(object):
         self.only = only
 
 
+def _index_signature(value, key_index, ignore=None, only=None):
+    """
+    Values of the index keys of a value or an expectation, compared by their
+    string representation. Returns ``None`` if the expectation can match
+    values with any index, i.e if it uses a comparator for an index key.
+    """
+    signature = []
+    for key in key_index:
+        if (ignore and key in ignore) or (only and key not in only):
+            return None
+        item = value[key] if key in value else Absent
+        if item is Absent:
+            signature.append(item)
+        elif is_comparator(item):
+            return None
+        else:
+            signature.append(str(item))
+    return tuple(signature)
+
+
+def _candidate_pairs(msgs, cmps, key_index):
+    """
+    Yields the (message index, comparison index) pairs that need to be
+    compared, pairs with a synthesized Absent side are always a missed
+    message so they are skipped. With a ``key_index`` only values and
+    expectations that share the index keys values are paired.
+    """
+    real_msgs = [idx for idx, msg in enumerate(msgs) if msg is not Absent]
+    real_cmps = [idx for idx, cmpr in enumerate(cmps)
+                 if cmpr.value is not Absent]
+
+    if key_index is None:
+        for msg_indx in real_msgs:
+            for cmp_indx in real_cmps:
+                yield msg_indx, cmp_indx
+        return
+
+    buckets = {}
+    unindexed = []
+    for cmp_indx in real_cmps:
+        cmpr = cmps[cmp_indx]
+        signature = _index_signature(
+            cmpr.value, key_index, ignore=cmpr.ignore, only=cmpr.only)
+        if signature is None:
+            unindexed.append(cmp_indx)
+        else:
+            buckets.setdefault(signature, []).append(cmp_indx)
+
+    for msg_indx in real_msgs:
+        signature = _index_signature(msgs[msg_indx], key_index)
+        for cmp_indx in sorted(buckets.get(signature, []) + unindexed):
+            yield msg_indx, cmp_indx
+
+
+def _compare_row(msg, cmps):
+    """Compares a value against a list of expectations."""
+    return [compare(cmpr.value, msg, ignore=cmpr.ignore, only=cmpr.only)
+            for cmpr in cmps]
+
+
+# Expectations of the comparisons done by a process of the pool.
+_POOL_CMPS = None
+
+
+def _init_pool(cmps):
+    global _POOL_CMPS  # pylint: disable=global-statement
+    _POOL_CMPS = cmps
+
+
+def _compare_pool_row(args):
+    msg, cmp_indices = args
+    return _compare_row(msg, [_POOL_CMPS[idx] for idx in cmp_indices])
+
+
+def _compare_pairs(msgs, cmps, pairs, processes=None):
+    """
+    Compares each value/expectation pair, using a pool of ``processes`` if
+    there are enough pairs and the inputs can be pickled.
+
+    :return: Comparison tuple for each pair.
+    :rtype: ``dict`` of (``int``, ``int``) to ``tuple``
+    """
+    rows = {}
+    for msg_indx, cmp_indx in pairs:
+        rows.setdefault(msg_indx, []).append(cmp_indx)
+    tasks = [(msgs[msg_indx], cmp_indices)
+             for msg_indx, cmp_indices in rows.items()]
+
+    results = None
+    if processes and processes > 1 and len(pairs) >= PROCESS_POOL_MIN_PAIRS:
+        try:
+            cPickle.dumps((cmps, tasks), -1)
+        except Exception:
+            # i.e lambda comparators, compare in process instead.
+            pass
+        else:
+            pool = multiprocessing.Pool(
+                processes, initializer=_init_pool, initargs=(cmps,))
+            try:
+                results = pool.map(
+                    _compare_pool_row, tasks,
+                    chunksize=max(1, len(tasks) // (processes * 4)))
+            finally:
+                pool.close()
+                pool.join()
+    if results is None:
+        results = [_compare_row(msg, [cmps[idx] for idx in cmp_indices])
+                   for msg, cmp_indices in tasks]
+
+    match_matrix = {}
+    for (msg_indx, cmp_indices), row in zip(rows.items(), results):
+        for cmp_indx, cmpr_tuple in zip(cmp_indices, row):
+            match_matrix[(msg_indx, cmp_indx)] = cmpr_tuple
+    return match_matrix
+
+
 def unordered_compare(
-    match_name, values, comparisons, description=None, tag_weightings=None
+    match_name, values, comparisons, description=None, tag_weightings=None,
+    key_index=None, processes=None
 ):
     """
     Matches a list of expected values against a list of expected comparisons.
@@ -874,6 +1081,11 @@ def unordered_compare(
     it is possible to give them additional weighting during the comparison,
     by specifying a "tag_weightings" dict.
 
+    If some keys identify the values (e.g. ClOrdID FIX tag), they can be
+    given as a "key_index" so that only values and expectations with the
+    same index keys values are compared. Expectations that use a comparator
+    or ignore one of the index keys are still compared with all values.
+
     The values/comparisons permutation that results in the least
     error is then returned as a list of dicts that can be included
     in the testing report.
@@ -881,7 +1093,7 @@ def unordered_compare(
     .. note::
 
       It is possible to specify up to a maximum of
-      16 values or expected comparisons.
+      ``MAX_UNORDERED_COMPARE`` (1000) values or expected comparisons.
 
     .. note::
 
@@ -902,6 +1114,13 @@ def unordered_compare(
     :param tag_weightings: Per-key overrides that specify a
                             different weight for different keys.
     :type tag_weightings: ``dict`` of ``str`` to ``int``
+    :param key_index: Keys whose values, compared as strings, must be the
+      same for a value and an expectation to be matched.
+    :type key_index: ``list``
+    :param processes: Number of processes used to compare values and
+      expectations, if there are at least ``PROCESS_POOL_MIN_PAIRS`` pairs
+      and they can be pickled.
+    :type processes: ``int``
 
     :return: A list of test reports that can be appended to the result object
     :rtype: ``list`` of ``dict``
@@ -916,12 +1135,12 @@ def unordered_compare(
     list_cmps = list(comparisons)
 
     # if either the values or expected comparisons
-    # exceed 16, then raise an exception:
+    # exceed the limit, then raise an exception:
     # it would take too long to process
-    #  (expotential complexity algorithm involved)
     if max(len(list_msgs), len(list_cmps)) > MAX_UNORDERED_COMPARE:
-        raise Exception("Too many values being compared. "+
-                        "Unordered matching supports up to 16 comparisons")
+        raise Exception(
+            'Too many values being compared. Unordered matching supports'
+            ' up to {} comparisons'.format(MAX_UNORDERED_COMPARE))
 
     # Generate fake comparisons or values in case that the number of values
     # is different from what was expected.
@@ -935,39 +1154,54 @@ def unordered_compare(
     proc_cmps = list_cmps + synth_cmps
     assert len(proc_msgs) == len(proc_cmps)
 
-    # generate a 2D square "matrix" of match (bool pass, list) tuples
-    # by calling compare on every message / comparison combination
-    # This matrix is organised as:
-    #
-    #                   # cmp0   cmp1   cmp2   cmp3   # vs:
-    #   match_matrix = [[tpl00, tpl01, tpl02, tpl03], # msg0
-    #                   [tpl10, tpl11, tpl12, tpl13], # msg1
-    #                   [tpl20, tpl21, tpl22, tpl23], # msg2
-    #                   [tpl30, tpl31, tpl32, tpl33]] # msg3
-    #
-    match_matrix = [[compare(cmpr.value,
-                             msg,
-                             ignore=cmpr.ignore,
-                             only=cmpr.only)
-                     for cmpr in proc_cmps] for msg in proc_msgs]
+    # generate a sparse "matrix" of match (bool pass, list) tuples by calling
+    # compare on the candidate message / comparison combinations, keyed by
+    # (message index, comparison index)
+    match_matrix = _compare_pairs(
+        proc_msgs, proc_cmps,
+        list(_candidate_pairs(proc_msgs, proc_cmps, key_index)),
+        processes=processes)
 
     # generate a 2D square "matrix" of error integers (0 <= err <= 1000000)
     # where:
     #   -       0 indicates a perfect message match (no tag mismatches)
     #   -   10000 indicates every tag being wrong between existing messages
+    #             or messages that are not indexed together
     #   - 1000000 indicates a missed or extra
     #               message (when len(msgs) != len(comparisons))
     #
-    # Each object in "match_matrix" is mapped to this error int.
-    # The shape and position of the matrix is preserved.
+    # This matrix is organised as:
     #
-    errors_matrix = [[_to_error(cmpr_tuple, weights)
-                      for cmpr_tuple in row] for row in match_matrix]
+    #                    # cmp0   cmp1   cmp2   cmp3   # vs:
+    #   errors_matrix = [[err00, err01, err02, err03], # msg0
+    #                    [err10, err11, err12, err13], # msg1
+    #                    [err20, err21, err22, err23], # msg2
+    #                    [err30, err31, err32, err33]] # msg3
+    #
+    def to_error(msg_indx, cmp_indx):
+        if (msg_indx, cmp_indx) in match_matrix:
+            return _to_error(match_matrix[(msg_indx, cmp_indx)], weights)
+        elif proc_msgs[msg_indx] is Absent or\
+                proc_cmps[cmp_indx].value is Absent:
+            return MISSED_ERROR
+        return UNINDEXED_ERROR
+
+    errors_matrix = [[to_error(msg_indx, cmp_indx)
+                      for cmp_indx in range(len(proc_cmps))]
+                     for msg_indx in range(len(proc_msgs))]
 
     # compute the optimal matching based on the permutation between actual and
     # expected message that results in the least error
     matched_indices = _best_permutation(errors_matrix)
 
+    # compare the matched pairs that were skipped so far for the report
+    for msg_indx, cmp_indx in enumerate(matched_indices):
+        if (msg_indx, cmp_indx) not in match_matrix:
+            cmpr = proc_cmps[cmp_indx]
+            match_matrix[(msg_indx, cmp_indx)] = compare(
+                cmpr.value, proc_msgs[msg_indx],
+                ignore=cmpr.ignore, only=cmpr.only)
+
     # construct a list of report entries
     base_descr = description or "unordered {}".format(match_name)
 
@@ -991,8 +1225,8 @@ def unordered_compare(
                                         proc_cmps[cmp_indx].value,
                                         proc_msgs[msg_indx]),
              # 'time': now(),  # TODO: use local and UTC times
-             'comparison': match_matrix[msg_indx][cmp_indx][1],
-             'passed': bool(match_matrix[msg_indx][cmp_indx][0]),
+             'comparison': match_matrix[(msg_indx, cmp_indx)][1],
+             'passed': bool(match_matrix[(msg_indx, cmp_indx)][0]),
              'comparison_index': cmp_indx}
             for msg_indx, cmp_indx in enumerate(matched_indices)]
 
@@ -1167,7 +1401,7 @@ class DictmatchAllResult(object):
 
 def dictmatch_all_compat(
     match_name, comparisons, values,
-    description, key_weightings,
+    description, key_weightings, key_index=None, processes=None,
 ):
     """This is being used for internal compatibility."""
     matches = unordered_compare(
@@ -1175,7 +1409,9 @@ def dictmatch_all_compat(
         values=values,
         comparisons=comparisons,
         description=description,
-        tag_weightings=key_weightings
+        tag_weightings=key_weightings,
+        key_index=key_index,
+        processes=processes,
     )
 
     all_passed = True
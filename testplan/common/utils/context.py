@@ -61,3 +61,26 @@ def is_context(value):
     :rtype: ``bool``
     """
     return isinstance(value, ContextValue)
+
+
+def referenced_drivers(value):
+    """
+    Names of the drivers referenced by the context values within a value,
+    i.e a driver config option or a list / dict of them.
+
+    :param value: Value which may contain context values.
+    :type value: ``object``
+
+    :return: Driver names.
+    :rtype: ``set`` of ``str``
+    """
+    if is_context(value):
+        return {value.driver}
+    if isinstance(value, dict):
+        value = value.values()
+    elif not isinstance(value, (list, tuple, set, frozenset)):
+        return set()
+    drivers = set()
+    for item in value:
+        drivers.update(referenced_drivers(item))
+    return drivers
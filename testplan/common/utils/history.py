@@ -0,0 +1,189 @@
+"""Persistent store of durations recorded across runs."""
+
+import os
+import time
+import sqlite3
+import threading
+
+from .path import makedirs
+from .strings import slugify
+
+KEY_SEPARATOR = '::'
+
+
+def history_key(*names):
+    """
+    Key of a report in the history, made of the names of the report and its
+    parents, i.e ``history_key('MyMultitest', 'MySuite', 'my_testcase')``.
+    """
+    return KEY_SEPARATOR.join(str(name) for name in names)
+
+
+def default_history_path(entity):
+    """
+    Returns a history database path for an
+    :py:class:`Entity <testplan.common.entity.base.Entity>` object, that is
+    next to its runpath so that it outlives the runpath cleanup. It can be
+    passed as ``duration_history`` option of the test runner.
+    """
+    runpath = os.path.normpath(entity.runpath or entity.generate_runpath())
+    return os.path.join(os.path.dirname(runpath),
+                        '{}_history.db'.format(slugify(entity.uid())))
+
+
+class DurationHistory(object):
+    """
+    Durations (in seconds) of previous executions keyed by a string
+    identifier, backed by an sqlite database so that they can be reused by
+    following runs.
+
+    .. code-block:: python
+
+      history = DurationHistory(path='/var/tmp/user/durations.db')
+      history.record('MyMultitest', 12.5)
+      history.get('MyMultitest')  # 12.5
+
+      # Durations of a test report and all its suites and testcases.
+      history.record_report(multitest_report)
+      history.get(history_key('MyMultitest', 'MySuite', 'my_testcase'))
+
+    :param path: Database file path, ``None`` for an in-memory store.
+    :type path: ``str`` or ``NoneType``
+    :param window: Number of most recent durations averaged by
+      :py:meth:`get`.
+    :type window: ``int``
+    """
+
+    def __init__(self, path=None, window=5):
+        self._path = path
+        self._window = window
+        self._lock = threading.Lock()
+        if path is not None:
+            makedirs(os.path.dirname(os.path.abspath(path)))
+        self._conn = sqlite3.connect(
+            path or ':memory:', check_same_thread=False)
+        with self._conn:
+            self._conn.execute(
+                'CREATE TABLE IF NOT EXISTS durations ('
+                'key TEXT NOT NULL, duration REAL NOT NULL,'
+                ' recorded REAL NOT NULL)')
+            self._conn.execute(
+                'CREATE INDEX IF NOT EXISTS durations_key'
+                ' ON durations (key)')
+
+    @property
+    def path(self):
+        """Database file path."""
+        return self._path
+
+    def record(self, key, duration):
+        """
+        Store a new duration for the given key.
+
+        :param key: Identifier of the timed item.
+        :type key: ``str``
+        :param duration: Duration in seconds.
+        :type duration: ``int`` or ``float``
+        """
+        self.record_many([(key, duration)])
+
+    def record_many(self, items):
+        """
+        Store many durations in a single transaction.
+
+        :param items: Iterable of ``(key, duration)`` pairs.
+        :type items: ``iterable``
+        """
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.executemany(
+                'INSERT INTO durations (key, duration, recorded)'
+                ' VALUES (?, ?, ?)',
+                ((str(key), float(duration), now) for key, duration in items))
+
+    def get(self, key, default=None):
+        """
+        Average of the most recent durations recorded for the given key.
+
+        :param key: Identifier of the timed item.
+        :type key: ``str``
+        :param default: Value to return if key has no recorded duration.
+        :type default: ``object``
+        :return: Duration in seconds.
+        :rtype: ``float``
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                'SELECT duration FROM durations WHERE key = ?'
+                ' ORDER BY rowid DESC LIMIT ?',
+                (str(key), self._window)).fetchall()
+        if not rows:
+            return default
+        return sum(row[0] for row in rows) / len(rows)
+
+    def get_many(self, keys, default=None):
+        """
+        Average of the most recent durations for each of the given keys.
+
+        :param keys: Identifiers of the timed items.
+        :type keys: ``iterable`` of ``str``
+        :param default: Value for keys that have no recorded duration.
+        :type default: ``object``
+        :return: Key to duration mapping.
+        :rtype: ``dict``
+        """
+        return {key: self.get(key, default=default) for key in keys}
+
+    def keys(self, prefix=None):
+        """
+        Keys that have at least one recorded duration.
+
+        :param prefix: Only return keys of the given parent key and its
+          children, i.e the suites and testcases of a MultiTest.
+        :type prefix: ``str`` or ``NoneType``
+        :return: Sorted keys.
+        :rtype: ``list`` of ``str``
+        """
+        query = 'SELECT DISTINCT key FROM durations'
+        args = ()
+        if prefix is not None:
+            query += ' WHERE key = ? OR substr(key, 1, ?) = ?'
+            child_prefix = prefix + KEY_SEPARATOR
+            args = (prefix, len(child_prefix), child_prefix)
+        with self._lock:
+            rows = self._conn.execute(query + ' ORDER BY key', args).fetchall()
+        return [row[0] for row in rows]
+
+    def record_report(self, report, parents=(), key=None):
+        """
+        Store the ``run`` timer durations of a test report and all its
+        children, keyed by :py:func:`history_key` of their names.
+
+        :param report: Test report.
+        :type report: :py:class:`~testplan.report.testing.base.TestGroupReport`
+        :param parents: Names of the parent reports.
+        :type parents: ``tuple`` of ``str``
+        :param key: Key of the report used instead of its name, i.e the
+          signature of the task that created the test.
+        :type key: ``str`` or ``NoneType``
+        """
+        self.record_many(self._report_durations(report, parents, key))
+
+    def _report_durations(self, report, parents, key=None):
+        names = tuple(parents) + (key or report.name,)
+        timer = getattr(report, 'timer', {})
+        if 'run' in timer and timer['run'].elapsed is not None:
+            yield history_key(*names), timer['run'].elapsed
+        for entry in getattr(report, 'entries', ()):
+            # Testcase entries are serialized assertions, not reports.
+            if hasattr(entry, 'timer'):
+                for item in self._report_durations(entry, names):
+                    yield item
+
+    def __contains__(self, key):
+        return self.get(key) is not None
+
+    def close(self):
+        """Close the underlying database connection."""
+        with self._lock:
+            self._conn.close()
@@ -2,6 +2,8 @@
 Module of utility types and functions that perform matching.
 """
 import os
+import time
+import select
 
 
 def match_regexps_in_file(logpath, log_extracts, return_unmatched=False):
@@ -33,3 +35,192 @@ def match_regexps_in_file(logpath, log_extracts, return_unmatched=False):
         ]
         return all(extracts_status), extracted_values, unmatched
     return all(extracts_status), extracted_values
+
+
+class LogWatcher(object):
+    """
+    Incrementally matches regular expressions against the lines of a file
+    that is being written, i.e a driver logfile. Each call of
+    :py:meth:`update` only reads the bytes appended since the previous call
+    and regular expressions stop being checked once they have matched. A line
+    is matched once its newline is written, or once the file stops growing
+    between two calls if it has no newline, so that values are not
+    extracted from a line that is still being written.
+
+    :param logpath: Path of the file to watch.
+    :type logpath: ``str``
+    :param log_extracts: Regular expressions to match.
+    :type log_extracts: ``list`` of ``_sre.SRE_Pattern``
+    :param chunk_size: Maximum number of bytes read at a time.
+    :type chunk_size: ``int``
+    """
+
+    def __init__(self, logpath, log_extracts, chunk_size=1024 * 1024):
+        self.logpath = logpath
+        self.log_extracts = list(log_extracts)
+        self.chunk_size = chunk_size
+        self.extracted_values = {}
+        self.unmatched = list(self.log_extracts)
+        self._position = 0
+        self._inode = None
+        self._partial = b''
+
+    def reset(self):
+        """Forget all matches and read the file from the start again."""
+        self.extracted_values = {}
+        self.unmatched = list(self.log_extracts)
+        self._position = 0
+        self._inode = None
+        self._partial = b''
+
+    def _match(self, line):
+        line = line.decode('utf-8', 'replace')
+        for regexp in list(self.unmatched):
+            match = regexp.match(line)
+            if match:
+                self.extracted_values.update(match.groupdict())
+                self.unmatched.remove(regexp)
+
+    def update(self):
+        """
+        Match the lines appended to the file since the previous call. The
+        file is read from the start again if it has been truncated or
+        replaced.
+
+        :return: True if all regular expressions have matched.
+        :rtype: ``bool``
+        """
+        if not self.unmatched:
+            return True
+
+        try:
+            stat = os.stat(self.logpath)
+        except OSError:
+            return False
+        if stat.st_ino != self._inode or stat.st_size < self._position:
+            self.reset()
+            self._inode = stat.st_ino
+        if stat.st_size == self._position:
+            # The file stopped growing since the previous call, so its
+            # unterminated last line is taken as complete, i.e a prompt.
+            if self._partial:
+                self._match(self._partial)
+            return not self.unmatched
+
+        with open(self.logpath, 'rb') as log:
+            log.seek(self._position)
+            while self.unmatched:
+                chunk = log.read(self.chunk_size)
+                if not chunk:
+                    break
+                self._position += len(chunk)
+                lines = (self._partial + chunk).split(b'\n')
+                self._partial = lines.pop()
+                for line in lines:
+                    self._match(line + b'\n')
+                    if not self.unmatched:
+                        break
+
+        return not self.unmatched
+
+
+class FileEventWaiter(object):
+    """
+    Waits for files to be created or modified within the directories of the
+    given paths using inotify, or for the timeout when inotify is not
+    available on the platform.
+
+    :param paths: File paths to watch.
+    :type paths: ``list`` of ``str``
+    """
+
+    # inotify(7) event masks and flags.
+    IN_MODIFY = 0x00000002
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_NONBLOCK = 0o4000
+    IN_CLOEXEC = 0o2000000
+
+    _libc = None
+
+    def __init__(self, paths):
+        self._fd = None
+        self._watched = set()
+        self.paths = list(paths)
+        libc = self._load_libc()
+        if libc is None:
+            return
+        fd = libc.inotify_init1(self.IN_NONBLOCK | self.IN_CLOEXEC)
+        if fd < 0:
+            return
+        self._fd = fd
+        self.watch()
+
+    @classmethod
+    def _load_libc(cls):
+        if cls._libc is None:
+            try:
+                import ctypes
+                import ctypes.util
+                libc = ctypes.CDLL(ctypes.util.find_library('c'),
+                                   use_errno=True)
+                libc.inotify_init1
+                libc.inotify_add_watch
+            except (ImportError, OSError, AttributeError, TypeError):
+                cls._libc = False
+            else:
+                cls._libc = libc
+        return cls._libc or None
+
+    @property
+    def active(self):
+        """True if all directories of the paths are being watched."""
+        return self._fd is not None and len(self._watched) == len(
+            {os.path.dirname(os.path.abspath(path)) for path in self.paths})
+
+    def watch(self):
+        """Watch the directories of the paths that exist, if not yet."""
+        if self._fd is None:
+            return
+        mask = (self.IN_MODIFY | self.IN_CLOSE_WRITE |
+                self.IN_MOVED_TO | self.IN_CREATE)
+        for path in self.paths:
+            directory = os.path.dirname(os.path.abspath(path))
+            if directory in self._watched:
+                continue
+            if self._libc.inotify_add_watch(
+                    self._fd, directory.encode('utf-8'), mask) >= 0:
+                self._watched.add(directory)
+
+    def wait(self, timeout):
+        """
+        Wait until a file changes within the watched directories.
+
+        :param timeout: Maximum wait duration in seconds.
+        :type timeout: ``float``
+        :return: True if a change was notified.
+        :rtype: ``bool``
+        """
+        if self._fd is None:
+            time.sleep(timeout)
+            return False
+        self.watch()
+        readable, _, _ = select.select([self._fd], [], [], timeout)
+        if not readable:
+            return False
+        # Drain pending events, the caller re-reads the files anyway.
+        while True:
+            try:
+                if not os.read(self._fd, 4096):
+                    break
+            except OSError:
+                break
+        return True
+
+    def close(self):
+        """Stop watching."""
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+            self._watched = set()
@@ -25,6 +25,10 @@ class AbsentType(object):
     def __str__(self):
         return self.descr
 
+    def __reduce__(self):
+        # Unpickled as the module singleton, i.e in comparison processes.
+        return 'Absent'
+
 
 Absent = AbsentType()
 
@@ -0,0 +1,483 @@
+"""
+Asyncio event loop thread shared by socket drivers, with coroutine based TCP
+server and client. Requires Python 3.4 or later.
+
+Only the TCP drivers serve their connections on the shared loop for now,
+other drivers can register with it through
+:py:meth:`~testplan.testing.multitest.driver.base.Driver.acquire_event_loop`.
+"""
+
+import asyncio
+import socket
+import threading
+import time
+
+from .buffer import LENGTH_PREFIX, frame
+
+
+# Default maximum size of a delimited message.
+STREAM_LIMIT = 2 ** 26
+# Maximum number of bytes read from a stream at a time.
+READ_SIZE = 65536
+
+
+class EventLoopThread(object):
+    """
+    Asyncio event loop running in a daemon thread, so that many connections
+    can be served by a single thread. Coroutines are submitted from other
+    threads with :py:meth:`run`.
+
+    Loops are shared by owner with :py:meth:`acquire` and :py:meth:`release`,
+    i.e all drivers of a MultiTest environment use the same loop.
+    """
+
+    _lock = threading.Lock()
+    _shared = {}
+
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        self._thread = None
+        self._users = 0
+
+    def start(self):
+        """Start the event loop thread."""
+        self._thread = threading.Thread(target=self._run_loop)
+        self._thread.daemon = True
+        self._thread.start()
+
+    def _run_loop(self):
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+
+    def stop(self, timeout=5):
+        """Stop the event loop and its thread."""
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join(timeout)
+        if not self._thread.is_alive():
+            self.loop.close()
+
+    def run(self, coro):
+        """
+        Run a coroutine on the event loop and wait for its result.
+
+        :param coro: Coroutine object.
+        :type coro: ``coroutine``
+
+        :return: Result of the coroutine.
+        """
+        if threading.current_thread() is self._thread:
+            raise RuntimeError(
+                'Cannot block the event loop thread, await the coroutine.')
+        return asyncio.run_coroutine_threadsafe(coro, self.loop).result()
+
+    @classmethod
+    def acquire(cls, owner):
+        """
+        Event loop shared by the given owner, started on first use.
+
+        :param owner: Object the loop is shared by, e.g a MultiTest
+          environment.
+        :type owner: ``object``
+
+        :return: Running event loop thread.
+        :rtype: :py:class:`EventLoopThread`
+        """
+        with cls._lock:
+            event_loop = cls._shared.get(id(owner))
+            if event_loop is None:
+                event_loop = cls._shared[id(owner)] = cls()
+                event_loop.start()
+            event_loop._users += 1
+            return event_loop
+
+    @classmethod
+    def release(cls, owner):
+        """
+        Release the event loop of the given owner, stopping it when it has no
+        more users.
+
+        :param owner: Object the loop is shared by.
+        :type owner: ``object``
+        """
+        with cls._lock:
+            event_loop = cls._shared[id(owner)]
+            event_loop._users -= 1
+            if event_loop._users:
+                return
+            del cls._shared[id(owner)]
+        event_loop.stop()
+
+
+class Blocking(object):
+    """
+    Proxy that runs the coroutine methods of an object on an event loop
+    thread, blocking until they complete. Other attributes are returned
+    as is.
+
+    :param obj: Object with coroutine methods.
+    :type obj: ``object``
+    :param event_loop: Event loop thread to run coroutines on.
+    :type event_loop: :py:class:`EventLoopThread`
+    """
+
+    def __init__(self, obj, event_loop):
+        self.obj = obj
+        self.event_loop = event_loop
+
+    def __getattr__(self, name):
+        attr = getattr(self.obj, name)
+        if not asyncio.iscoroutinefunction(attr):
+            return attr
+
+        def run(*args, **kwargs):
+            return self.event_loop.run(attr(*args, **kwargs))
+        run.__doc__ = attr.__doc__
+        return run
+
+
+@asyncio.coroutine
+def _wait_for(coro, timeout):
+    """
+    Wait for a coroutine, raising ``socket.timeout`` on timeout. A zero
+    timeout still lets the coroutine complete with data already received.
+    """
+    task = asyncio.ensure_future(coro)
+    done, _ = yield from asyncio.wait([task], timeout=timeout)
+    if not done:
+        task.cancel()
+        raise socket.timeout('timed out')
+    return task.result()
+
+
+class _Stream(object):
+    """
+    Reader and writer of a connection, with the receive state. Received data
+    is buffered here rather than read with ``StreamReader.readuntil``, which
+    is not available before Python 3.5.2, and so that data received before a
+    timeout is kept for the next read.
+    """
+
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+        self._buffer = bytearray()
+        self._frame_size = None
+
+    @asyncio.coroutine
+    def send(self, msg, timeout):
+        self.writer.write(msg)
+        yield from _wait_for(self.writer.drain(), timeout)
+        return len(msg)
+
+    def _consume(self, size, skip=0):
+        data = bytes(self._buffer[:size])
+        del self._buffer[:size + skip]
+        return data
+
+    @asyncio.coroutine
+    def _fill(self):
+        data = yield from self.reader.read(READ_SIZE)
+        if not data:
+            raise socket.error('Socket connection broken')
+        self._buffer.extend(data)
+
+    @asyncio.coroutine
+    def _read(self, size, wait_full_size):
+        if not wait_full_size:
+            if not self._buffer:
+                return (yield from self.reader.read(size))
+            return self._consume(min(size, len(self._buffer)))
+        while len(self._buffer) < size:
+            yield from self._fill()
+        return self._consume(size)
+
+    @asyncio.coroutine
+    def _read_until(self, delimiter, max_size):
+        max_size = STREAM_LIMIT if max_size is None else max_size
+        searched = 0
+        while True:
+            pos = self._buffer.find(delimiter, searched)
+            if pos != -1:
+                if pos > max_size:
+                    raise ValueError(
+                        'Message of {} bytes exceeds {} bytes.'.format(
+                            pos, max_size))
+                return self._consume(pos, skip=len(delimiter))
+            if len(self._buffer) > max_size:
+                raise ValueError('No delimiter found in {} bytes.'.format(
+                    len(self._buffer)))
+            searched = max(0, len(self._buffer) - len(delimiter) + 1)
+            yield from self._fill()
+
+    @asyncio.coroutine
+    def _read_frame(self, header):
+        # The size is kept if the body is not received before a timeout.
+        if self._frame_size is None:
+            data = yield from self._read(header.size, True)
+            self._frame_size, = header.unpack(data)
+        data = yield from self._read(self._frame_size, True)
+        self._frame_size = None
+        return data
+
+    @asyncio.coroutine
+    def receive(self, size, timeout, wait_full_size):
+        return (yield from _wait_for(
+            self._read(size, wait_full_size), timeout))
+
+    @asyncio.coroutine
+    def receive_until(self, delimiter, timeout, max_size):
+        return (yield from _wait_for(
+            self._read_until(delimiter, max_size), timeout))
+
+    @asyncio.coroutine
+    def receive_frame(self, timeout, header):
+        return (yield from _wait_for(self._read_frame(header), timeout))
+
+    def close(self):
+        self.writer.close()
+
+
+class AsyncServer(object):
+    """
+    TCP server with the interface of
+    :py:class:`~testplan.common.utils.sockets.server.Server`, whose methods
+    are coroutines to be run on an event loop.
+
+    :param host: The host address the server is bound to.
+    :type host: ``str``
+    :param port: The port the server is bound to.
+    :type port: ``int``
+    """
+
+    def __init__(self, host='localhost', port=0):
+        self._input_host = host
+        self._input_port = port
+        self._ip = None
+        self._port = None
+        self._server = None
+        self._streams = []
+        self._connected = None
+        self.accepted_connections = 0
+
+    @property
+    def host(self):
+        """Input host provided."""
+        return self._input_host
+
+    @property
+    def ip(self):
+        """IP retrieved from socket."""
+        return self._ip
+
+    @property
+    def port(self):
+        """Port retrieved after binding."""
+        return self._port
+
+    @property
+    def socket(self):
+        """Returns the listening ``socket`` object."""
+        return self._server.sockets[0] if self._server else None
+
+    @property
+    def active_connections(self):
+        """Number of connections received."""
+        return len(self._streams)
+
+    @asyncio.coroutine
+    def start(self):
+        """Bind and start serving connections."""
+        self._connected = asyncio.Event()
+        self._server = yield from asyncio.start_server(
+            self._on_connection, self._input_host, self._input_port)
+        self._ip, self._port = self.socket.getsockname()[:2]
+
+    def _on_connection(self, reader, writer):
+        self._streams.append(_Stream(reader, writer))
+        self._connected.set()
+
+    @asyncio.coroutine
+    def _wait_connection(self):
+        while self.accepted_connections >= len(self._streams):
+            self._connected.clear()
+            yield from self._connected.wait()
+
+    @asyncio.coroutine
+    def accept_connection(self, timeout=10):
+        """
+        Accepts a connection in the order in which they were received.
+        Return the index of the connection, or -1 if no connection is
+        received in the given timeout.
+
+        :param timeout: Timeout to wait for receiving connection.
+        :type timeout: ``int``
+
+        :return: Index of connection
+        :rtype: ``int``
+        """
+        try:
+            yield from _wait_for(self._wait_connection(), timeout)
+        except socket.timeout:
+            return -1
+        self.accepted_connections += 1
+        return self.accepted_connections - 1
+
+    def _stream(self, conn_idx):
+        if self.accepted_connections == 0:
+            raise Exception('No connection accepted')
+        if conn_idx is None:
+            conn_idx = self.accepted_connections - 1
+        if not 0 <= conn_idx < self.accepted_connections:
+            raise Exception('Connection {} not active'.format(conn_idx))
+        return self._streams[conn_idx]
+
+    @asyncio.coroutine
+    def send(self, msg, conn_idx=None, timeout=30):
+        """
+        Send the given message through the given connection.
+
+        :param msg: message to be sent
+        :type msg: ``bytes``
+        :param conn_idx: Index of connection to send to
+        :type conn_idx: ``int``
+        :param timeout: Timeout in seconds for sending all bytes
+        :type timeout: ``int``
+
+        :return: Number of bytes sent
+        :rtype: ``int``
+        """
+        return (yield from self._stream(conn_idx).send(msg, timeout))
+
+    @asyncio.coroutine
+    def send_frame(self, msg, conn_idx=None, timeout=30,
+                   header=LENGTH_PREFIX):
+        """Send the given message prefixed by its length."""
+        return (yield from self.send(frame(msg, header), conn_idx, timeout))
+
+    @asyncio.coroutine
+    def receive(self, size=1024, conn_idx=None, timeout=30,
+                wait_full_size=True):
+        """
+        Receive a message of given size (number of bytes) from the given
+        connection.
+
+        :param size: Number of bytes to receive
+        :type size: ``int``
+        :param conn_idx: Index of connection to receive from
+        :type conn_idx: ``int``
+        :param timeout: timeout in seconds
+        :type timeout: ``int``
+        :param wait_full_size: Wait until full size is received.
+        :type wait_full_size: ``bool``
+
+        :return: message received
+        :rtype: ``bytes``
+        """
+        return (yield from self._stream(conn_idx).receive(
+            size, timeout, wait_full_size))
+
+    @asyncio.coroutine
+    def receive_until(self, delimiter, conn_idx=None, timeout=30,
+                      max_size=None):
+        """
+        Receive a message terminated by the given delimiter from the given
+        connection, the delimiter is not returned.
+        """
+        return (yield from self._stream(conn_idx).receive_until(
+            delimiter, timeout, max_size))
+
+    @asyncio.coroutine
+    def receive_frame(self, conn_idx=None, timeout=30, header=LENGTH_PREFIX):
+        """Receive a message prefixed by its length."""
+        return (yield from self._stream(conn_idx).receive_frame(
+            timeout, header))
+
+    @asyncio.coroutine
+    def close(self):
+        """Close the connections and stop serving."""
+        for stream in self._streams:
+            stream.close()
+        self._streams = []
+        if self._server is not None:
+            self._server.close()
+            yield from self._server.wait_closed()
+            self._server = None
+
+
+class AsyncClient(object):
+    """
+    TCP client with the interface of
+    :py:class:`~testplan.common.utils.sockets.client.Client`, whose methods
+    are coroutines to be run on an event loop.
+
+    :param host: hostname or IP address to connect to
+    :type host: ``str``
+    :param port: port to connect to
+    :type port: ``str`` or ``int``
+    :param interface: Local interface to bind to.
+    :type interface: (``str``, ``str`` or ``int``) tuple
+    """
+
+    def __init__(self, host, port, interface=None):
+        self._input_host = host
+        self._input_port = port
+        self._interface = interface
+        self._stream = None
+
+    @property
+    def address(self):
+        """Returns the host and port information of socket."""
+        return self._stream.writer.get_extra_info('sockname')[:2]
+
+    @asyncio.coroutine
+    def connect(self):
+        """Connect client to socket."""
+        reader, writer = yield from asyncio.open_connection(
+            self._input_host, self._input_port,
+            local_addr=self._interface)
+        self._stream = _Stream(reader, writer)
+
+    @asyncio.coroutine
+    def send(self, msg, timeout=30):
+        """
+        Send the given message.
+
+        :return: Timestamp when msg sent (in microseconds from epoch) and
+                 number of bytes sent
+        :rtype: ``tuple`` of ``long`` and ``int``
+        """
+        tsp = time.time() * 1000000
+        size = yield from self._stream.send(msg, timeout)
+        return tsp, size
+
+    @asyncio.coroutine
+    def send_frame(self, msg, header=LENGTH_PREFIX, timeout=30):
+        """Send the given message prefixed by its length."""
+        return (yield from self.send(frame(msg, header), timeout))
+
+    @asyncio.coroutine
+    def receive(self, size, timeout=30, wait_full_size=False):
+        """Receive a message of up to, or exactly, ``size`` bytes."""
+        return (yield from self._stream.receive(
+            size, timeout, wait_full_size))
+
+    @asyncio.coroutine
+    def receive_until(self, delimiter, timeout=30, max_size=None):
+        """
+        Receive a message terminated by the given delimiter, the delimiter is
+        not returned.
+        """
+        return (yield from self._stream.receive_until(
+            delimiter, timeout, max_size))
+
+    @asyncio.coroutine
+    def receive_frame(self, timeout=30, header=LENGTH_PREFIX):
+        """Receive a message prefixed by its length."""
+        return (yield from self._stream.receive_frame(timeout, header))
+
+    @asyncio.coroutine
+    def close(self):
+        """Close the connection."""
+        if self._stream is not None:
+            self._stream.close()
+            self._stream = None
@@ -0,0 +1,174 @@
+"""Buffered receive and message framing for stream sockets."""
+
+import errno
+import socket
+import struct
+
+
+LENGTH_PREFIX = struct.Struct('!I')
+
+_WOULD_BLOCK = (errno.EAGAIN, errno.EWOULDBLOCK)
+
+
+def frame(msg, header=LENGTH_PREFIX):
+    """
+    Prefix a message with its length.
+
+    :param msg: Message to be framed.
+    :type msg: ``bytes``
+    :param header: Length header format.
+    :type header: ``struct.Struct``
+
+    :return: Length header and message.
+    :rtype: ``bytes``
+    """
+    return header.pack(len(msg)) + msg
+
+
+class ReceiveBuffer(object):
+    """
+    Receive buffer of a stream socket.
+
+    Data is received with ``recv_into`` directly into a preallocated
+    ``bytearray``, which grows to fit the largest message requested, and is
+    copied only once when a message is returned. Data received beyond a
+    message is kept for the next read.
+
+    :param sock: Connected socket.
+    :type sock: ``socket.socket``
+    :param size: Initial buffer size in bytes.
+    :type size: ``int``
+    """
+
+    def __init__(self, sock, size=65536):
+        self.sock = sock
+        self._data = bytearray(size)
+        self._start = 0
+        self._end = 0
+
+    @property
+    def pending(self):
+        """Number of buffered bytes that have not been read."""
+        return self._end - self._start
+
+    def _settimeout(self, timeout):
+        if self.sock.gettimeout() != timeout:
+            self.sock.settimeout(timeout)
+
+    def _reserve(self, size):
+        """Make room in the buffer for ``size`` bytes of pending data."""
+        if len(self._data) - self._start >= size:
+            return
+        pending = self.pending
+        if len(self._data) >= size:
+            self._data[:pending] = self._data[self._start:self._end]
+        else:
+            data = bytearray(max(size, 2 * len(self._data)))
+            data[:pending] = memoryview(self._data)[self._start:self._end]
+            self._data = data
+        self._start, self._end = 0, pending
+
+    def _fill(self, timeout):
+        """
+        Receive available data into the buffer.
+
+        :return: Number of bytes received, ``0`` if the peer closed the
+          connection.
+        :rtype: ``int``
+        """
+        if self._end == len(self._data):
+            self._reserve(self.pending + 1)
+        try:
+            received = self.sock.recv_into(
+                memoryview(self._data)[self._end:])
+        except socket.error as exc:
+            if timeout == 0 and exc.args and exc.args[0] in _WOULD_BLOCK:
+                raise socket.timeout()
+            raise
+        self._end += received
+        return received
+
+    def _wait(self, size, timeout):
+        """Receive data until ``size`` bytes are buffered."""
+        self._reserve(size)
+        while self.pending < size:
+            if not self._fill(timeout):
+                raise socket.error('Socket connection broken')
+
+    def _consume(self, size, skip=0):
+        data = memoryview(self._data)[self._start:self._start + size].tobytes()
+        self._start += size + skip
+        if self._start == self._end:
+            self._start = self._end = 0
+        return data
+
+    def read(self, size, timeout=None, wait_full_size=True):
+        """
+        Read a message of the given size. If the timeout expires, data
+        received so far remains buffered.
+
+        :param size: Number of bytes to read.
+        :type size: ``int``
+        :param timeout: Timeout in seconds of each socket receive.
+        :type timeout: ``float``
+        :param wait_full_size: Wait until full size is received, otherwise
+          return the data buffered or available, up to ``size`` bytes.
+        :type wait_full_size: ``bool``
+
+        :return: Message read, empty if the peer closed the connection and
+          ``wait_full_size`` is False.
+        :rtype: ``bytes``
+        """
+        self._settimeout(timeout)
+        if wait_full_size:
+            self._wait(size, timeout)
+        elif not self.pending:
+            self._fill(timeout)
+        return self._consume(min(size, self.pending))
+
+    def read_until(self, delimiter, timeout=None, max_size=None):
+        """
+        Read a message terminated by the given delimiter.
+
+        :param delimiter: Message delimiter.
+        :type delimiter: ``bytes``
+        :param timeout: Timeout in seconds of each socket receive.
+        :type timeout: ``float``
+        :param max_size: Maximum message size in bytes.
+        :type max_size: ``int``
+
+        :return: Message read, without the delimiter.
+        :rtype: ``bytes``
+        """
+        self._settimeout(timeout)
+        searched = 0
+        while True:
+            pos = self._data.find(
+                delimiter, self._start + searched, self._end)
+            if pos != -1:
+                return self._consume(pos - self._start, skip=len(delimiter))
+            if max_size is not None and self.pending > max_size:
+                raise ValueError('No delimiter found in {} bytes.'.format(
+                    self.pending))
+            searched = max(0, self.pending - len(delimiter) + 1)
+            if not self._fill(timeout):
+                raise socket.error('Socket connection broken')
+
+    def read_frame(self, timeout=None, header=LENGTH_PREFIX):
+        """
+        Read a message prefixed by its length, as built by :py:func:`frame`.
+
+        :param timeout: Timeout in seconds of each socket receive.
+        :type timeout: ``float``
+        :param header: Length header format.
+        :type header: ``struct.Struct``
+
+        :return: Message read, without the length header.
+        :rtype: ``bytes``
+        """
+        self._settimeout(timeout)
+        self._wait(header.size, timeout)
+        size, = header.unpack_from(self._data, self._start)
+        self._wait(header.size + size, timeout)
+        self._start += header.size
+        return self._consume(size)
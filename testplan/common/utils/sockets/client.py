@@ -3,6 +3,8 @@
 import time
 import socket
 
+from .buffer import ReceiveBuffer, LENGTH_PREFIX, frame
+
 
 class Client(object):
     """
@@ -33,7 +35,7 @@ class Client(object):
         self._input_port = port
         self._interface = interface
         self._client = None
-        self._timeout = None
+        self._buffer = None
 
     @property
     def address(self):
@@ -50,6 +52,7 @@ class Client(object):
         if self._interface is not None:
             self._client.bind(self._interface)
         self._client.connect((self._input_host, self._input_port))
+        self._buffer = ReceiveBuffer(self._client)
 
     def send(self, msg):
         """
@@ -66,7 +69,25 @@ class Client(object):
         size = self._client.send(msg)
         return tsp, size
 
-    def receive(self, size, timeout=30):
+    def send_frame(self, msg, header=LENGTH_PREFIX):
+        """
+        Send the given message prefixed by its length.
+
+        :param msg: Message to be sent.
+        :type msg: ``bytes``
+        :param header: Length header format.
+        :type header: ``struct.Struct``
+
+        :return: Timestamp when msg sent (in microseconds from epoch) and
+                 number of bytes sent, including the header
+        :rtype: ``tuple`` of ``long`` and ``int``
+        """
+        data = frame(msg, header)
+        tsp = time.time() * 1000000
+        self._client.sendall(data)
+        return tsp, len(data)
+
+    def receive(self, size, timeout=30, wait_full_size=False):
         """
         Receive a message.
 
@@ -74,20 +95,46 @@ class Client(object):
         :type size: ``int``
         :param timeout: Timeout in seconds.
         :type timeout: ``int``
+        :param wait_full_size: Wait until full size is received, otherwise
+          return up to ``size`` bytes.
+        :type wait_full_size: ``bool``
 
         :return: message received
         :rtype: ``bytes``
         """
-        if timeout != self._timeout:
-            self._timeout = timeout
-        self._client.settimeout(timeout)
-        try:
-            msg = self._client.recv(size)
-        except Exception:
-            if timeout == 0:
-                raise socket.timeout
-            raise
-        return msg
+        return self._buffer.read(
+            size, timeout=timeout, wait_full_size=wait_full_size)
+
+    def receive_until(self, delimiter, timeout=30, max_size=None):
+        """
+        Receive a message terminated by the given delimiter.
+
+        :param delimiter: Message delimiter.
+        :type delimiter: ``bytes``
+        :param timeout: Timeout in seconds.
+        :type timeout: ``int``
+        :param max_size: Maximum message size in bytes.
+        :type max_size: ``int``
+
+        :return: message received, without the delimiter
+        :rtype: ``bytes``
+        """
+        return self._buffer.read_until(
+            delimiter, timeout=timeout, max_size=max_size)
+
+    def receive_frame(self, timeout=30, header=LENGTH_PREFIX):
+        """
+        Receive a message prefixed by its length.
+
+        :param timeout: Timeout in seconds.
+        :type timeout: ``int``
+        :param header: Length header format.
+        :type header: ``struct.Struct``
+
+        :return: message received, without the length header
+        :rtype: ``bytes``
+        """
+        return self._buffer.read_frame(timeout=timeout, header=header)
 
     def recv(self, bufsize, flags=0):
         """
@@ -101,6 +148,9 @@ class Client(object):
         :return: message received
         :rtype: ``bytes``
         """
+        if self._buffer is not None and self._buffer.pending and not flags:
+            return self._buffer.read(bufsize, wait_full_size=False,
+                                     timeout=self._client.gettimeout())
         return self._client.recv(bufsize, flags)
 
     def close(self):
@@ -1,12 +1,17 @@
 """Fix TCP client module."""
 
 import time
+import errno
 import socket
+from collections import deque
 
-from testplan.common.utils.sockets.fix.utils import utc_timestamp
+from testplan.common.utils.sockets.fix.utils import (FixFramer,
+                                                     utc_timestamp)
 
 from .parser import tagsoverride
 
+RECV_SIZE = 65536
+
 
 class Client(object):
     """
@@ -69,6 +74,8 @@ class Client(object):
         self.codec = codec
         self.connection_name = "{}:{}:{}_{}{}".format(
             self.sender, self.target, self.sendersub, self.host, self.port)
+        self._framer = FixFramer()
+        self._received = deque()
 
     @property
     def address(self):
@@ -96,14 +103,15 @@ class Client(object):
         self.log_callback('Sending logon msg {}.'.format(req))
         return self.send(req)
 
-    def _populate_tags(self, msg):
+    def _populate_tags(self, msg, timestamp=None):
         msg[8] = self.version
         msg[49] = self.sender
         msg[56] = self.target
         if 50 not in msg and self.sendersub:
             msg[50] = self.sendersub
 
-        msg[52] = getattr(self.codec, 'utc_timestamp', utc_timestamp)()
+        msg[52] = timestamp or getattr(
+            self.codec, 'utc_timestamp', utc_timestamp)()
 
         msg[34] = self.out_seqno
         self.out_seqno += 1
@@ -117,6 +125,21 @@ class Client(object):
         """
         return self.rawsend_tsp(self._populate_tags(msg))
 
+    def send_many(self, msgs):
+        """
+        Send messages with a single write, stamping the session tags with
+        consecutive sequence numbers and the same sending time.
+        """
+        timestamp = getattr(self.codec, 'utc_timestamp', utc_timestamp)()
+        data = b''.join(
+            self._populate_tags(msg, timestamp=timestamp).to_wire(self.codec)
+            for msg in msgs)
+        self.log_callback('Sending {} msgs.'.format(len(msgs)))
+
+        tsp = time.time() * 1000000
+        self.socket.sendall(data)
+        return tsp, msgs
+
     def rawsend(self, msg):
         """
         Raw send (without stamping any session tags).
@@ -135,13 +158,53 @@ class Client(object):
         self.socket.send(msgstr)
         return tsp, msg
 
+    def _recv_messages(self, count, timeout):
+        """
+        Read from the socket until ``count`` framed messages are buffered,
+        raising ``socket.timeout`` if the timeout expires first. A zero
+        timeout only reads the data already available.
+        """
+        timeout = float(timeout)
+        end_time = time.time() + timeout
+        while len(self._received) < count:
+            self.socket.settimeout(timeout)
+            try:
+                data = self.socket.recv(RECV_SIZE)
+            except socket.error as err:
+                if err.errno not in (errno.EAGAIN, errno.EWOULDBLOCK):
+                    raise
+                raise socket.timeout('timed out')
+            if not data:
+                raise socket.error('Connection closed by server.')
+            self._received.extend(self._framer.feed(data))
+            timeout = end_time - time.time()
+            if timeout <= 0 and len(self._received) < count:
+                raise socket.timeout('timed out')
+
     def receive(self, timeout=30):
         """
         Receive a FIX message.
+
+        Messages are framed by their BodyLength(9) and CheckSum(10) tags, a
+        read that contains several messages keeps the rest of them for the
+        next calls.
+        """
+        self._recv_messages(1, timeout)
+        return self.msgclass.from_buffer(
+            self._received.popleft(), self.codec)
+
+    def receive_many(self, count, timeout=30):
+        """
+        Receive up to ``count`` FIX messages, waiting until that many
+        messages are received or the timeout expires.
         """
-        self.socket.settimeout(float(timeout))
-        data = self.socket.recv(4096)
-        return self.msgclass.from_buffer(data, self.codec)
+        try:
+            self._recv_messages(count, timeout)
+        except socket.timeout:
+            pass
+        received = self._received
+        return [self.msgclass.from_buffer(received.popleft(), self.codec)
+                for _ in range(min(count, len(received)))]
 
     def sendlogoff(self, custom_tags=None):
         """
@@ -4,12 +4,85 @@ import errno
 import socket
 import select
 import threading
+import time
+from collections import deque
 from six.moves import queue as Queue
 
 from testplan.common.utils.timing import (TimeoutException,
                                           TimeoutExceptionInfo,
                                           wait)
-from testplan.common.utils.sockets.fix.utils import utc_timestamp
+from testplan.common.utils.sockets.fix.utils import (FixFramer,
+                                                     utc_timestamp)
+
+RECV_SIZE = 65536
+
+
+class MessageQueue(object):
+    """
+    Queue of messages received from a connection, which can be drained in
+    batches with a single lock acquisition.
+    """
+
+    def __init__(self):
+        self._messages = deque()
+        self._cond = threading.Condition()
+
+    def put(self, msg, block=True, timeout=None):
+        """
+        Add a message to the queue. The queue is unbounded, so ``block`` and
+        ``timeout`` are only accepted for ``Queue.put`` compatibility.
+
+        :param msg: Message received.
+        :type msg: ``FixMessage``
+        """
+        with self._cond:
+            self._messages.append(msg)
+            self._cond.notify()
+
+    def _wait(self, count, timeout):
+        """Wait until the queue has ``count`` messages or timeout expires."""
+        end_time = time.time() + timeout
+        while len(self._messages) < count:
+            remaining = end_time - time.time()
+            if remaining <= 0:
+                break
+            self._cond.wait(remaining)
+
+    def get(self, block=True, timeout=None):
+        """
+        Remove and return a message, same as ``Queue.get``.
+
+        :raises Queue.Empty: If no message is received in time.
+        """
+        with self._cond:
+            if block:
+                if timeout is None:
+                    while not self._messages:
+                        self._cond.wait()
+                else:
+                    self._wait(1, timeout)
+            if not self._messages:
+                raise Queue.Empty
+            return self._messages.popleft()
+
+    def get_many(self, count, timeout=0):
+        """
+        Remove and return up to ``count`` messages, waiting until that many
+        messages are available or the timeout expires.
+
+        :param count: Number of messages.
+        :type count: ``int``
+        :param timeout: Timeout in seconds.
+        :type timeout: ``float``
+
+        :return: Messages, fewer than ``count`` if timed out.
+        :rtype: ``list`` of ``FixMessage``
+        """
+        with self._cond:
+            self._wait(count, timeout)
+            messages = self._messages
+            return [messages.popleft()
+                    for _ in range(min(count, len(messages)))]
 
 
 class ConnectionDetails(object):
@@ -39,6 +112,7 @@ class ConnectionDetails(object):
         self.queue = queue
         self.in_seqno = in_seqno
         self.out_seqno = out_seqno
+        self.framer = FixFramer()
 
 
 def _has_logon_tag(msg):
@@ -278,16 +352,30 @@ class Server(object):
         :param event: Event received from connection.
         :type event: ``.int``
         """
-        connection = self._conndetails_by_fd[fdesc].connection
+        conndetails = self._conndetails_by_fd[fdesc]
+        connection = conndetails.connection
         if event == select.POLLIN:
             with self._lock:
-                data = connection.recv(4096)
+                data = connection.recv(RECV_SIZE)
                 if not data:
                     self.log_callback(
                         'Closing connection {} since no data available'.format(
-                        self._conndetails_by_fd[fdesc].name))
+                        conndetails.name))
                     self._remove_connection(fdesc)
-                else:
+                    return
+                try:
+                    messages = conndetails.framer.feed(data)
+                except ValueError as exc:
+                    self.log_callback(
+                        'Closing connection {} on invalid data: {}'.format(
+                            conndetails.name, exc))
+                    self._remove_connection(fdesc)
+                    return
+                # A read may contain several messages, process all of them
+                # unless the connection is closed by one (i.e logout).
+                for data in messages:
+                    if fdesc not in self._conndetails_by_fd:
+                        break
                     msg = self.msgclass.from_buffer(data, self.codec)
                     self._process_message(fdesc, msg)
         elif event in [select.POLLNVAL, select.POLLHUP]:
@@ -351,7 +439,7 @@ class Server(object):
         """
         conndetails = self._conndetails_by_fd[fdesc]
         conndetails.name = conn_name
-        conndetails.queue = Queue.Queue()
+        conndetails.queue = MessageQueue()
         conndetails.in_seqno = 1
         conndetails.out_seqno = 1
         self._conndetails_by_name[conn_name] = conndetails
@@ -422,7 +510,7 @@ class Server(object):
 
         return sender, target
 
-    def _add_msg_tags(self, msg, conn_name, fdesc=None):
+    def _add_msg_tags(self, msg, conn_name, fdesc=None, timestamp=None):
         """
         Add session tags and senderCompID and targetCompID tags to the given
         FIX message.
@@ -433,6 +521,8 @@ class Server(object):
         :type sender: ``str``
         :param target: Target id.
         :type target: ``str``
+        :param timestamp: SendingTime(52) value, defaults to current time.
+        :type timestamp: ``str``
 
         :return: The FIX msg with the tags set.
         :rtype: ``FixMessage``
@@ -447,7 +537,8 @@ class Server(object):
         conndetails.out_seqno += 1
         msg[49] = sender
         msg[56] = target
-        msg[52] = getattr(self.codec, 'utc_timestamp', utc_timestamp)()
+        msg[52] = timestamp or getattr(
+            self.codec, 'utc_timestamp', utc_timestamp)()
         return msg
 
     def _no_lock_send(self, msg, conn_name, fdesc=None):
@@ -506,6 +597,35 @@ class Server(object):
                 msg.to_wire(self.codec))
         return msg
 
+    def send_many(self, msgs, conn_name=(None, None)):
+        """
+        Send the given Fix messages through the given connection with a
+        single write.
+
+        The messages are stamped as in :py:meth:`send`, with consecutive
+        sequence numbers and the same sending time.
+
+        :param msgs: Messages to be sent.
+        :type msgs: ``list`` of ``FixMessage``
+        :param conn_name: Connection name to send messages to. This is the
+          tuple (sender id, target id)
+        :type conn_name: ``tuple`` of ``str`` and ``str``
+
+        :return: Fix messages sent
+        :rtype: ``list`` of ``FixMessage``
+        """
+        conn_name = self._encode_conn_name(conn_name)
+        with self._lock:
+            conn_name = self._validate_connection_name(conn_name)
+            timestamp = getattr(self.codec, 'utc_timestamp', utc_timestamp)()
+            data = b''.join(
+                self._add_msg_tags(msg, conn_name, timestamp=timestamp)
+                .to_wire(self.codec) for msg in msgs)
+            self.log_callback('Sending on connection {} {} messages'.format(
+                conn_name, len(msgs)))
+            self._conndetails_by_name[conn_name].connection.sendall(data)
+        return msgs
+
     def receive(self, conn_name=(None, None), timeout=30):
         """
         Receive a FIX message from the given connection.
@@ -527,6 +647,26 @@ class Server(object):
             self._encode_conn_name(conn_name))
         return self._conndetails_by_name[conn_name].queue.get(True, timeout)
 
+    def receive_many(self, count, conn_name=(None, None), timeout=30):
+        """
+        Receive up to ``count`` FIX messages from the given connection,
+        waiting until that many messages are received or the timeout expires.
+
+        :param count: Number of messages to receive.
+        :type count: ``int``
+        :param conn_name: Connection name to receive messages from
+        :type conn_name: ``tuple`` of ``str`` and ``str``
+        :param timeout: timeout in seconds
+        :type timeout: ``int``
+
+        :return: Fix messages received, fewer than ``count`` if timed out
+        :rtype: ``list`` of ``FixMessage``
+        """
+        conn_name = self._validate_connection_name(
+            self._encode_conn_name(conn_name))
+        return self._conndetails_by_name[conn_name].queue.get_many(
+            count, timeout)
+
     def _encode_conn_name(self, conn_name):
         return (conn_name[0].encode('utf-8') if conn_name[0] else conn_name[0],
                 conn_name[1].encode('utf-8') if conn_name[1] else conn_name[1])
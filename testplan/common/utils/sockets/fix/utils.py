@@ -4,6 +4,8 @@ import datetime
 
 DATEFORMAT = '%Y%m%d-%H:%M:%S.%f'
 
+SOH = b'\x01'
+
 
 def utc_timestamp():
     """
@@ -11,3 +13,79 @@ def utc_timestamp():
     @rtype: C{str}
     """
     return datetime.datetime.utcnow().strftime(DATEFORMAT)
+
+
+class FixFramer(object):
+    """
+    Stream buffer that splits the bytes received on a connection into FIX
+    messages, using the BodyLength(9) and CheckSum(10) tags. A read may
+    contain several messages, and the end of the last one may arrive with
+    the next read.
+    """
+
+    def __init__(self, separator=SOH):
+        """
+        Create a new FIX stream buffer.
+
+        :param separator: Tag separator on the wire.
+        :type separator: ``bytes``
+        """
+        self.separator = separator
+        self._buffer = b''
+
+    @property
+    def pending(self):
+        """Number of buffered bytes of an incomplete message."""
+        return len(self._buffer)
+
+    def _frame_end(self, data, start):
+        """
+        End offset of the message starting at the given offset, or None if
+        the message is incomplete.
+        """
+        if len(data) - start < 2:
+            return None
+        if not data.startswith(b'8=', start):
+            raise ValueError('Expected BeginString(8), got: {!r}'.format(
+                data[start:start + 20]))
+
+        length_start = data.find(self.separator, start) + 1
+        if length_start == 0:
+            return None
+        length_end = data.find(self.separator, length_start)
+        if length_end == -1:
+            return None
+        if not data.startswith(b'9=', length_start):
+            raise ValueError('Expected BodyLength(9), got: {!r}'.format(
+                data[length_start:length_end]))
+
+        checksum_start = length_end + 1 + int(data[length_start + 2:length_end])
+        checksum_end = data.find(self.separator, checksum_start)
+        if checksum_end == -1:
+            return None
+        if not data.startswith(b'10=', checksum_start):
+            raise ValueError('Expected CheckSum(10), got: {!r}'.format(
+                data[checksum_start:checksum_end]))
+        return checksum_end + 1
+
+    def feed(self, data):
+        """
+        Add received bytes to the buffer.
+
+        :param data: Bytes received.
+        :type data: ``bytes``
+
+        :return: Complete messages, in the order they were received.
+        :rtype: ``list`` of ``bytes``
+        """
+        data = self._buffer + data if self._buffer else data
+        messages = []
+        start = 0
+        while True:
+            end = self._frame_end(data, start)
+            if end is None:
+                break
+            messages.append(data[start:end])
+            start = end
+        self._buffer = data[start:]
+        return messages
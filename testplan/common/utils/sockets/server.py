@@ -7,6 +7,8 @@ import threading
 
 from testplan.common.utils.timing import wait
 
+from .buffer import ReceiveBuffer, LENGTH_PREFIX, frame
+
 
 class Server(object):
     """
@@ -33,8 +35,11 @@ class Server(object):
         self._server_thread = None
 
         self._lock = threading.Lock()
+        self._connected = threading.Condition()
+        self._wakeup = None
 
         self._connection_by_fd = {}
+        self._buffer_by_fd = {}
         self._fds = {}
 
         self.active_connections = 0
@@ -71,7 +76,18 @@ class Server(object):
         self._ip, self._port = self._server.getsockname()
 
     def serve(self, loop_sleep=0.005, listening_timeout=5):
-        """Start serving connections."""
+        """
+        Start serving connections.
+
+        :param loop_sleep: Interval in seconds to check if the server is
+          closed, on platforms without ``socket.socketpair`` to wake up the
+          listening thread.
+        :type loop_sleep: ``float``
+        :param listening_timeout: Timeout to wait for the server to listen.
+        :type listening_timeout: ``int``
+        """
+        if hasattr(socket, 'socketpair'):
+            self._wakeup = socket.socketpair()
         self._server_thread = threading.Thread(
             target=self._serving, kwargs=dict(loop_sleep=loop_sleep))
         self._server_thread.daemon = True
@@ -84,29 +100,31 @@ class Server(object):
         self._server.listen(self._listen)
         self._listening = True
 
+        # Only the listening socket is watched, data of the accepted
+        # connections is received by the callers of receive.
         inputs = [self._server]
-        outputs = []
+        timeout = loop_sleep
+        if self._wakeup is not None:
+            inputs.append(self._wakeup[0])
+            timeout = None
 
         while self._listening:
-            readable, writable, exceptional = select.select(
-                inputs, outputs, inputs)
-
-            for sock in readable:
-                if sock is self._server:
-                    # New connection
-                    conn, client_addr = sock.accept()
-                    inputs.append(conn)
+            readable, _, _ = select.select(inputs, [], [], timeout)
+            if self._server in readable and self._listening:
+                # New connection
+                conn, client_addr = self._server.accept()
+                with self._connected:
                     self._connection_by_fd[conn.fileno()] = conn
+                    self._buffer_by_fd[conn.fileno()] = ReceiveBuffer(conn)
                     self._fds[self.active_connections] = conn.fileno()
                     self.active_connections += 1
-
-            for sock in exceptional:
-                inputs.remove(sock)
-                sock.close()
-
-            time.sleep(loop_sleep)
+                    self._connected.notify_all()
 
         self._remove_all_connections()
+        if self._wakeup is not None:
+            for sock in self._wakeup:
+                sock.close()
+            self._wakeup = None
         try:
             self._server.shutdown(socket.SHUT_RDWR)
         except:
@@ -123,26 +141,29 @@ class Server(object):
 
         :param timeout: Timeout to wait for receiving connection.
         :type timeout: ``int``
-        :param accept_connection_sleep: Sleep time to retry accept connection.
+        :param accept_connection_sleep: Unused, the method is notified of
+          new connections.
         :type accept_connection_sleep: ``float``
 
         :return: Index of connection
         :rtype: ``int``
         """
-        started = time.time()
-        while True:
-            if self.accepted_connections in self._fds:
-                self.accepted_connections += 1
-                return self.accepted_connections - 1
-            if time.time() > started + timeout:
-                return -1
-            time.sleep(accept_connection_sleep)
+        end_time = time.time() + timeout
+        with self._connected:
+            while self.accepted_connections not in self._fds:
+                remaining = end_time - time.time()
+                if remaining <= 0:
+                    return -1
+                self._connected.wait(remaining)
+            self.accepted_connections += 1
+            return self.accepted_connections - 1
 
     def receive(self, size=1024, conn_idx=None, timeout=30,
                 wait_full_size=True):
         """
         Receive a message of given size (number of bytes) from the given
-        connection.
+        connection. Data received beyond the message, or before a timeout,
+        is kept for the next receive.
 
         :param size: Number of bytes to receive
         :type size: ``int``
@@ -156,31 +177,52 @@ class Server(object):
         :return: message received
         :rtype: ``bytes``
         """
-        conn_idx = self._validate_connection_idx(conn_idx)
+        buffer = self._get_buffer(conn_idx)
+        if wait_full_size is False:
+            return buffer.read(size, timeout=timeout, wait_full_size=False)
+        with self._lock:
+            return buffer.read(size, timeout=timeout)
 
-        # Get file descriptor and details of connection
-        fdesc = self._fds[conn_idx]
-        connection = self._connection_by_fd[fdesc]
-        connection.settimeout(timeout)
+    def receive_until(self, delimiter, conn_idx=None, timeout=30,
+                      max_size=None):
+        """
+        Receive a message terminated by the given delimiter from the given
+        connection.
 
-        if wait_full_size is False:
-            connection.settimeout(timeout)
-            msg = connection.recv(size)
-            connection.settimeout(0)
-        else:
-            with self._lock:
-                msg = b''
-                try:
-                    while len(msg) < size:
-                        new_msg = connection.recv(size - len(msg))
-                        if not new_msg:
-                            raise Exception('Socket connection broken')
-                        msg += new_msg
-                except socket.error:
-                    if timeout == 0:
-                        raise socket.timeout()
-                    raise
-        return msg
+        :param delimiter: Message delimiter
+        :type delimiter: ``bytes``
+        :param conn_idx: Index of connection to receive from
+        :type conn_idx: ``int``
+        :param timeout: timeout in seconds
+        :type timeout: ``int``
+        :param max_size: Maximum message size in bytes
+        :type max_size: ``int``
+
+        :return: message received, without the delimiter
+        :rtype: ``bytes``
+        """
+        buffer = self._get_buffer(conn_idx)
+        with self._lock:
+            return buffer.read_until(
+                delimiter, timeout=timeout, max_size=max_size)
+
+    def receive_frame(self, conn_idx=None, timeout=30, header=LENGTH_PREFIX):
+        """
+        Receive a message prefixed by its length from the given connection.
+
+        :param conn_idx: Index of connection to receive from
+        :type conn_idx: ``int``
+        :param timeout: timeout in seconds
+        :type timeout: ``int``
+        :param header: Length header format
+        :type header: ``struct.Struct``
+
+        :return: message received, without the length header
+        :rtype: ``bytes``
+        """
+        buffer = self._get_buffer(conn_idx)
+        with self._lock:
+            return buffer.read_frame(timeout=timeout, header=header)
 
     def send(self, msg, conn_idx=None, timeout=30):
         """
@@ -204,10 +246,33 @@ class Server(object):
             connection.sendall(msg)
         return len(msg)
 
+    def send_frame(self, msg, conn_idx=None, timeout=30,
+                   header=LENGTH_PREFIX):
+        """
+        Send the given message prefixed by its length.
+
+        :param msg: message to be sent
+        :type msg: ``bytes``
+        :param conn_idx: Index of connection to send to
+        :type conn_idx: ``int``
+        :param timeout: Timeout in seconds for sending all bytes
+        :type timeout: ``int``
+        :param header: Length header format
+        :type header: ``struct.Struct``
+
+        :return: Number of bytes sent, including the header
+        :rtype: ``int``
+        """
+        return self.send(frame(msg, header), conn_idx, timeout)
+
     def close(self):
         """Closes the server and listen thread."""
         self._listening = False
-        # self._serving may be stuck in select.select
+        if self._wakeup is not None:
+            try:
+                self._wakeup[1].send(b'\0')
+            except socket.error:
+                pass
         if self._server_thread:
             self._server_thread.join(timeout=0.1)
 
@@ -239,6 +304,11 @@ class Server(object):
 
         return conn_idx
 
+    def _get_buffer(self, conn_idx):
+        """Receive buffer of the given connection."""
+        conn_idx = self._validate_connection_idx(conn_idx)
+        return self._buffer_by_fd[self._fds[conn_idx]]
+
     def _remove_all_connections(self):
         """
         Unregister, close and remove all existing connections
@@ -250,4 +320,5 @@ class Server(object):
             self._connection_by_fd[fdesc].close()
 
         self._connection_by_fd = {}
+        self._buffer_by_fd = {}
         self._fds = {}
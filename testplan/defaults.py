@@ -16,3 +16,4 @@ REPORT_DIR = os.getcwd()
 XML_DIR = os.path.join(REPORT_DIR, 'xml')
 PDF_PATH = os.path.join(REPORT_DIR, 'report.pdf')
 JSON_PATH = os.path.join(REPORT_DIR, 'report.json')
+BINARY_PATH = os.path.join(REPORT_DIR, 'report.bin')
@@ -1,4 +1,5 @@
 from .pdf import PDFExporter, TagFilteredPDFExporter
 from .xml import XMLExporter
 from .json import JSONExporter
+from .binary import BinaryExporter
 from .base import Exporter
@@ -0,0 +1,54 @@
+"""
+    Binary exporter for Test reports, writes the compact binary report format
+    of `testplan.report.testing.binary`.
+"""
+from __future__ import absolute_import
+
+from testplan import defaults
+from testplan.logger import TESTPLAN_LOGGER
+
+from testplan.common.config import ConfigOption
+from testplan.common.exporters import ExporterConfig
+
+from testplan.report.testing.binary import BinaryReportWriter
+
+
+from ..base import Exporter
+
+
+class BinaryExporterConfig(ExporterConfig):
+
+    @classmethod
+    def get_options(cls):
+        return {
+            ConfigOption(
+                'binary_path', default=defaults.BINARY_PATH,
+                block_propagation=False): str
+        }
+
+
+class BinaryExporter(Exporter):
+    """
+    Writes the report to ``binary_path`` as length prefixed records with a
+    trailing index, which
+    :py:class:`~testplan.report.testing.binary.BinaryReportReader` can read
+    lazily from a memory mapped file.
+    """
+
+    CONFIG = BinaryExporterConfig
+
+    def export(self, source):
+
+        if self.cfg.binary_path is None:
+            raise ValueError('`binary_path` cannot be None.')
+
+        if len(source):
+            with open(self.cfg.binary_path, 'wb') as binary_file:
+                BinaryReportWriter(binary_file).write(source)
+
+            TESTPLAN_LOGGER.exporter_info(
+                'Binary report generated at {}'.format(self.cfg.binary_path))
+        else:
+            TESTPLAN_LOGGER.exporter_info(
+                'Skipping binary report creation'
+                ' for empty report: {}'.format(source.name))
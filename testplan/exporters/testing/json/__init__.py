@@ -4,9 +4,10 @@
 """
 from __future__ import absolute_import
 
+import gzip
 import json
 
-from schema import Schema
+import six
 
 from testplan import defaults
 from testplan.logger import TESTPLAN_LOGGER
@@ -14,7 +15,9 @@ from testplan.logger import TESTPLAN_LOGGER
 from testplan.common.config import ConfigOption
 from testplan.common.exporters import ExporterConfig
 
-from testplan.report.testing.schemas import TestReportSchema
+from testplan.report.testing import TestGroupReport, TestCaseReport
+from testplan.report.testing.schemas import (
+    TestReportSchema, TestGroupReportSchema, TestCaseReportSchema)
 
 
 from ..base import Exporter
@@ -23,6 +26,62 @@ from ..base import Exporter
 MAX_FILENAME_LENGTH = 100
 
 
+class ReportStreamer(object):
+    """
+    Writes the JSON serialization of a test report to a binary file object
+    incrementally, one testcase report at a time, instead of building the
+    whole serialized report in memory. The output loads to the same data
+    as ``TestReportSchema().dump(report)``.
+    """
+
+    def __init__(self, fobj):
+        self.fobj = fobj
+        # Report and group attributes are dumped without their entries,
+        # which are written one by one after them.
+        self._report_schema = TestReportSchema(
+            strict=True, exclude=('entries',))
+        self._group_schema = TestGroupReportSchema(
+            strict=True, exclude=('entries',))
+        self._case_schema = TestCaseReportSchema(strict=True)
+
+    def _write(self, text):
+        if isinstance(text, six.text_type):
+            text = text.encode('utf-8')
+        self.fobj.write(text)
+
+    def _write_node(self, data, entries):
+        """Writes node data with a trailing ``entries`` list."""
+        text = json.dumps(data)
+        self._write(text[:-1])
+        self._write(', "entries": [' if data else '"entries": [')
+        for idx, entry in enumerate(entries):
+            if idx:
+                self._write(', ')
+            self._write_entry(entry)
+        self._write(']}')
+
+    def _write_entry(self, entry):
+        if isinstance(entry, TestGroupReport):
+            self._write_node(
+                self._group_schema.dump(entry).data, entry.entries)
+        elif isinstance(entry, TestCaseReport):
+            self._write(json.dumps(self._case_schema.dump(entry).data))
+        else:
+            raise KeyError(
+                'No schema declaration found for : {}'.format(
+                    entry.__class__.__name__))
+
+    def write(self, report):
+        """
+        Writes the serialized test report.
+
+        :param report: Test report.
+        :type report: :py:class:`~testplan.report.testing.base.TestReport`
+        """
+        self._write_node(self._report_schema.dump(report).data,
+                         report.entries)
+
+
 class JSONExporterConfig(ExporterConfig):
 
     @classmethod
@@ -35,6 +94,10 @@ class JSONExporterConfig(ExporterConfig):
 
 
 class JSONExporter(Exporter):
+    """
+    Streams the JSON report to ``json_path``, gzip compressed if the path
+    ends with ``.gz``.
+    """
 
     CONFIG = JSONExporterConfig
 
@@ -44,11 +107,13 @@ class JSONExporter(Exporter):
             raise ValueError('`json_path` cannot be None.')
 
         if len(source):
-            test_plan_schema = TestReportSchema(strict=True)
-            data = test_plan_schema.dump(source).data
+            if self.cfg.json_path.endswith('.gz'):
+                json_file = gzip.open(self.cfg.json_path, 'wb')
+            else:
+                json_file = open(self.cfg.json_path, 'wb')
 
-            with open(self.cfg.json_path, 'w') as json_file:
-                json.dump(data, json_file)
+            with json_file:
+                ReportStreamer(json_file).write(source)
 
             TESTPLAN_LOGGER.exporter_info(
                 'JSON generated at {}'.format(self.cfg.json_path))
@@ -147,6 +147,12 @@ class TestplanParser(object):
             help='Path for JSON report.'
         )
 
+        report_group.add_argument(
+            '--binary', dest='binary_path',
+            default=None, metavar='PATH',
+            help='Path for compact binary report.'
+        )
+
         report_group.add_argument(
             '--xml', dest='xml_dir',
             default=None, metavar='DIRECTORY',
@@ -42,9 +42,11 @@ TestReport(name='MyPlan')
 import copy
 import collections
 import inspect
+import operator
 
 from testplan.common.report import (
     ExceptionLogger as ExceptionLoggerBase, Report, ReportGroup)
+from testplan.common.serialization.schemas import cached_dump, cached_load
 from testplan.common.utils import timing
 from testplan.common.utils.exceptions import format_trace
 from testplan.testing import tagging
@@ -95,6 +97,23 @@ class TestCount(_TestCount):
     def total(self):
         return sum(getattr(self, attrname) for attrname in self._fields)
 
+    def __add__(self, other):
+        return TestCount(*map(operator.add, self, other))
+
+
+_NO_TESTS = TestCount(*[0] * len(Status.STATUS_PRECEDENCE))
+
+
+def _get_counts(report):
+    """Status counts of the testcases of a report, or of the report itself."""
+    if isinstance(report, TestCaseReport):
+        status = report.status
+        return TestCount(*[int(stat == status)
+                           for stat in Status.STATUS_PRECEDENCE])
+    elif isinstance(report, BaseReportGroup):
+        return report.counts
+    return _NO_TESTS
+
 
 class ExceptionLogger(ExceptionLoggerBase):
     """
@@ -121,16 +140,91 @@ class ExceptionLogger(ExceptionLoggerBase):
 
 
 class BaseReportGroup(ReportGroup):
-    """Base container report for tests, relies on children's statuses."""
+    """
+    Base container report for tests, relies on children's statuses.
+
+    Status and counts of the children are cached, updated as children are
+    appended and reset when a child report changes.
+    """
 
     exception_logger = ExceptionLogger
 
+    # Report group that contains this report, set when it is added to the
+    # parent's entries. It is not part of the pickled state.
+    _parent = None
+
     def __init__(self, *args, **kwargs):
         self.meta = kwargs.pop('meta', {})
+        self._status = None
+        self._counts = None
+        self._status_override = None
         super(BaseReportGroup, self).__init__(*args, **kwargs)
         self.status_override = None
         self.timer = timing.Timer()
 
+    def __getstate__(self):
+        state = super(BaseReportGroup, self).__getstate__()
+        state.pop('_parent', None)
+        return state
+
+    def __setstate__(self, data):
+        super(BaseReportGroup, self).__setstate__(data)
+        # Children of a shallow copy still belong to the original report.
+        for entry in self:
+            if getattr(entry, '_parent', None) is None:
+                entry._parent = self
+
+    @property
+    def entries(self):
+        """Child reports."""
+        return self._entries
+
+    @entries.setter
+    def entries(self, entries):
+        self._entries = entries
+        for entry in entries:
+            entry._parent = self
+        self._reset_status()
+
+    @property
+    def status_override(self):
+        """Status that takes precedence over the status of the children."""
+        return self._status_override
+
+    @status_override.setter
+    def status_override(self, status_override):
+        self._status_override = status_override
+        if self._parent is not None:
+            self._parent._reset_status()
+
+    def _reset_status(self):
+        """Resets cached status and counts of this report and its parents."""
+        report = self
+        while report is not None:
+            report._status = None
+            report._counts = None
+            report = report._parent
+
+    def _update_status(self, entry):
+        """
+        Updates cached status and counts of this report and its parents
+        with a new child report, instead of recomputing them.
+        """
+        status = entry.status if self._status is not None else None
+        counts = _get_counts(entry) if self._counts is not None else None
+
+        report = self
+        while report is not None:
+            if status is not None:
+                if report._status is not None:
+                    report._status = Status.precedent([report._status, status])
+                    status = report.status
+                else:
+                    status = report.status_override
+            if counts is not None and report._counts is not None:
+                report._counts += counts
+            report = report._parent
+
     def _get_comparison_attrs(self):
         return super(BaseReportGroup, self)._get_comparison_attrs() +\
             ['status_override', 'timer']
@@ -154,10 +248,30 @@ class BaseReportGroup(ReportGroup):
         if self.status_override:
             return self.status_override
 
-        if self.entries:
-            return Status.precedent([entry.status for entry in self])
+        if self._status is None:
+            if self.entries:
+                self._status = Status.precedent(
+                    [entry.status for entry in self])
+            else:
+                self._status = Status.PASSED
+        return self._status
 
-        return Status.PASSED
+    def append(self, item):
+        """Add ``item`` to ``self.entries``, updating status and counts."""
+        super(BaseReportGroup, self).append(item)
+        item._parent = self
+        if len(self.entries) == 1:
+            # Empty groups are passing, whatever the status of the new child.
+            self._reset_status()
+        else:
+            self._update_status(item)
+
+    def build_index(self, recursive=False):
+        """Reset status and counts, as ``self.entries`` may have changed."""
+        super(BaseReportGroup, self).build_index(recursive=recursive)
+        for entry in self:
+            entry._parent = self
+        self._reset_status()
 
     def merge_children(self, report, strict=True):
         """
@@ -195,18 +309,17 @@ class BaseReportGroup(ReportGroup):
         Return counts for each status, will recursively get aggregates from
         children and so on.
         """
-
-        def _get_counts(obj, status):
-            count = 0
-            for child in obj:
-                if isinstance(child, TestCaseReport) and child.status == status:
-                    count += 1
-                elif isinstance(child, BaseReportGroup):
-                    count += _get_counts(child, status)
-            return count
-
-        return TestCount(*[_get_counts(self, stat)
-                           for stat in Status.STATUS_PRECEDENCE])
+        if self._counts is None:
+            self._counts = sum(
+                (_get_counts(entry) for entry in self), _NO_TESTS)
+        return self._counts
+
+    def _copy(self):
+        """Copy ``meta`` and ``timer`` as well, as they may be updated."""
+        report_obj = super(BaseReportGroup, self)._copy()
+        report_obj.meta = dict(self.meta)
+        report_obj.timer = copy.copy(self.timer)
+        return report_obj
 
     def filter(self, *functions, **kwargs):
         """
@@ -287,7 +400,7 @@ class TestReport(BaseReportGroup):
         Shortcut for serializing test report data to nested python dictionaries.
         """
         from .schemas import TestReportSchema
-        return TestReportSchema(strict=True).dump(self).data
+        return cached_dump(TestReportSchema, self)
 
     @classmethod
     def deserialize(cls, data):
@@ -296,7 +409,7 @@ class TestReport(BaseReportGroup):
         from nested python dictionaries.
         """
         from .schemas import TestReportSchema
-        return TestReportSchema(strict=True).load(data).data
+        return cached_load(TestReportSchema, data)
 
 
 class TestGroupReport(BaseReportGroup):
@@ -364,7 +477,7 @@ class TestGroupReport(BaseReportGroup):
         dictionaries.
         """
         from .schemas import TestGroupReportSchema
-        return TestGroupReportSchema(strict=True).dump(self).data
+        return cached_dump(TestGroupReportSchema, self)
 
     @classmethod
     def deserialize(cls, data):
@@ -373,7 +486,7 @@ class TestGroupReport(BaseReportGroup):
         (and its children) from nested python dictionaries.
         """
         from .schemas import TestGroupReportSchema
-        return TestGroupReportSchema(strict=True).load(data).data
+        return cached_load(TestGroupReportSchema, data)
 
     def _collect_tag_indices(self):
         """
@@ -419,11 +532,16 @@ class TestCaseReport(Report):
 
     exception_logger = ExceptionLogger
 
+    # Report group that contains this report, its cached status and counts
+    # are reset when this report changes. It is not part of the pickled state.
+    _parent = None
+
     def __init__(
         self, name, description=None,
         uid=None, entries=None,
         tags=None
     ):
+        self._status_override = None
         super(TestCaseReport, self).__init__(
             name=name, uid=uid, entries=entries, description=description)
 
@@ -433,6 +551,45 @@ class TestCaseReport(Report):
         self.status_override = None
         self.timer = timing.Timer()
 
+    def __getstate__(self):
+        state = super(TestCaseReport, self).__getstate__()
+        state.pop('_parent', None)
+        return state
+
+    def _reset_parent_status(self):
+        if self._parent is not None:
+            self._parent._reset_status()
+
+    @property
+    def entries(self):
+        """Serialized assertion / log entries."""
+        return self._entries
+
+    @entries.setter
+    def entries(self, entries):
+        self._entries = entries
+        self._reset_parent_status()
+
+    @property
+    def status_override(self):
+        """Status that takes precedence over the status of the entries."""
+        return self._status_override
+
+    @status_override.setter
+    def status_override(self, status_override):
+        self._status_override = status_override
+        self._reset_parent_status()
+
+    def append(self, item):
+        """Append ``item`` to ``self.entries``, resetting parent status."""
+        super(TestCaseReport, self).append(item)
+        self._reset_parent_status()
+
+    def extend(self, items):
+        """Extend ``self.entries`` with ``items``, resetting parent status."""
+        super(TestCaseReport, self).extend(items)
+        self._reset_parent_status()
+
     def _get_comparison_attrs(self):
         return super(TestCaseReport, self)._get_comparison_attrs() +\
             ['status_override', 'timer', 'tags', 'tags_index']
@@ -458,6 +615,12 @@ class TestCaseReport(Report):
                 return Status.FAILED
         return Status.PASSED
 
+    def _copy(self):
+        """Copy ``timer`` as well, as it may be updated."""
+        report_obj = super(TestCaseReport, self)._copy()
+        report_obj.timer = copy.copy(self.timer)
+        return report_obj
+
     def merge(self, report, strict=True):
         """
           TestCaseReport merge overwrites everything in place,
@@ -0,0 +1,355 @@
+"""
+Compact binary format for test reports.
+
+A binary report file starts with a header, followed by one length prefixed
+record per report node and a trailing index of the records:
+
+  * header: ``MAGIC``, codec id (``1`` byte), compression flag (``1`` byte)
+  * records: ``uint32`` length + encoded (and optionally zlib compressed)
+    serialized data. The test report and test group reports are serialized
+    without their entries, and testcase reports are split into an attribute
+    record and a record for their serialized entries.
+  * index: record holding the uid, type, parent position and record
+    locations of each report node, in pre-order.
+  * trailer: ``uint64`` offset of the index + ``INDEX_MAGIC``
+
+Records are encoded with `msgpack <https://msgpack.org>`_ when available and
+fall back to JSON otherwise.
+"""
+import json
+import mmap
+import struct
+import warnings
+import zlib
+
+try:
+    import msgpack
+except ImportError as exc:
+    msgpack = None
+    _MSGPACK_IMPORT_ERROR = exc
+
+from testplan.common.serialization.schemas import (
+    cached_load, load_tree_data)
+
+from .base import TestReport, TestGroupReport, TestCaseReport
+from .schemas import (
+    TestReportSchema, TestGroupReportSchema, TestCaseReportSchema)
+
+
+__all__ = ['BinaryReportWriter', 'BinaryReportReader']
+
+
+MAGIC = b'TPLNREP1'
+INDEX_MAGIC = b'TPLNIDX1'
+
+CODEC_JSON = 0
+CODEC_MSGPACK = 1
+
+_HEADER = struct.Struct('<{}sBB'.format(len(MAGIC)))
+_LENGTH = struct.Struct('<I')
+_TRAILER = struct.Struct('<Q{}s'.format(len(INDEX_MAGIC)))
+
+_REPORT_TYPE = 'TestReport'
+_GROUP_TYPE = 'TestGroupReport'
+_CASE_TYPE = 'TestCaseReport'
+
+
+def _encoder(codec):
+    if codec == CODEC_MSGPACK:
+        return lambda data: msgpack.packb(data, use_bin_type=True)
+    return lambda data: json.dumps(data).encode('utf-8')
+
+
+def _decoder(codec):
+    if codec == CODEC_MSGPACK:
+        if msgpack is None:
+            raise ValueError('msgpack is required to read this report.')
+        return lambda text: msgpack.unpackb(text, raw=False)
+    return lambda text: json.loads(text.decode('utf-8'))
+
+
+class BinaryReportWriter(object):
+    """
+    Writes a test report to a binary file object in the compact binary
+    format, one record per report node.
+
+    :param fobj: Binary file object, opened for writing.
+    :type fobj: ``file``
+    :param codec: Record encoding, ``CODEC_MSGPACK`` or ``CODEC_JSON``.
+      Defaults to msgpack when it is installed.
+    :type codec: ``int``
+    :param compress: Compress records with zlib.
+    :type compress: ``bool``
+    """
+
+    def __init__(self, fobj, codec=None, compress=True):
+        if codec is None and msgpack is None:
+            warnings.warn('msgpack must be supported for compact binary'
+                          ' reports, using JSON encoding: {}'.format(
+                              _MSGPACK_IMPORT_ERROR))
+            codec = CODEC_JSON
+        elif codec is None:
+            codec = CODEC_MSGPACK
+        elif codec == CODEC_MSGPACK and msgpack is None:
+            raise ValueError('msgpack is not installed.')
+        self.fobj = fobj
+        self.codec = codec
+        self.compress = compress
+        self._encode = _encoder(codec)
+        self._offset = 0
+        self._index = []
+        self._report_schema = TestReportSchema(
+            strict=True, exclude=('entries',))
+        self._group_schema = TestGroupReportSchema(
+            strict=True, exclude=('entries',))
+        self._case_schema = TestCaseReportSchema(
+            strict=True, exclude=('entries',))
+
+    def _write(self, data):
+        self.fobj.write(data)
+        self._offset += len(data)
+
+    def _write_record(self, data):
+        """Writes a record, returns its offset and length."""
+        text = self._encode(data)
+        if self.compress:
+            text = zlib.compress(text)
+        offset = self._offset
+        self._write(_LENGTH.pack(len(text)))
+        self._write(text)
+        return offset, _LENGTH.size + len(text)
+
+    def _write_node(self, report, parent_idx):
+        idx = len(self._index)
+        entries_location = (None, None)
+        if isinstance(report, TestReport):
+            node_type = _REPORT_TYPE
+            data = self._report_schema.dump(report).data
+        elif isinstance(report, TestGroupReport):
+            node_type = _GROUP_TYPE
+            data = self._group_schema.dump(report).data
+        elif isinstance(report, TestCaseReport):
+            node_type = _CASE_TYPE
+            data = self._case_schema.dump(report).data
+        else:
+            raise KeyError(
+                'No schema declaration found for : {}'.format(
+                    report.__class__.__name__))
+
+        location = self._write_record(data)
+        if node_type == _CASE_TYPE:
+            entries_location = self._write_record(list(report.entries))
+        self._index.append(
+            [str(report.uid), node_type, parent_idx] +
+            list(location) + list(entries_location))
+
+        if node_type != _CASE_TYPE:
+            for entry in report.entries:
+                self._write_node(entry, idx)
+
+    def write(self, report):
+        """
+        Writes the test report, its records and the index.
+
+        :param report: Test report.
+        :type report: :py:class:`~testplan.report.testing.base.TestReport`
+        """
+        self._write(_HEADER.pack(MAGIC, self.codec, int(self.compress)))
+        self._write_node(report, None)
+        index_offset, _ = self._write_record(self._index)
+        self._write(_TRAILER.pack(index_offset, INDEX_MAGIC))
+
+
+class _Node(object):
+    """Location of the records of a report node."""
+
+    __slots__ = ('uid', 'type', 'parent', 'offset', 'length',
+                 'entries_offset', 'entries_length', 'children')
+
+    def __init__(self, uid, type, parent, offset, length,
+                 entries_offset, entries_length):
+        self.uid = uid
+        self.type = type
+        self.parent = parent
+        self.offset = offset
+        self.length = length
+        self.entries_offset = entries_offset
+        self.entries_length = entries_length
+        self.children = []
+
+
+class BinaryReportReader(object):
+    """
+    Reads a test report written by :py:class:`BinaryReportWriter`.
+
+    The file is memory mapped and only its index is decoded upfront, the
+    records of the test group and testcase reports are decoded on demand by
+    uid. Serialized testcase entries are stored in separate records and can
+    be read without deserializing the testcase report.
+
+    :param path: Path of the binary report file.
+    :type path: ``str``
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, 'rb')
+        try:
+            self._map = mmap.mmap(
+                self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except Exception:
+            self._file.close()
+            raise
+        self._root = None
+        self._nodes = {}
+        try:
+            self._read_index()
+        except Exception:
+            self.close()
+            raise
+
+    def close(self):
+        """Unmaps and closes the report file."""
+        self._map.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _read_index(self):
+        if len(self._map) < _HEADER.size + _TRAILER.size:
+            raise ValueError('Invalid binary report: {}'.format(self.path))
+        magic, codec, compress = _HEADER.unpack_from(self._map, 0)
+        index_offset, index_magic = _TRAILER.unpack_from(
+            self._map, len(self._map) - _TRAILER.size)
+        if magic != MAGIC or index_magic != INDEX_MAGIC:
+            raise ValueError('Invalid binary report: {}'.format(self.path))
+
+        self._decode = _decoder(codec)
+        self._compress = bool(compress)
+
+        nodes = []
+        for item in self._read_record(index_offset):
+            uid, node_type, parent_idx = item[:3]
+            parent = None if parent_idx is None else nodes[parent_idx]
+            node = _Node(uid, node_type, parent, *item[3:])
+            nodes.append(node)
+            if parent is None:
+                self._root = node
+            else:
+                parent.children.append(node)
+                self._nodes[uid] = node
+
+    def _read_record(self, offset):
+        length, = _LENGTH.unpack_from(self._map, offset)
+        start = offset + _LENGTH.size
+        text = self._map[start:start + length]
+        if self._compress:
+            text = zlib.decompress(text)
+        return self._decode(text)
+
+    def _node(self, uid):
+        try:
+            return self._nodes[str(uid)]
+        except KeyError:
+            raise KeyError('No report with uid: {}'.format(uid))
+
+    def _node_data(self, node, shallow=False):
+        """Serialized data of a node, with its entries."""
+        data = self._read_record(node.offset)
+        if node.type == _CASE_TYPE:
+            data['entries'] = self._read_record(node.entries_offset)
+        elif shallow:
+            data['entries'] = []
+        else:
+            data['entries'] = [
+                self._node_data(child) for child in node.children]
+        return data
+
+    def __contains__(self, uid):
+        return str(uid) in self._nodes
+
+    def __len__(self):
+        return len(self._nodes)
+
+    @property
+    def uids(self):
+        """Uids of all test group and testcase reports, in file order."""
+        return [node.uid for node in sorted(
+            self._nodes.values(), key=lambda node: node.offset)]
+
+    @property
+    def entries(self):
+        """Uids of the top level test group reports."""
+        return [node.uid for node in self._root.children]
+
+    def children(self, uid):
+        """
+        Uids of the child reports of a test group report.
+
+        :param uid: Test group report uid.
+        :type uid: ``str``
+        :return: Child report uids.
+        :rtype: ``list`` of ``str``
+        """
+        return [node.uid for node in self._node(uid).children]
+
+    def parent(self, uid):
+        """
+        Uid of the parent test group report, or None for top level reports.
+
+        :param uid: Report uid.
+        :type uid: ``str``
+        :return: Parent report uid.
+        :rtype: ``str`` or ``NoneType``
+        """
+        parent = self._node(uid).parent
+        return None if parent is self._root else parent.uid
+
+    def testcase_entries(self, uid):
+        """
+        Serialized entries of a testcase report, decoded from their own
+        record without loading the testcase report.
+
+        :param uid: Testcase report uid.
+        :type uid: ``str``
+        :return: Serialized assertion and log entries.
+        :rtype: ``list`` of ``dict``
+        """
+        node = self._node(uid)
+        if node.type != _CASE_TYPE:
+            raise ValueError('Not a testcase report: {}'.format(uid))
+        return self._read_record(node.entries_offset)
+
+    def get_by_uid(self, uid, shallow=False):
+        """
+        Deserializes a test group or testcase report, decoding only its
+        records.
+
+        :param uid: Report uid.
+        :type uid: ``str``
+        :param shallow: Deserialize a test group report without its entries.
+        :type shallow: ``bool``
+        :return: Report and its children.
+        :rtype: :py:class:`~testplan.report.testing.base.TestGroupReport` or
+          :py:class:`~testplan.report.testing.base.TestCaseReport`
+        """
+        return load_tree_data(
+            self._node_data(self._node(uid), shallow=shallow),
+            node_schema=TestGroupReportSchema,
+            leaf_schema=TestCaseReportSchema)
+
+    def __getitem__(self, uid):
+        return self.get_by_uid(uid)
+
+    def load(self):
+        """
+        Deserializes the whole test report.
+
+        :return: Test report.
+        :rtype: :py:class:`~testplan.report.testing.base.TestReport`
+        """
+        return cached_load(TestReportSchema, self._node_data(self._root))
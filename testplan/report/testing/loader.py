@@ -0,0 +1,236 @@
+"""
+Lazy loading of test reports from JSON files.
+"""
+import gzip
+import json
+import re
+
+from testplan.common.serialization.schemas import load_tree_data
+
+from .schemas import TestGroupReportSchema, TestCaseReportSchema
+
+
+__all__ = ['ReportLoader']
+
+
+# Complete JSON strings, an unterminated string start (at the end of a
+# chunk) or the punctuation that defines the structure of the document.
+_TOKEN = re.compile(br'"(?:[^"\\]|\\.)*"|"|[{}\[\]:,]')
+
+_GROUP_TYPE = 'TestGroupReport'
+_CASE_TYPE = 'TestCaseReport'
+
+
+class _Node(object):
+    """Location of a serialized report in the file."""
+
+    __slots__ = ('parent', 'start', 'end', 'entries_start', 'entries_end',
+                 'uid', 'type', 'children')
+
+    def __init__(self, parent, start):
+        self.parent = parent
+        self.start = start
+        self.end = None
+        self.entries_start = None
+        self.entries_end = None
+        self.uid = None
+        self.type = None
+        self.children = []
+
+
+class _Frame(object):
+    """Object or array being scanned."""
+
+    __slots__ = ('is_object', 'key', 'expect_key', 'node', 'nodes_parent')
+
+    def __init__(self, is_object, node=None, nodes_parent=None):
+        self.is_object = is_object
+        self.key = None
+        self.expect_key = True
+        self.node = node
+        self.nodes_parent = nodes_parent
+
+
+class ReportLoader(object):
+    """
+    Indexes a JSON test report file, as written by
+    :py:class:`~testplan.exporters.testing.json.JSONExporter`, and
+    deserializes the test group and testcase reports on demand by uid.
+
+    The file is scanned once to record the byte range of each report, without
+    building the report objects or the serialized data. Gzip compressed files
+    (``.gz``) are supported, but seeking in them is slower.
+
+    :param path: Path of the JSON report file.
+    :type path: ``str``
+    :param chunk_size: Number of bytes read at a time while indexing.
+    :type chunk_size: ``int``
+    """
+
+    def __init__(self, path, chunk_size=1024 * 1024):
+        self.path = path
+        self.chunk_size = chunk_size
+        self._root = None
+        self._nodes = {}
+        self._index()
+
+    def _open(self):
+        if self.path.endswith('.gz'):
+            return gzip.open(self.path, 'rb')
+        return open(self.path, 'rb')
+
+    def _index(self):
+        candidates = []
+        stack = []
+
+        def handle(token, offset):
+            top = stack[-1] if stack else None
+            if token == b'{':
+                node = None
+                if top is None:
+                    node = self._root = _Node(None, offset)
+                elif top.nodes_parent is not None:
+                    node = _Node(top.nodes_parent, offset)
+                    candidates.append(node)
+                stack.append(_Frame(True, node=node))
+            elif token == b'[':
+                nodes_parent = None
+                if top is not None and top.node is not None and \
+                        not top.expect_key and top.key == b'"entries"' and \
+                        top.node.type in (None, _GROUP_TYPE):
+                    nodes_parent = top.node
+                    nodes_parent.entries_start = offset
+                stack.append(_Frame(False, nodes_parent=nodes_parent))
+            elif token == b'}':
+                frame = stack.pop()
+                if frame.node is not None:
+                    frame.node.end = offset + 1
+            elif token == b']':
+                frame = stack.pop()
+                if frame.nodes_parent is not None:
+                    frame.nodes_parent.entries_end = offset + 1
+            elif not top.is_object:
+                return
+            elif token == b':':
+                top.expect_key = False
+            elif token == b',':
+                top.expect_key = True
+                top.key = None
+            elif top.expect_key:
+                top.key = token
+            elif top.node is not None and top.key in (b'"uid"', b'"type"'):
+                setattr(top.node, top.key[1:-1].decode('ascii'),
+                        json.loads(token.decode('utf-8')))
+
+        with self._open() as report_file:
+            buf = b''
+            offset = 0
+            while True:
+                chunk = report_file.read(self.chunk_size)
+                buf += chunk
+                pos = len(buf)
+                for match in _TOKEN.finditer(buf):
+                    token = match.group()
+                    if token == b'"' and chunk:
+                        # String continues in the next chunk.
+                        pos = match.start()
+                        break
+                    handle(token, offset + match.start())
+                if not chunk:
+                    break
+                offset += pos
+                buf = buf[pos:]
+
+        if self._root is None or self._root.end is None:
+            raise ValueError('Invalid JSON report: {}'.format(self.path))
+
+        # Testcase entries and non report objects may be candidates if their
+        # parent type was not known yet when they were scanned.
+        for node in candidates:
+            parent = node.parent
+            if node.type not in (_GROUP_TYPE, _CASE_TYPE) or (
+                    parent is not self._root and (
+                        parent.type != _GROUP_TYPE or
+                        str(parent.uid) not in self._nodes)):
+                continue
+            self._nodes[str(node.uid)] = node
+            parent.children.append(node)
+
+    def _node(self, uid):
+        try:
+            return self._nodes[str(uid)]
+        except KeyError:
+            raise KeyError('No report with uid: {}'.format(uid))
+
+    def _read(self, start, end):
+        with self._open() as report_file:
+            report_file.seek(start)
+            return report_file.read(end - start)
+
+    def __contains__(self, uid):
+        return str(uid) in self._nodes
+
+    def __len__(self):
+        return len(self._nodes)
+
+    @property
+    def uids(self):
+        """Uids of all test group and testcase reports, in file order."""
+        return [str(node.uid) for node in sorted(
+            self._nodes.values(), key=lambda node: node.start)]
+
+    @property
+    def entries(self):
+        """Uids of the top level test group reports."""
+        return [str(node.uid) for node in self._root.children]
+
+    def children(self, uid):
+        """
+        Uids of the child reports of a test group report.
+
+        :param uid: Test group report uid.
+        :type uid: ``str``
+        :return: Child report uids.
+        :rtype: ``list`` of ``str``
+        """
+        return [str(node.uid) for node in self._node(uid).children]
+
+    def parent(self, uid):
+        """
+        Uid of the parent test group report, or None for top level reports.
+
+        :param uid: Report uid.
+        :type uid: ``str``
+        :return: Parent report uid.
+        :rtype: ``str`` or ``NoneType``
+        """
+        parent = self._node(uid).parent
+        return None if parent is self._root else str(parent.uid)
+
+    def get_by_uid(self, uid, shallow=False):
+        """
+        Deserializes a test group or testcase report, reading only its part
+        of the file.
+
+        :param uid: Report uid.
+        :type uid: ``str``
+        :param shallow: Deserialize a test group report without its entries.
+        :type shallow: ``bool``
+        :return: Report and its children.
+        :rtype: :py:class:`~testplan.report.testing.base.TestGroupReport` or
+          :py:class:`~testplan.report.testing.base.TestCaseReport`
+        """
+        node = self._node(uid)
+        if shallow and node.type == _GROUP_TYPE:
+            text = b''.join([
+                self._read(node.start, node.entries_start), b'[]',
+                self._read(node.entries_end, node.end)])
+        else:
+            text = self._read(node.start, node.end)
+        return load_tree_data(
+            json.loads(text.decode('utf-8')),
+            node_schema=TestGroupReportSchema,
+            leaf_schema=TestCaseReportSchema)
+
+    def __getitem__(self, uid):
+        return self.get_by_uid(uid)
@@ -4,7 +4,8 @@ import functools
 
 from marshmallow import Schema, fields, post_load
 
-from testplan.common.serialization.schemas import load_tree_data
+from testplan.common.serialization.schemas import (
+    load_tree_data, cached_dump, cached_load)
 from testplan.common.report.schemas import ReportSchema
 from testplan.common.serialization import fields as custom_fields
 
@@ -56,13 +57,13 @@ class TimerField(fields.Field):
 
     def _serialize(self, value, attr, obj):
         return {
-            k: IntervalSchema(strict=True).dump(v).data
+            k: cached_dump(IntervalSchema, v)
             for k, v in value.items()
             }
 
     def _deserialize(self, value, attr, data):
         return timing.Timer({
-            k: IntervalSchema(strict=True).load(v).data
+            k: cached_load(IntervalSchema, v)
             for k, v in value.items()
         })
 
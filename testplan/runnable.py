@@ -8,14 +8,15 @@ import webbrowser
 
 from collections import OrderedDict
 
-from schema import Schema, Or, Use
+from schema import Schema, Or, And, Use
 
 from testplan import defaults
-from testplan.common.config import ConfigOption
+from testplan.common.config import ConfigOption, validate_func
 from testplan.common.entity import Entity, RunnableConfig, RunnableStatus, \
     RunnableResult, Runnable
-from testplan.common.exporters import BaseExporter, ExporterResult
+from testplan.common.exporters import BaseExporter, run_exporters
 from testplan.common.utils.path import default_runpath
+from testplan.common.utils.history import DurationHistory
 from testplan.exporters import testing as test_exporters
 from testplan.logger import log_test_status, TEST_INFO, TESTPLAN_LOGGER
 
@@ -27,6 +28,7 @@ from testplan.report.testing.styles import Style
 from testplan.testing import listing, filtering, ordering, tagging
 
 from .runners.base import Executor
+from .runners.pools.base import Pool, default_check_steal
 from .runners.pools.tasks import Task, TaskResult
 
 
@@ -42,6 +44,8 @@ def get_default_exporters(config):
         result.append(test_exporters.TagFilteredPDFExporter())
     if config.json_path:
         result.append(test_exporters.JSONExporter())
+    if config.binary_path:
+        result.append(test_exporters.BinaryExporter())
     if config.xml_dir:
         result.append(test_exporters.XMLExporter())
     return result
@@ -100,7 +104,11 @@ class TestRunnerConfig(RunnableConfig):
                 'runpath', default=default_runpath,
                 block_propagation=False): Or(None, str, lambda x: callable(x)),
             ConfigOption('path_cleanup', default=True): bool,
+            ConfigOption(
+                'duration_history', default=None):
+                Or(None, str, lambda x: callable(x)),
             ConfigOption('all_tasks_local', default=False): bool,
+            ConfigOption('work_stealing', default=False): bool,
             ConfigOption('shuffle', default=[]): list, # list of string choices
             ConfigOption(
                 'shuffle_seed', default=float(random.randint(1, 9999))): float,
@@ -121,6 +129,9 @@ class TestRunnerConfig(RunnableConfig):
             ConfigOption(
                 'json_path', default=None,
                 block_propagation=False): Or(str, None),
+            ConfigOption(
+                'binary_path', default=None,
+                block_propagation=False): Or(str, None),
             ConfigOption(
                 'pdf_style', default=defaults.PDF_STYLE,
                 block_propagation=False): Style,
@@ -129,6 +140,8 @@ class TestRunnerConfig(RunnableConfig):
             ConfigOption('report_tags_all', default=[],
                 block_propagation=False): [Use(tagging.validate_tag_value)],
             ConfigOption('browse', default=False): bool,
+            ConfigOption('exporter_processes', default=0):
+                And(int, lambda n: n >= 0),
             ConfigOption(
                 'test_filter', default=filtering.Filter(),
                 block_propagation=False): filtering.BaseFilter,
@@ -191,8 +204,16 @@ class TestRunner(Runnable):
     :type runpath: ``str`` or ``callable``
     :param path_cleanup: Clean previous runpath entries.
     :type path_cleanup: ``bool``
+    :param duration_history: Path of the database storing test durations
+      across runs, or a callable that returns it i.e
+      :py:func:`~testplan.common.utils.history.default_history_path`.
+      Default ``None`` keeps the durations of the current run only.
+    :type duration_history: ``str`` or ``NoneType`` or ``callable``
     :param all_tasks_local: TODO
     :type all_tasks_local: ``bool``
+    :param work_stealing: Move unassigned tasks from busy pools to pools
+      with idle workers.
+    :type work_stealing: ``bool``
     :param shuffle: Shuffle strategy.
     :type shuffle: ``list`` of ``str``
     :param shuffle_seed: Shuffle seed.
@@ -209,12 +230,17 @@ class TestRunner(Runnable):
     :type pdf_path: ``str``
     :param json_path: JSON output path ..path/*.json.
     :type json_path: ``str``
+    :param binary_path: Compact binary report output path.
+    :type binary_path: ``str``
     :param pdf_style: PDF creation styling options.
     :type pdf_style: :py:class:`Style <testplan.report.testing.styles.Style>`
     :param report_tags: Matches tests marked with any of the given tags.
     :type report_tags: ``list``
     :param report_tags_all: Match tests marked with all of the given tags.
     :type report_tags_all: ``list``
+    :param exporter_processes: Number of processes running the exporters
+      concurrently after the run, 0 to run them sequentially.
+    :type exporter_processes: ``int``
     :param test_filter: Tests filtering class.
     :type test_filter: Subclass of
       :py:class:`BaseFilter <testplan.testing.filtering.BaseFilter>`
@@ -237,12 +263,27 @@ class TestRunner(Runnable):
         super(TestRunner, self).__init__(**options)
         self._tests = OrderedDict()  # uid to resource
         self._result.test_report = TestReport(name=self.cfg.name)
+        self._history = None
+        self.should_steal = default_check_steal
 
     @property
     def report(self):
         """Tests report."""
         return self._result.test_report
 
+    @property
+    def history(self):
+        """
+        :py:class:`~testplan.common.utils.history.DurationHistory` of test
+        durations from previous runs, shared with the pool resources.
+        """
+        if self._history is None:
+            path = self.cfg.duration_history
+            if callable(path):
+                path = path(self)
+            self._history = DurationHistory(path=path)
+        return self._history
+
     def add_resource(self, resource, uid=None):
         """
         Adds a test
@@ -312,22 +353,46 @@ class TestRunner(Runnable):
             runnable.parent_cfg = self.cfg
             runnable.parent = self
 
+        if resource is None:
+            resource = self.resources.first()
+        if resource not in self.resources:
+            raise RuntimeError('Resource "{}" does not exist.'.format(resource))
+
         # Check if test should not be added only when a filter is used.
         if type(self.cfg.test_filter) is not filtering.Filter or\
                     self.cfg.test_lister is not None:
-            if not self.should_be_added(runnable):
+            if not self.should_be_added(runnable, resource=resource):
                 return None
 
-        if resource is None:
-            resource = self.resources.first()
-        if resource not in self.resources:
-            raise RuntimeError('Resource "{}" does not exist.'.format(resource))
         self.resources[resource].add(runnable, uid)
         self._tests[uid] = resource
         return uid
 
-    def should_be_added(self, runnable):
-        """Determines if a test runnable should be added for execution."""
+    def set_steal_check(self, check_steal):
+        """
+        Sets callable with custom rules to determine if a task can be moved
+        from one pool to another when ``work_stealing`` is enabled. It must
+        accept the task, the source pool and the target pool objects and
+        return if the task is compatible with the target pool.
+
+        :param check_steal: Custom callable for task stealing.
+        :type check_steal: ``callable`` that takes
+          ``task``, ``source``, ``target`` arguments.
+        """
+        validate_func('task', 'source', 'target')(check_steal)
+        self.should_steal = check_steal
+
+    def should_be_added(self, runnable, resource=None):
+        """
+        Determines if a test runnable should be added for execution.
+
+        :param runnable: Test runner entity.
+        :type runnable: :py:class:`~testplan.common.entity.base.Runnable`
+        :param resource: Uid of the executor resource the test is added to.
+        :type resource: ``str``
+        :return: Whether the test should be added.
+        :rtype: ``bool``
+        """
         if isinstance(runnable, Task):
             target = runnable.materialize()
             target.cfg.parent = self.cfg
@@ -346,6 +411,16 @@ class TestRunner(Runnable):
             self.cfg.test_lister.log_test_info(target)
             return False
 
+        if should_run and isinstance(runnable, Task) and\
+                resource is not None and\
+                getattr(self.resources[resource], 'in_process', False):
+            # Workers of the same process reuse the filtered target instead
+            # of materializing the task again, under their own runpath and
+            # config, as they would for a new target.
+            target.parent = None
+            # Config parent cannot be overwritten through its setter.
+            target.cfg._parent = None  # pylint: disable=protected-access
+            runnable.cache(target)
         return should_run
 
     def _add_step(self, step, *args, **kwargs):
@@ -375,6 +450,7 @@ class TestRunner(Runnable):
         self._add_step(self._record_end)  # needs to happen before export
         self._add_step(self._invoke_exporters)
         self._add_step(self._post_exporters)
+        self._add_step(self._close_history)
 
     def _wait_ongoing(self):
         self.logger.info('{} runpath: {}'.format(self, self.runpath))
@@ -390,16 +466,37 @@ class TestRunner(Runnable):
                     ongoing = True
             if ongoing is False:
                 break
+            if self.cfg.work_stealing:
+                self._steal_tasks()
             time.sleep(self.cfg.active_loop_sleep)
 
+    def _steal_tasks(self):
+        """Move unassigned tasks from busy pools to pools that are idle."""
+        pools = [(uid, resource) for uid, resource in self.resources.items()
+                 if isinstance(resource, Pool)]
+        for target_uid, target in pools:
+            if not target.idle_capacity():
+                continue
+            # Busiest pools first.
+            for _, source in sorted(pools, reverse=True,
+                                    key=lambda item: len(item[1].unassigned)):
+                if source is target or not source.unassigned:
+                    continue
+                for uid in target.steal(source, self.should_steal):
+                    self._tests[uid] = target_uid
+                if not target.idle_capacity():
+                    break
+
     def _create_result(self):
         step_result = True
         test_results = self._result.test_results
+        history_keys = {}
         for uid, resource in self._tests.items():
             if not isinstance(self.resources[resource], Executor):
                 continue
             resource_result = self.resources[resource].results[uid]
             if isinstance(resource_result, TaskResult):
+                history_keys[uid] = resource_result.task.signature
                 if resource_result.status is False:
                     test_results[uid] = result_for_failed_task(resource_result)
                 else:
@@ -408,8 +505,29 @@ class TestRunner(Runnable):
                 test_results[uid] = resource_result
             self._result.test_report.append(test_results[uid].report)
             step_result = step_result and test_results[uid].run
+        self._record_durations(history_keys)
         return step_result
 
+    def _record_durations(self, history_keys):
+        """
+        Store the durations of all tests to the history database. Tests
+        created by pool tasks are keyed by the task signature, that pools
+        use to look up the expected task durations.
+        """
+        try:
+            for uid, result in self._result.test_results.items():
+                self.history.record_report(
+                    result.report, key=history_keys.get(uid))
+        except Exception as exc:
+            self.logger.error(
+                'Could not record durations to {} - {}'.format(
+                    self.history.path, exc))
+
+    def _close_history(self):
+        if self._history is not None:
+            self._history.close()
+            self._history = None
+
     def uid(self):
         """Entity uid."""
         return self.cfg.name
@@ -433,21 +551,21 @@ class TestRunner(Runnable):
             if hasattr(exporter, 'cfg'):
                 exporter.cfg.parent = self.cfg
 
-            if isinstance(exporter, test_exporters.Exporter):
-                exp_result = ExporterResult.run_exporter(
-                    exporter=exporter,
-                    source=self._result.test_report,
-                    type='test',
-                )
-
-                if not exp_result.success:
-                    TESTPLAN_LOGGER.error(exp_result.traceback)
-                self._result.exporter_results.append(exp_result)
-            else:
+            if not isinstance(exporter, test_exporters.Exporter):
                 raise NotImplementedError(
                     'Exporter logic not'
                     ' implemented for: {}'.format(type(exporter)))
 
+        for exp_result in run_exporters(
+                exporters=exporters,
+                source=self._result.test_report,
+                type='test',
+                processes=self.cfg.exporter_processes):
+
+            if not exp_result.success:
+                TESTPLAN_LOGGER.error(exp_result.traceback)
+            self._result.exporter_results.append(exp_result)
+
     def _post_exporters(self):
         if self.cfg.browse:
             # Open exporter url to browse.
@@ -457,5 +575,5 @@ class TestRunner(Runnable):
                     break
 
     def aborting(self):
-        """Suppressing not implemented debug log from parent class."""
-        pass
+        """Close the duration history."""
+        self._close_history()
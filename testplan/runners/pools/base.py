@@ -5,6 +5,8 @@ import time
 import inspect
 import threading
 
+from collections import deque, OrderedDict
+
 from schema import Or, And
 
 from testplan.common.config import ConfigOption, validate_func
@@ -15,10 +17,12 @@ from testplan.common.utils.thread import interruptible_join
 from testplan.common.utils.exceptions import format_trace
 from testplan.common.utils.strings import Color
 from testplan.common.utils.timing import wait_until_predicate
+from testplan.common.utils.history import DurationHistory
 
 from .communication import Message
 from testplan.runners.base import Executor, ExecutorConfig
-from .tasks import Task, TaskResult
+from .tasks import Task, TaskResult, TaskSerializationError
+from .scheduling import LongestFirstScheduler, TaskQueue
 
 
 class Transport(object):
@@ -26,15 +30,21 @@ class Transport(object):
     Transport layer for communication between a pool and a worker.
     Worker send messages, pool receives and send back responses.
 
-    :param recv_sleep: Sleep duration in msg receive loop.
+    Receiving side blocks on a condition variable and is woken up as soon
+    as a response is available, the sleep duration only bounds how quickly
+    a deactivated transport is noticed.
+
+    :param recv_sleep: Max wait duration in msg receive loop.
     :type recv_sleep: ``float``
     """
 
     def __init__(self, recv_sleep=0.05):
         self._recv_sleep = recv_sleep
+        self._responded = threading.Condition()
         self.requests = []
         self.responses = []
         self.active = True
+        self.on_request = None
 
     def send(self, message):
         """
@@ -44,6 +54,8 @@ class Transport(object):
         :type message: :py:class:`~testplan.runners.pools.communication.Message`
         """
         self.requests.append(message)
+        if self.on_request is not None:
+            self.on_request(self)
 
     def receive(self):
         """
@@ -52,11 +64,12 @@ class Transport(object):
         :return: Response to the message sent.
         :type: :py:class:`~testplan.runners.pools.communication.Message`
         """
-        while self.active:
-            try:
-                return self.responses.pop()
-            except IndexError:
-                time.sleep(self._recv_sleep)
+        with self._responded:
+            while self.active:
+                try:
+                    return self.responses.pop()
+                except IndexError:
+                    self._responded.wait(self._recv_sleep)
 
     def accept(self):
         """
@@ -75,7 +88,9 @@ class Transport(object):
         :param message: Respond message.
         :type message: :py:class:`~testplan.runners.pools.communication.Message`
         """
-        self.responses.append(message)
+        with self._responded:
+            self.responses.append(message)
+            self._responded.notify()
 
     def send_and_receive(self, message, expect=None):
         """
@@ -112,12 +127,15 @@ class Transport(object):
 
 class ConnectionManager(object):
     """
-    Manages worker connections and performs round robin communication.
+    Manages worker connections. Workers notify the manager when they send a
+    request so that the pool is woken up exactly when a message is pending,
+    instead of polling all worker transports in turn.
     """
 
     def __init__(self, cfg):
         self._workers = []
-        self._current = 1
+        self._pending = deque()
+        self._ready = threading.Condition()
 
     @property
     def workers(self):
@@ -127,30 +145,44 @@ class ConnectionManager(object):
     def register(self, worker):
         """Register a new worker."""
         self._workers.append(worker)
+        worker.transport.on_request = self._notify
 
-    def accept(self):
+    def _notify(self, transport):
+        with self._ready:
+            self._pending.append(transport)
+            self._ready.notify()
+
+    def accept(self, timeout=None):
         """
         Accepts a new message from worker.
 
+        :param timeout: Seconds to block waiting for a message,
+            ``None`` to return immediately.
+        :type timeout: ``float`` or ``NoneType``
         :return: Message received from worker transport.
         :rtype: ``NoneType`` or
             :py:class:`~testplan.runners.pools.communication.Message`
         """
-        if not self._workers:
-            return None
-        msg = None
+        with self._ready:
+            if not self._pending and timeout:
+                self._ready.wait(timeout)
+            try:
+                transport = self._pending.popleft()
+            except IndexError:
+                return None
         try:
-            idx = (self._current % len(self._workers)) - 1
-            msg = self._workers[idx].transport.accept()
+            return transport.accept()
         except IndexError:
-            pass
-        finally:
-            self._current += 1
-            return msg
+            return None
+
+    def wake(self):
+        """Wakes up a pending accept, i.e to serve newly added tasks."""
+        with self._ready:
+            self._ready.notify_all()
 
     def close(self):
-        """Closes the workers transport connections."""
-        pass
+        """Wakes up any pending accept, the pool will notice it stops."""
+        self.wake()
 
 
 class WorkerConfig(ResourceConfig):
@@ -185,6 +217,8 @@ class Worker(Resource):
     """
 
     CONFIG = WorkerConfig
+    # Tasks are executed in the process of the pool.
+    IN_PROCESS = True
 
     def __init__(self, **options):
         super(Worker, self).__init__(**options)
@@ -194,6 +228,7 @@ class Worker(Resource):
         self.last_heartbeat = None
         self.assigned = set()
         self.requesting = 0
+        self._shared_environment = None
 
     @property
     def transport(self):
@@ -237,17 +272,68 @@ class Worker(Resource):
         self._transport.active = False
         if self._loop_handler:
             interruptible_join(self._loop_handler)
+        self._stop_shared_environment()
 
     def aborting(self):
         """Aborting logic, will not wait running tasks."""
         self._transport.active = False
+        if self._shared_environment is not None:
+            for resource in self._shared_environment[1]:
+                resource.abort()
+
+    def acquire_environment(self, key):
+        """
+        Takes the environment kept started by the previous test, if it has
+        the given config key, see ``shared_environment`` option of
+        :py:class:`~testplan.testing.multitest.base.MultiTest`.
+
+        :param key: Environment config key.
+        :type key: ``str``
+        :return: Started environment or None.
+        :rtype: :py:class:`~testplan.common.entity.base.Environment`
+        """
+        if self._shared_environment is None:
+            return None
+        if self._shared_environment[0] != key or any(
+                resource.status.tag != resource.STATUS.STARTED
+                for resource in self._shared_environment[1]):
+            self._stop_shared_environment()
+            return None
+        environment = self._shared_environment[1]
+        self._shared_environment = None
+        return environment
+
+    def release_environment(self, key, environment):
+        """
+        Keeps a started environment for the next test, stopping the one kept
+        previously.
+
+        :param key: Environment config key.
+        :type key: ``str``
+        :param environment: Started environment.
+        :type environment: :py:class:`~testplan.common.entity.base.Environment`
+        """
+        self._stop_shared_environment()
+        self._shared_environment = (key, environment)
+
+    def _stop_shared_environment(self):
+        if self._shared_environment is None:
+            return
+        environment = self._shared_environment[1]
+        self._shared_environment = None
+        environment.stop(reversed=True)
+        for msg in environment.stop_exceptions.values():
+            self.logger.error(msg)
 
     def _loop(self, transport):
         message = Message(**self.metadata)
 
         while self.active:
+            # Pull up to max_inflight_per_worker tasks, execute them all
+            # locally and send back their results in a single batch.
             received = transport.send_and_receive(message.make(
-                message.TaskPullRequest, data=1))
+                message.TaskPullRequest,
+                data=self.cfg.max_inflight_per_worker))
             if received is None or received.cmd == Message.Stop:
                 break
             elif received.cmd == Message.TaskSending:
@@ -256,9 +342,8 @@ class Worker(Resource):
                     results.append(self.execute(item))
                 transport.send_and_receive(message.make(
                     message.TaskResults, data=results), expect=message.Ack)
-            elif received.cmd == Message.Ack:
-                pass
-            time.sleep(self.cfg.active_loop_sleep)
+            # An Ack means the pool held the pull for pull_timeout seconds
+            # without finding work, pull again straight away.
 
     def execute(self, task):
         """
@@ -269,6 +354,7 @@ class Worker(Resource):
         :return: Task result.
         :rtype: :py:class:`~testplan.runners.pools.tasks.base.TaskResult`
         """
+        start_time = time.time()
         try:
             target = task.materialize()
             if isinstance(target, Runnable):
@@ -284,9 +370,11 @@ class Worker(Resource):
         except Exception as exc:
             task_result = TaskResult(
                 task=task, result=None, status=False,
-                reason=format_trace(inspect.trace(), exc))
+                reason=format_trace(inspect.trace(), exc),
+                duration=time.time() - start_time)
         else:
-            task_result = TaskResult(task=task, result=result, status=True)
+            task_result = TaskResult(task=task, result=result, status=True,
+                                     duration=time.time() - start_time)
         return task_result
 
     def respond(self, msg):
@@ -309,6 +397,21 @@ def default_check_reschedule(pool, task_result):
     return False
 
 
+def default_check_steal(task, source, target):
+    """
+    Determines if a task can be moved from source pool to target pool.
+    Tasks can move between pools of the same type, or to any pool if they
+    can be serialized.
+    """
+    if type(source) is type(target):
+        return True
+    try:
+        task.dumps(check_loadable=True)
+    except TaskSerializationError:
+        return False
+    return True
+
+
 class PoolConfig(ExecutorConfig):
     """
     Configuration object for
@@ -329,6 +432,29 @@ class PoolConfig(ExecutorConfig):
     :type heartbeats_miss_limit: ``int``
     :param task_retries_limit: Maximum times a task can be re-assigned to pool.
     :type task_retries_limit: ``int``
+    :param max_inflight_per_worker: Number of tasks a worker pulls and keeps
+      queued locally per request, their results are sent back in one batch.
+      Higher values save pool round trips at the cost of a coarser load
+      balancing. Default: 1
+    :type max_inflight_per_worker: ``int``
+    :param scheduler: Policy that selects the next task to be assigned to a
+      worker, each pool creates its own scheduler by calling it.
+      Default: longest expected duration first.
+    :type scheduler: ``callable`` that returns a
+      :py:class:`~testplan.runners.pools.scheduling.BaseScheduler`
+    :param duration_history: Path of the database storing task durations
+      across runs, used to estimate task costs for scheduling. Default is
+      the history of the parent test runner, which records the durations
+      of the tests at the end of the run.
+    :type duration_history: ``str`` or ``NoneType``
+    :param accept_timeout: Max seconds the pool blocks waiting for a worker
+      request before re-checking its own status.
+    :type accept_timeout: ``int`` or ``float``
+    :param pull_timeout: Max seconds the pool holds the task pull of an idle
+      worker, waiting for tasks, before answering it empty. Capped to the
+      ``worker_heartbeat`` period so that workers keep sending heartbeats.
+      Default: 1
+    :type pull_timeout: ``int`` or ``float``
 
     Also inherits all :py:class:`~testplan.runners.base.ExecutorConfig`
     options.
@@ -348,6 +474,15 @@ class PoolConfig(ExecutorConfig):
             ConfigOption('heartbeat_init_window', default=300): int,
             ConfigOption('heartbeats_miss_limit', default=3): int,
             ConfigOption('task_retries_limit', default=3): int,
+            ConfigOption('max_inflight_per_worker', default=1):
+                And(int, lambda x: x > 0),
+            ConfigOption('scheduler', default=LongestFirstScheduler):
+                lambda x: callable(x),
+            ConfigOption('duration_history', default=None): Or(None, str),
+            ConfigOption('accept_timeout', default=0.1):
+                And(Or(int, float), lambda x: x > 0),
+            ConfigOption('pull_timeout', default=1):
+                And(Or(int, float), lambda x: x > 0),
         }
 
 
@@ -361,13 +496,19 @@ class Pool(Executor):
 
     def __init__(self, **options):
         super(Pool, self).__init__(**options)
-        self.unassigned = []  # unassigned tasks
+        self.unassigned = TaskQueue()  # unassigned tasks
         self.task_assign_cnt = {}  # uid: times_assigned
         self.should_reschedule = default_check_reschedule
         self._workers = Environment(parent=self)
         self._conn = self.CONN_MANAGER(self._cfg)
         self._pool_lock = threading.Lock()
         self._metadata = {}
+        self._scheduler = self.cfg.scheduler()
+        self._history = None
+        self._own_history = False
+        self._costs = {}
+        self._signatures = {}  # signature: uids of tasks with a cost lookup
+        self._pulls = OrderedDict()  # worker: time its task pull was held
 
     def uid(self):
         """Pool name."""
@@ -387,6 +528,122 @@ class Pool(Executor):
                 type(task)))
         super(Pool, self).add(task, uid)
         self.unassigned.append(uid)
+        self._conn.wake()
+
+    def idle_capacity(self):
+        """
+        Number of tasks that active workers are requesting while there are no
+        unassigned tasks to send them.
+        """
+        if self.status.tag != self.status.STARTED or self.unassigned:
+            return 0
+        return sum(worker.requesting for worker in self._workers
+                   if worker.active)
+
+    def steal(self, source, check_steal=default_check_steal):
+        """
+        Move unassigned tasks of another pool to this one, up to its idle
+        capacity and as long as the source pool has more unassigned tasks than
+        its own workers are requesting.
+
+        :param source: Pool to move the tasks from.
+        :type source: :py:class:`~testplan.runners.pools.base.Pool`
+        :param check_steal: Callable that determines if a task can be moved,
+          accepts ``task``, ``source`` and ``target`` pool arguments.
+        :type check_steal: ``callable``
+        :return: Uids of the tasks moved.
+        :rtype: ``list`` of ``str``
+        """
+        stolen = []
+        with self._pool_lock, source._pool_lock:
+            capacity = self.idle_capacity()
+            surplus = len(source.unassigned) - source.workers_requests()
+            for uid in list(source.unassigned):
+                if len(stolen) >= min(capacity, surplus):
+                    break
+                task = source._input[uid]
+                if uid in self._input or not check_steal(task, source, self):
+                    continue
+                if not self.in_process:
+                    task.cache(None)
+                super(Pool, self).add(task, uid)
+                self.unassigned.append(uid)
+                source.unassigned.remove(uid)
+                source.ongoing.remove(uid)
+                del source._input[uid]
+                source._costs.pop(uid, None)
+                self.logger.test_info('Moved {} from {} to {}'.format(
+                    task, source, self))
+                stolen.append(uid)
+        if stolen:
+            self._conn.wake()
+        return stolen
+
+    @property
+    def history(self):
+        """
+        :py:class:`~testplan.common.utils.history.DurationHistory` of task
+        durations used for scheduling decisions.
+        """
+        if self._history is None:
+            if self.cfg.duration_history is None and\
+                    isinstance(getattr(self.parent, 'history', None),
+                               DurationHistory):
+                self._history = self.parent.history
+            else:
+                self._history = DurationHistory(
+                    path=self.cfg.duration_history)
+                self._own_history = True
+        return self._history
+
+    def _close_history(self):
+        if self._own_history:
+            self._history.close()
+            self._history = None
+            self._own_history = False
+
+    @property
+    def in_process(self):
+        """
+        Whether workers execute the tasks in the process of the pool, so that
+        a task target materialized by the test runner can be reused.
+        """
+        return getattr(self.cfg.worker_type, 'IN_PROCESS', False)
+
+    @property
+    def scheduler(self):
+        """
+        :py:class:`Scheduler <testplan.runners.pools.scheduling.BaseScheduler>`
+        of the pool.
+        """
+        return self._scheduler
+
+    @property
+    def tasks(self):
+        """Uids of all tasks added to the pool."""
+        return list(self._input.keys())
+
+    def task_cost(self, uid):
+        """
+        Expected duration of a task based on the durations of previous
+        executions, looked up once per task.
+
+        :param uid: Task uid.
+        :type uid: ``str``
+        :return: Expected duration in seconds or ``None`` if unknown or the
+          task is no longer in the pool.
+        :rtype: ``float`` or ``NoneType``
+        """
+        if uid not in self._costs:
+            if uid not in self._input:
+                return None
+            signature = self._input[uid].signature
+            if signature is None:
+                self._costs[uid] = None
+            else:
+                self._costs[uid] = self.history.get(signature)
+                self._signatures.setdefault(signature, set()).add(uid)
+        return self._costs[uid]
 
     def set_reschedule_check(self, check_reschedule):
         """
@@ -415,15 +672,14 @@ class Pool(Executor):
             elif self.status.tag == self.status.STOPPING:
                 self.status.change(self.status.STOPPED)
                 break
-            else:
-                msg = self._conn.accept()
-                if msg:
-                    try:
-                        with self._pool_lock:
-                            self.handle_request(msg)
-                    except Exception as exc:
-                        self.logger.error(format_trace(inspect.trace(), exc))
-            time.sleep(self.cfg.active_loop_sleep)
+            msg = self._conn.accept(timeout=self.cfg.accept_timeout)
+            try:
+                with self._pool_lock:
+                    if msg:
+                        self.handle_request(msg)
+                    self._serve_pulls()
+            except Exception as exc:
+                self.logger.error(format_trace(inspect.trace(), exc))
 
     def handle_request(self, request):
         """
@@ -453,34 +709,10 @@ class Pool(Executor):
             worker.respond(response.make(Message.ConfigSending,
                                          data=options))
         elif request.cmd == Message.TaskPullRequest:
-            tasks = []
-            if self.status.tag == self.status.STARTED:
-                for _ in range(request.data):
-                    try:
-                        uid = self.unassigned.pop(0)
-                    except IndexError:
-                        break
-                    if uid not in self.task_assign_cnt:
-                        self.task_assign_cnt[uid] = 0
-                    if self.task_assign_cnt[uid] >= self.cfg.task_retries_limit:
-                        self._discard_task(
-                            uid, '{} already reached max retries: {}'.format(
-                                self._input[uid], self.cfg.task_retries_limit))
-                        continue
-                    else:
-                        self.task_assign_cnt[uid] += 1
-                        task = self._input[uid]
-                        self.logger.test_info(
-                            'Scheduling {} to {}'.format(task, worker))
-                        worker.assigned.add(uid)
-                        tasks.append(task)
-                if tasks:
-                    worker.respond(response.make(
-                        Message.TaskSending, data=tasks))
-                    worker.requesting = request.data - len(tasks)
-                    return
-            worker.requesting = request.data
-            worker.respond(response.make(Message.Ack))
+            if not self._send_tasks(worker, request.data, response):
+                # No reply until there are tasks, see _serve_pulls.
+                worker.requesting = request.data
+                self._pulls[worker] = (time.time(), request.data)
         elif request.cmd == Message.TaskResults:
             for task_result in request.data:
                 uid = task_result.task.uid()
@@ -502,6 +734,7 @@ class Pool(Executor):
                         self.unassigned.append(uid)
                         continue
 
+                self._record_duration(task_result)
                 self._print_test_result(task_result)
                 self._results[uid] = task_result
                 self.ongoing.remove(uid)
@@ -516,6 +749,68 @@ class Pool(Executor):
         else:
             print(request, dir(request), request.cmd, request.data)
 
+    def _send_tasks(self, worker, demand, response):
+        """
+        Sends up to ``demand`` tasks to a worker.
+
+        :return: Whether any task was sent.
+        :rtype: ``bool``
+        """
+        if self.status.tag != self.status.STARTED or not self.unassigned:
+            return False
+        tasks = []
+        for _ in range(demand):
+            try:
+                uid = self.scheduler.pop(self)
+            except IndexError:
+                break
+            if uid not in self.task_assign_cnt:
+                self.task_assign_cnt[uid] = 0
+            if self.task_assign_cnt[uid] >= self.cfg.task_retries_limit:
+                self._discard_task(
+                    uid, '{} already reached max retries: {}'.format(
+                        self._input[uid], self.cfg.task_retries_limit))
+                continue
+            else:
+                self.task_assign_cnt[uid] += 1
+                task = self._input[uid]
+                self.logger.test_info(
+                    'Scheduling {} to {}'.format(task, worker))
+                worker.assigned.add(uid)
+                tasks.append(task)
+        if not tasks:
+            return False
+        worker.respond(response.make(Message.TaskSending, data=tasks))
+        worker.requesting = demand - len(tasks)
+        return True
+
+    def _serve_pulls(self):
+        """
+        Answers the task pulls held for idle workers, with tasks as soon as
+        there are, with a stop once the pool stops, or empty after
+        ``pull_timeout`` so that workers do not poll the pool in a loop.
+        """
+        if not self._pulls:
+            return
+        stopping = not self.active or self.status.tag == self.STATUS.STOPPING
+        timeout = self.cfg.pull_timeout
+        if self.cfg.worker_heartbeat:
+            timeout = min(timeout, self.cfg.worker_heartbeat)
+        for worker, (held, demand) in list(self._pulls.items()):
+            # Messages are made in place, one per response.
+            response = Message(**self._metadata)
+            if not worker.active:
+                pass
+            elif stopping:
+                worker.respond(response.make(Message.Stop))
+            elif self._send_tasks(worker, demand, response):
+                pass
+            elif time.time() - held >= timeout:
+                worker.respond(response.make(Message.Ack))
+            else:
+                continue
+            del self._pulls[worker]
+
     def _deco_worker(self, worker, message):
         self.logger.critical(message.format(worker))
         for outfile in (worker.outfile, worker.errfile):
@@ -591,6 +886,25 @@ class Pool(Executor):
                 reason='Task discarding due to pool {} abort.'.format(self))
             self.ongoing.pop(0)
 
+    def _record_duration(self, task_result):
+        """
+        Store the task duration to a pool own history, the history shared with
+        the parent test runner is updated by the runner with the same key.
+        """
+        signature = task_result.task.signature
+        if not task_result.status or task_result.duration is None\
+                or signature is None:
+            return
+        history = self.history
+        if self._own_history:
+            history.record(signature, task_result.duration)
+            # Costs of the tasks with the same signature are looked up again.
+            uids = self._signatures.pop(signature, set())
+            for uid in uids:
+                self._costs.pop(uid, None)
+            if uids:
+                self.scheduler.update(self, list(uids))
+
     def _print_test_result(self, task_result):
         if not isinstance(task_result.result, RunnableResult) or\
            not hasattr(task_result.result, 'report'):
@@ -636,6 +950,7 @@ class Pool(Executor):
         """Stop connections and workers."""
         self._conn.close()
         self._workers.stop()
+        self._close_history()
 
     def abort_dependencies(self):
         """Empty generator to override parent implementation."""
@@ -649,4 +964,5 @@ class Pool(Executor):
         for worker in self._workers:
             worker.abort()
         self._discard_pending_tasks()
+        self._close_history()
         self.logger.debug('Aborted pool {}'.format(self))
@@ -36,8 +36,10 @@ class ZMQTransport(object):
 
     :param address: Pool address to connect to.
     :type address: ``float``
-    :param recv_sleep: Sleep duration in msg receive loop.
+    :param recv_sleep: Max wait duration per poll in msg receive loop.
     :type recv_sleep: ``float``
+    :param recv_timeout: Timeout for a response to be received.
+    :type recv_timeout: ``int`` or ``float``
     """
 
     def __init__(self, address, recv_sleep=0.05, recv_timeout=5):
@@ -48,6 +50,8 @@ class ZMQTransport(object):
         self._context = zmq.Context()
         self._sock = self._context.socket(zmq.REQ)
         self._sock.connect("tcp://{}".format(address))
+        self._poller = zmq.Poller()
+        self._poller.register(self._sock, zmq.POLLIN)
         self.active = True
 
     def send(self, message):
@@ -61,14 +65,15 @@ class ZMQTransport(object):
 
     def receive(self):
         """
-        Worker receives the response to the message sent.
+        Worker receives the response to the message sent. Blocks on the
+        socket until the response arrives, the timeout or deactivation.
 
         :return: Response to the message sent.
         :type: :py:class:`~testplan.runners.pools.communication.Message`
         """
         start_time = time.time()
         while self.active:
-            try:
+            if self._poller.poll(self._recv_sleep * 1000):
                 received = self._sock.recv(flags=self._zmq.NOBLOCK)
                 try:
                     loaded = pickle.loads(received)
@@ -77,12 +82,10 @@ class ZMQTransport(object):
                     raise
                 else:
                     return loaded
-            except self._zmq.Again:
-                if time.time() - start_time > self._recv_timeout:
-                    print('Transport receive timeout {}s reached!'.format(
-                        self._recv_timeout))
-                    return None
-                time.sleep(self._recv_sleep)
+            if time.time() - start_time > self._recv_timeout:
+                print('Transport receive timeout {}s reached!'.format(
+                    self._recv_timeout))
+                return None
         return None
 
 
@@ -128,7 +131,8 @@ class ChildLoop(object):
         self._pool = self._pool_type(
             name='Pool_{}'.format(self._metadata['pid']),
             worker_type=self._worker_type, worker_heartbeat=0,
-            size=self._pool_size, runpath=self.runpath, path_cleanup=False)
+            size=self._pool_size, runpath=self.runpath, path_cleanup=False,
+            max_inflight_per_worker=pool_cfg.max_inflight_per_worker)
         self._pool.parent = self
         self._pool.cfg.parent = pool_cfg
         return self._pool
@@ -198,8 +202,12 @@ class ChildLoop(object):
                                 time.time() - hb_resp.data))
                     self._to_heartbeat = pool_cfg.worker_heartbeat
 
-                # Send back results
-                if self._pool.results:
+                # Send back results, batched until all local tasks are done
+                # or enough results are gathered.
+                if self._pool.results and (
+                        not self._pool.ongoing or
+                        len(self._pool.results) >=
+                        pool_cfg.max_inflight_per_worker):
                     task_results = []
                     for uid in list(self._pool.results.keys()):
                         task_results.append(self._pool.results[uid])
@@ -229,9 +237,11 @@ class ChildLoop(object):
                         # Reset workers request counters
                         for worker in self._pool._workers:
                             worker.requesting = 0
-                    elif received.cmd == Message.Ack:
-                        pass
-                time.sleep(pool_cfg.active_loop_sleep)
+                    # The pool holds the pull until it has tasks to send, an
+                    # Ack after its pull_timeout only lets heartbeats through.
+                else:
+                    # Local workers are busy, wait for their results.
+                    time.sleep(pool_cfg.active_loop_sleep)
         self.logger.info('Local pool {} stopped.'.format(self._pool))
 
 
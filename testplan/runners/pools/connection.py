@@ -1,47 +1,93 @@
-"""Connections module."""
-
-import pickle
-
-import zmq
-
-from .base import ConnectionManager
-
-
-class TCPConnectionManager(ConnectionManager):
-    """
-    Manages pool-worker TCP communication.
-    """
-
-    def __init__(self, cfg):
-        """TODO."""
-        self._context = zmq.Context()
-        self._sock = self._context.socket(zmq.REP)
-        if cfg.port == 0:
-            port_selected = self._sock.bind_to_random_port(
-                "tcp://{}".format(cfg.host))
-        else:
-            self._sock.bind("tcp://{}:{}".format(cfg.host, cfg.port))
-            port_selected = cfg.port
-        self._address = '{}:{}'.format(cfg.host, port_selected)
-
-    def register(self, worker):
-        """Register a new worker."""
-        worker.transport.connection = self._sock
-        worker.transport.address = self._address
-
-    def accept(self):
-        """
-        Accepts a new message from worker.
-
-        :return: Message received from worker transport.
-        :rtype: ``NoneType`` or
-            :py:class:`~testplan.runners.pools.communication.Message`
-        """
-        try:
-            return pickle.loads(self._sock.recv(flags=zmq.NOBLOCK))
-        except zmq.Again:
-            return None
-
-    def close(self):
-        """Closes TCP connections."""
-        self._sock.close()
+"""Connections module."""
+
+import pickle
+import threading
+
+import zmq
+
+from .base import ConnectionManager
+
+
+class TCPConnectionManager(ConnectionManager):
+    """
+    Manages pool-worker TCP communication. Responses are routed back to the
+    worker that sent the request, so the pool can hold a request of a worker
+    while it keeps serving the others.
+    """
+
+    def __init__(self, cfg):
+        """TODO."""
+        self._context = zmq.Context()
+        self._sock = self._context.socket(zmq.ROUTER)
+        if cfg.port == 0:
+            port_selected = self._sock.bind_to_random_port(
+                "tcp://{}".format(cfg.host))
+        else:
+            self._sock.bind("tcp://{}:{}".format(cfg.host, cfg.port))
+            port_selected = cfg.port
+        self._address = '{}:{}'.format(cfg.host, port_selected)
+        self._poller = zmq.Poller()
+        self._poller.register(self._sock, zmq.POLLIN)
+        # zmq sockets are not thread safe, a socket being polled by the pool
+        # thread is closed by that thread once the poll returns.
+        self._lock = threading.Lock()
+        self._accepting = False
+        self._closing = False
+        self._transports = {}
+
+    def register(self, worker):
+        """Register a new worker."""
+        worker.transport.connection = self._sock
+        worker.transport.address = self._address
+        self._transports[str(worker.cfg.index)] = worker.transport
+
+    def accept(self, timeout=None):
+        """
+        Accepts a new message from worker.
+
+        :param timeout: Seconds to block waiting for a message,
+            ``None`` to return immediately.
+        :type timeout: ``float`` or ``NoneType``
+        :return: Message received from worker transport.
+        :rtype: ``NoneType`` or
+            :py:class:`~testplan.runners.pools.communication.Message`
+        """
+        with self._lock:
+            if self._closing:
+                self._close_socket()
+                return None
+            self._accepting = True
+        try:
+            if timeout and not self._poller.poll(timeout * 1000):
+                return None
+            identity, _, data = self._sock.recv_multipart(flags=zmq.NOBLOCK)
+            message = pickle.loads(data)
+            transport = self._transports.get(
+                str(message.sender_metadata['index']))
+            if transport is not None:
+                transport.identity = identity
+            return message
+        except zmq.Again:
+            return None
+        finally:
+            with self._lock:
+                self._accepting = False
+                if self._closing:
+                    self._close_socket()
+
+    def wake(self):
+        """Pending accept returns within its timeout, nothing to wake."""
+
+    def _close_socket(self):
+        if not self._sock.closed:
+            self._sock.close()
+
+    def close(self):
+        """
+        Closes TCP connections. If the pool thread is waiting for a message,
+        the socket is closed by that thread when the wait returns.
+        """
+        with self._lock:
+            self._closing = True
+            if not self._accepting:
+                self._close_socket()
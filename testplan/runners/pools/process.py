@@ -31,6 +31,7 @@ class ProcessTransport(object):
     def __init__(self, recv_sleep=0.05):
         self.connection = None
         self.address = None
+        self.identity = None
 
     def respond(self, message):
         """
@@ -40,7 +41,8 @@ class ProcessTransport(object):
         :param message: Respond message.
         :type message: :py:class:`~testplan.runners.pools.communication.Message`
         """
-        self.connection.send(pickle.dumps(message))
+        self.connection.send_multipart(
+            [self.identity, b'', pickle.dumps(message)])
 
 
 class ProcessWorkerConfig(WorkerConfig):
@@ -75,6 +77,7 @@ class ProcessWorker(Worker):
     """
 
     CONFIG = ProcessWorkerConfig
+    IN_PROCESS = False
 
     def _proc_cmd(self):
         """Command to start child process."""
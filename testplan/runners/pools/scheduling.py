@@ -0,0 +1,232 @@
+"""Scheduling policies that select the next task a pool assigns to a worker."""
+
+import heapq
+from collections import OrderedDict
+
+
+class TaskQueue(object):
+    """
+    Unassigned task uids of a pool, in the order they were added. Appending,
+    removing and membership tests take constant time.
+
+    Each append is numbered so that schedulers can keep their own ordering
+    of the queue and find the uids added since they last looked at it.
+    """
+
+    def __init__(self):
+        self._uids = OrderedDict()
+        self._last = -1
+
+    def append(self, uid):
+        """Add a task uid at the end of the queue."""
+        self._uids.pop(uid, None)
+        self._last += 1
+        self._uids[uid] = self._last
+
+    def remove(self, uid):
+        """
+        Remove a task uid from the queue.
+
+        :raises ValueError: If the uid is not in the queue.
+        """
+        try:
+            del self._uids[uid]
+        except KeyError:
+            raise ValueError('{} is not in the queue.'.format(uid))
+
+    def first(self):
+        """
+        First task uid added that is still in the queue.
+
+        :raises IndexError: If the queue is empty.
+        """
+        for uid in self._uids:
+            return uid
+        raise IndexError('No unassigned tasks.')
+
+    def sequence(self, uid):
+        """
+        Number of the append that added the uid, ``None`` if it is not in
+        the queue.
+        """
+        return self._uids.get(uid)
+
+    @property
+    def last(self):
+        """Number of the latest append."""
+        return self._last
+
+    def added_after(self, sequence):
+        """
+        Uids still in the queue that were added after the given append
+        number, in the order they were added.
+
+        :param sequence: Append number.
+        :type sequence: ``int``
+        :rtype: ``list`` of ``str``
+        """
+        added = []
+        for uid in reversed(self._uids):
+            if self._uids[uid] <= sequence:
+                break
+            added.append(uid)
+        return added[::-1]
+
+    def __contains__(self, uid):
+        return uid in self._uids
+
+    def __iter__(self):
+        return iter(self._uids)
+
+    def __len__(self):
+        return len(self._uids)
+
+    def __repr__(self):
+        return '{}({})'.format(self.__class__.__name__, list(self._uids))
+
+
+class BaseScheduler(object):
+    """
+    Base class of pool scheduling policies. A scheduler selects which of the
+    pool unassigned tasks will be assigned next to a requesting worker.
+    """
+
+    def select(self, pool, uids):
+        """
+        Return the index of the task uid to be assigned next.
+
+        :param pool: Pool that assigns the task.
+        :type pool: :py:class:`~testplan.runners.pools.base.Pool`
+        :param uids: Unassigned task uids, in the order they were added.
+        :type uids: ``list`` of ``str``
+        :return: Index of selected uid.
+        :rtype: ``int``
+        """
+        raise NotImplementedError
+
+    def pop(self, pool):
+        """
+        Remove and return the next task uid from pool unassigned tasks.
+
+        :param pool: Pool that assigns the task.
+        :type pool: :py:class:`~testplan.runners.pools.base.Pool`
+        :return: Task uid.
+        :rtype: ``str``
+        :raises IndexError: If there are no unassigned tasks.
+        """
+        if not pool.unassigned:
+            raise IndexError('No unassigned tasks.')
+        uids = list(pool.unassigned)
+        uid = uids[self.select(pool, uids)]
+        pool.unassigned.remove(uid)
+        return uid
+
+    def update(self, pool, uids):
+        """
+        Notifies that the expected costs of the given tasks changed, because
+        a new duration was recorded to the pool history.
+
+        :param pool: Pool of the tasks.
+        :type pool: :py:class:`~testplan.runners.pools.base.Pool`
+        :param uids: Task uids.
+        :type uids: ``list`` of ``str``
+        """
+        pass
+
+
+class FIFOScheduler(BaseScheduler):
+    """Assigns tasks in the order they were added to the pool."""
+
+    def select(self, pool, uids):
+        return 0
+
+    def pop(self, pool):
+        uid = pool.unassigned.first()
+        pool.unassigned.remove(uid)
+        return uid
+
+
+class LongestFirstScheduler(BaseScheduler):
+    """
+    Longest processing time first policy, assigns the task with the highest
+    expected duration based on the pool duration history so that long tasks
+    do not become the tail of the run.
+
+    Tasks with no history are considered as long as the longest known task
+    of the pool, ties preserve the order tasks were added. With no history at
+    all this is equivalent to :py:class:`FIFOScheduler`.
+
+    Unassigned tasks are kept in heaps ordered by cost and by the order they
+    were added, entries of tasks assigned meanwhile or whose cost changed are
+    dropped when they reach the top.
+    """
+
+    def __init__(self):
+        self._known = []  # (-cost, sequence, uid) of unassigned tasks
+        self._unknown = []  # (sequence, uid) of unassigned tasks
+        self._costs = []  # (-cost, uid) of all pool tasks with known cost
+        self._synced = -1  # latest unassigned append pushed to the heaps
+
+    def _push(self, pool, uid):
+        sequence = pool.unassigned.sequence(uid)
+        cost = pool.task_cost(uid)
+        if cost is None:
+            heapq.heappush(self._unknown, (sequence, uid))
+        else:
+            heapq.heappush(self._known, (-cost, sequence, uid))
+            heapq.heappush(self._costs, (-cost, uid))
+
+    def _sync(self, pool):
+        if pool.unassigned.last != self._synced:
+            for uid in pool.unassigned.added_after(self._synced):
+                self._push(pool, uid)
+            self._synced = pool.unassigned.last
+
+    def _max_cost(self, pool):
+        """Highest known cost of the pool tasks, the unknown cost default."""
+        while self._costs:
+            cost, uid = self._costs[0]
+            if pool.task_cost(uid) == -cost:
+                return -cost
+            heapq.heappop(self._costs)
+        return None
+
+    def _top(self, pool, heap, valid):
+        while heap:
+            entry = heap[0]
+            uid = entry[-1]
+            if pool.unassigned.sequence(uid) == entry[-2] and valid(entry):
+                return entry
+            heapq.heappop(heap)
+        return None
+
+    def pop(self, pool):
+        self._sync(pool)
+        known = self._top(pool, self._known,
+                          lambda entry: pool.task_cost(entry[2]) == -entry[0])
+        unknown = self._top(pool, self._unknown,
+                            lambda entry: pool.task_cost(entry[1]) is None)
+        if known is None and unknown is None:
+            raise IndexError('No unassigned tasks.')
+
+        if unknown is None:
+            heap = self._known
+        elif known is None:
+            heap = self._unknown
+        else:
+            unknown_cost = self._max_cost(pool)
+            heap = self._unknown if (-unknown_cost, unknown[0]) < known[:2]\
+                else self._known
+        uid = heapq.heappop(heap)[-1]
+        pool.unassigned.remove(uid)
+        return uid
+
+    def update(self, pool, uids):
+        self._sync(pool)
+        for uid in uids:
+            if uid in pool.unassigned:
+                self._push(pool, uid)
+            else:
+                cost = pool.task_cost(uid)
+                if cost is not None:
+                    heapq.heappush(self._costs, (-cost, uid))
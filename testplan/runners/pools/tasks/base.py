@@ -20,6 +20,32 @@ class TaskDeserializationError(Exception):
     """Error on de-serializing task."""
 
 
+_PRIMITIVES = six.string_types + six.integer_types + (
+    float, bool, type(None))
+
+
+def _stable_repr(value):
+    """
+    Representation of a primitive value, or container of primitive values,
+    that does not change between runs. Returns ``None`` for other values.
+    """
+    if isinstance(value, _PRIMITIVES):
+        return repr(value)
+    if isinstance(value, (tuple, list)):
+        items = [_stable_repr(item) for item in value]
+        if None in items:
+            return None
+        return '({})'.format(', '.join(items))
+    if isinstance(value, dict):
+        items = [(_stable_repr(key), _stable_repr(val))
+                 for key, val in value.items()]
+        if any(key is None or val is None for key, val in items):
+            return None
+        return '{{{}}}'.format(
+            ', '.join('{}: {}'.format(key, val) for key, val in sorted(items)))
+    return None
+
+
 class Task(object):
     """
     Container of a target or path to a target that can be materialized into
@@ -68,10 +94,20 @@ class Task(object):
         self._kwargs = kwargs or dict()
         self._module = module
         self._uid = uid or str(uuid.uuid4())
+        self._materialized = None
 
     def __str__(self):
         return '{}[{}]'.format(self.__class__.__name__, self._uid)
 
+    def __getstate__(self):
+        # A cached target is not serialized, a task sent to another process is
+        # materialized again there.
+        return {attr: getattr(self, attr) for attr in self.all_attrs}
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._materialized = None
+
     @property
     def all_attrs(self):
         return ('_target', '_path', '_args',
@@ -93,6 +129,29 @@ class Task(object):
             name = self._target
         return 'Task[{}]'.format(name)
 
+    @property
+    def signature(self):
+        """
+        Task identifier derived from its target and arguments. Unlike
+        :py:meth:`uid` it is the same across runs for the same task. It is
+        ``None`` if the target is an object or any argument is not a
+        primitive value, as their representation may differ between runs.
+        """
+        target = self._target
+        if not isinstance(target, six.string_types):
+            name = getattr(target, '__name__', None)
+            module = getattr(target, '__module__', None)
+            if name is None or module is None or name == '<lambda>':
+                return None
+            target = '{}.{}'.format(module, name)
+        elif self._module:
+            target = '{}.{}'.format(self._module, target)
+        args = _stable_repr(tuple(self._args))
+        kwargs = _stable_repr(dict(self._kwargs))
+        if args is None or kwargs is None:
+            return None
+        return '{}({}, {})'.format(target, args, kwargs)
+
     @property
     def args(self):
         """Task target args."""
@@ -103,10 +162,25 @@ class Task(object):
         """Task target kwargs."""
         return self._kwargs
 
+    def cache(self, materialized):
+        """
+        Keep an already materialized target, i.e created by the test runner to
+        apply the test filters, so that the next :py:meth:`materialize` call
+        returns it instead of creating it again.
+
+        :param materialized: Materialized task target.
+        :type materialized: ``object``
+        """
+        self._materialized = materialized
+
     def materialize(self, target=None):
         """
         Create the actual task target executable/runnable/callable object.
+        A cached target is returned only once.
         """
+        if target is None and self._materialized is not None:
+            materialized, self._materialized = self._materialized, None
+            return materialized
         target = target or self._target
         if not isinstance(target, six.string_types):
             try:
@@ -185,12 +259,13 @@ class TaskResult(object):
     """
 
     def __init__(self, task=None, result=None, status=False, reason=None,
-                 follow=None):
+                 follow=None, duration=None):
         self._task = task
         self._result = result
         self._status = status
         self._reason = reason
         self._follow = follow
+        self._duration = duration
         self._uid = str(uuid.uuid4())
 
     def uid(self):
@@ -222,10 +297,15 @@ class TaskResult(object):
         """Follow up tasks that need to be scheduled next."""
         return self._follow
 
+    @property
+    def duration(self):
+        """Seconds the worker spent materializing and executing the task."""
+        return self._duration
+
     @property
     def all_attrs(self):
         return ('_task', '_status', '_reason',
-                '_result', '_follow', '_uid')
+                '_result', '_follow', '_duration', '_uid')
 
     def dumps(self, check_loadable=False):
         """Serialize a task result."""
@@ -5,7 +5,9 @@ import collections
 import functools
 import time
 
-from schema import Use, Or
+from multiprocessing.pool import ThreadPool
+
+from schema import Use, Or, And
 
 from testplan.common.config import ConfigOption, validate_func
 from testplan.common.entity import Resource, Runnable
@@ -20,7 +22,7 @@ from testplan.report.testing import Status
 from testplan.testing import tagging, filtering
 
 from .entries.base import Summary
-from .result import Result
+from .result import Result, CaptureMode
 from .suite import set_testsuite_testcases, propagate_tag_indices
 
 from ..base import Test, TestConfig
@@ -60,6 +62,57 @@ def iterable_suites(obj):
     return suites
 
 
+class _OrderedTestcaseReports(object):
+    """
+    Appends testcase reports to their testsuite report in the definition
+    order of the testcases, while testcase batches may complete out of order.
+    """
+
+    def __init__(self, testsuite, testcases, testsuite_report):
+        self._testsuite = testsuite
+        self._testsuite_report = testsuite_report
+        self._positions = {id(testcase): idx
+                           for idx, testcase in enumerate(testcases)}
+        self._next = 0
+        self._finished = {}
+        self._param_reports = {}
+
+    def add(self, testcases, testcase_reports):
+        """Adds the reports of a batch, appending the ones now in order."""
+        for testcase, testcase_report in zip(testcases, testcase_reports):
+            self._finished[self._positions[id(testcase)]] = (
+                testcase, testcase_report)
+        while self._next in self._finished:
+            self._append(*self._finished.pop(self._next))
+            self._next += 1
+
+    def flush(self):
+        """Appends all remaining reports, i.e when the suite stops early."""
+        for position in sorted(self._finished):
+            self._append(*self._finished.pop(position))
+
+    def _append(self, testcase, testcase_report):
+        param_template = getattr(testcase, '_parametrization_template', None)
+
+        if param_template:
+            if param_template not in self._param_reports:
+                param_method = getattr(self._testsuite, param_template)
+                param_report = TestGroupReport(
+                    name=param_template,
+                    description=param_method.__doc__,
+                    category=Categories.PARAMETRIZATION,
+                    tags=param_method.__tags__,
+                )
+                self._param_reports[param_template] = param_report
+                self._testsuite_report.append(param_report)
+
+            parent_report = self._param_reports[param_template]
+        else:
+            parent_report = self._testsuite_report
+
+        parent_report.append(testcase_report)
+
+
 class MultiTestConfig(TestConfig):
     """
     Configuration object for
@@ -78,11 +131,18 @@ class MultiTestConfig(TestConfig):
         return {
             'suites': Use(iterable_suites),
             ConfigOption('environment', default=[]): [Resource],
+            ConfigOption('parallel_start', default=False): bool,
             ConfigOption('before_start', default=None): start_stop_signature,
             ConfigOption('after_start', default=None): start_stop_signature,
             ConfigOption('before_stop', default=None): start_stop_signature,
             ConfigOption('after_stop', default=None): start_stop_signature,
-            ConfigOption('result', default=Result): is_subclass(Result)
+            ConfigOption('result', default=Result): is_subclass(Result),
+            ConfigOption('capture_mode', default=CaptureMode.FULL):
+                Or(CaptureMode.FULL, CaptureMode.OFF),
+            ConfigOption('thread_pool_size', default=0):
+                And(int, lambda size: size >= 0),
+            ConfigOption('parallel_suites', default=False): bool,
+            ConfigOption('shared_environment', default=False): bool
         }
 
 
@@ -103,6 +163,9 @@ class MultiTest(Test):
       :py:class:`drivers <testplan.tesitng.multitest.driver.base.Driver>` to
       be started and made available on tests execution.
     :type environment: ``list``
+    :param parallel_start: Start and stop the drivers concurrently, each
+      driver waits only for the drivers it depends on.
+    :type parallel_start: ``bool``
     :param before_start: Callable to execute before starting the environment.
     :type before_start: ``callable`` taking an environment argument.
     :param after_start: Callable to execute after starting the environment.
@@ -114,6 +177,26 @@ class MultiTest(Test):
     :param result: Result class definition for result object made available
       from within the testcases.
     :type result: :py:class:`~testplan.testing.multitest.result.Result`
+    :param capture_mode: How the file path and line number of assertions
+      are captured, ``'off'`` saves the caller frame lookup on each
+      assertion.
+    :type capture_mode: ``str``, one of
+      :py:class:`~testplan.testing.multitest.result.CaptureMode` values
+    :param thread_pool_size: Number of threads used to run testcases of the
+      same ``execution_group`` (and suites if ``parallel_suites`` is set)
+      concurrently against the shared environment, 0 to run sequentially.
+    :type thread_pool_size: ``int``
+    :param parallel_suites: Run suites concurrently when
+      ``thread_pool_size`` is set, the testcases of a suite still run in
+      order. Reports keep the suites order.
+    :type parallel_suites: ``bool``
+    :param shared_environment: When run by a pool worker, keep the
+      environment started after the tests and reuse it for the next
+      MultiTest the worker runs with the same driver classes, driver options
+      and initial context. Reused drivers are reset with their ``reset``
+      method instead of being restarted, and keep the runpath of the
+      MultiTest that started them.
+    :type shared_environment: ``bool``
 
     Also inherits all
     :py:class:`~testplan.testing.base.Test` options.
@@ -146,6 +229,9 @@ class MultiTest(Test):
                 propagate_tag_indices(suite, self.cfg.tags)
 
         self._pre_post_step_report = None
+        self._thread_pool = None
+        self._environment_key = None
+        self._environment_reused = False
 
     def _execute_step(self, step, *args, **kwargs):
         """
@@ -220,28 +306,102 @@ class MultiTest(Test):
     def run_tests(self):
         """Test execution loop."""
         ctx = self.test_context[:]
+        pool_size = self.cfg.thread_pool_size
+        self._thread_pool = ThreadPool(pool_size) if pool_size else None
 
-        with self.report.timer.record('run'):
-            while self.active:
-                if self.status.tag == Runnable.STATUS.RUNNING:
-                    try:
-                        next_suite, testcases = ctx.pop(0)
-                    except IndexError:
-                        style = self.get_stdout_style(self.report.passed)
-                        if style.display_test:
-                            log_multitest_status(self.report)
-                        break
-                    else:
-                        testsuite_report = TestGroupReport(
-                            name=next_suite.__class__.__name__,
-                            description=next_suite.__class__.__doc__,
-                            category=Categories.SUITE,
-                            tags=next_suite.__tags__,
-                        )
-                        self.report.append(testsuite_report)
-                        self._run_suite(next_suite, testcases, testsuite_report)
+        try:
+            with self.report.timer.record('run'):
+                if self._thread_pool and self.cfg.parallel_suites:
+                    self._run_suites_parallel(ctx)
+                else:
+                    self._run_suites(ctx)
+        finally:
+            if self._thread_pool:
+                self._thread_pool.close()
+                self._thread_pool.join()
+                self._thread_pool = None
+
+        style = self.get_stdout_style(self.report.passed)
+        if self.active and style.display_test:
+            log_multitest_status(self.report)
+
+    def _suite_report(self, testsuite):
+        """Creates the report of a testsuite object."""
+        return TestGroupReport(
+            name=testsuite.__class__.__name__,
+            description=testsuite.__class__.__doc__,
+            category=Categories.SUITE,
+            tags=testsuite.__tags__,
+        )
+
+    def _run_suites(self, ctx):
+        """Runs the suites one after the other."""
+        while self.active:
+            if self.status.tag == Runnable.STATUS.RUNNING:
+                try:
+                    next_suite, testcases = ctx.pop(0)
+                except IndexError:
+                    break
+                else:
+                    testsuite_report = self._suite_report(next_suite)
+                    self.report.append(testsuite_report)
+                    self._run_suite(next_suite, testcases, testsuite_report)
+            else:
                 time.sleep(self.cfg.active_loop_sleep)
 
+    def _run_suites_parallel(self, ctx):
+        """
+        Runs the suites in a separate thread pool, reports are appended
+        upfront so that they keep the test context order.
+        """
+        items = []
+        for testsuite, testcases in ctx:
+            testsuite_report = self._suite_report(testsuite)
+            self.report.append(testsuite_report)
+            items.append((testsuite, testcases, testsuite_report))
+
+        if not items:
+            return
+
+        suite_pool = ThreadPool(min(self.cfg.thread_pool_size, len(items)))
+        try:
+            suite_pool.map(lambda item: self._run_suite(*item), items)
+        finally:
+            suite_pool.close()
+            suite_pool.join()
+
+    def _testcase_batches(self, testcases):
+        """
+        Splits testcases into lists that can run concurrently. Testcases
+        without ``execution_group`` run one at a time first, then testcases
+        of each execution group run together, groups are ordered by their
+        first testcase. Without a thread pool all testcases run in order.
+        Reports keep the definition order of the testcases in both cases.
+        """
+        if not self._thread_pool:
+            return [[testcase] for testcase in testcases]
+
+        batches = []
+        groups = collections.OrderedDict()
+        for testcase in testcases:
+            group = getattr(testcase, 'execution_group', None)
+            if group is None:
+                batches.append([testcase])
+            else:
+                groups.setdefault(group, []).append(testcase)
+        return batches + list(groups.values())
+
+    def _run_testcases(self, testcases, pre_testcase, post_testcase):
+        """Runs a batch of testcases and returns reports in the same order."""
+        run_testcase = functools.partial(
+            self._run_testcase,
+            pre_testcase=pre_testcase,
+            post_testcase=post_testcase)
+
+        if len(testcases) > 1:
+            return self._thread_pool.map(run_testcase, testcases)
+        return [run_testcase(testcase) for testcase in testcases]
+
     def _run_suite(self, testsuite, testcases, testsuite_report):
         """Runs a testsuite object and populates its report object."""
         post_testcase = getattr(testsuite, 'post_testcase', None)
@@ -257,64 +417,53 @@ class MultiTest(Test):
                         testsuite, 'teardown', testsuite_report)
                 return
 
-            param_rep_lookup = {}
+            batches = self._testcase_batches(testcases)
+            reports = _OrderedTestcaseReports(
+                testsuite, testcases, testsuite_report)
 
             while self.active:
                 if self.status.tag == Runnable.STATUS.RUNNING:
                     try:
-                        testcase = testcases.pop(0)
+                        batch = batches.pop(0)
                     except IndexError:
                         with testsuite_report.logged_exceptions():
                             self._run_suite_related(testsuite, 'teardown',
                                                     testsuite_report)
                         break
-                    else:
-                        param_template = getattr(
-                            testcase, '_parametrization_template', None)
-
-                        if param_template:
-                            if param_template not in param_rep_lookup:
-                                param_method = getattr(testsuite,
-                                                       param_template)
-                                param_report = TestGroupReport(
-                                    name=param_template,
-                                    description=param_method.__doc__,
-                                    category=Categories.PARAMETRIZATION,
-                                    tags=param_method.__tags__,
-                                )
-                                param_rep_lookup[param_template] = param_report
-                                testsuite_report.append(param_report)
-
-                            parent_report = param_rep_lookup[param_template]
-                        else:
-                            parent_report = testsuite_report
-
-                        testcase_report = self._run_testcase(
-                            testcase=testcase,
-                            pre_testcase=pre_testcase,
-                            post_testcase=post_testcase
-                        )
-
-                        parent_report.append(testcase_report)
-                        # Break the suite execution if a testcase raised.
-                        if testcase_report.status == Status.ERROR:
-                            with testsuite_report.logged_exceptions():
-                                self._run_suite_related(testsuite, 'teardown',
-                                                        testsuite_report)
-                            break
 
-                time.sleep(self.cfg.active_loop_sleep)
+                    testcase_reports = self._run_testcases(
+                        batch, pre_testcase, post_testcase)
+                    reports.add(batch, testcase_reports)
+
+                    # Break the suite execution if a testcase raised.
+                    if any(testcase_report.status == Status.ERROR
+                           for testcase_report in testcase_reports):
+                        reports.flush()
+                        with testsuite_report.logged_exceptions():
+                            self._run_suite_related(testsuite, 'teardown',
+                                                    testsuite_report)
+                        break
+                else:
+                    time.sleep(self.cfg.active_loop_sleep)
+            reports.flush()
 
             if self.get_stdout_style(testsuite_report.passed).display_suite:
                 log_suite_status(testsuite_report)
 
+    def _new_result(self, **kwargs):
+        """
+        Creates a result object of the configured type. The capture mode is
+        set after creation, so that custom result types are not required to
+        accept it.
+        """
+        result = self.cfg.result(stdout_style=self.stdout_style, **kwargs)
+        result.capture_mode = self.cfg.capture_mode
+        return result
+
     def _run_testcase(self, testcase, pre_testcase, post_testcase):
         """Runs a testcase method and populates its report object."""
 
-        case_result = self.cfg.result(
-            stdout_style=self.stdout_style,
-            _scratch=self.scratch,
-        )
+        case_result = self._new_result(_scratch=self.scratch)
 
         testcase_report = TestCaseReport(
             name=testcase.__name__,
@@ -369,7 +518,7 @@ class MultiTest(Test):
         else:
             method_report = TestCaseReport(method)
             report.append(method_report)
-            case_result = self.cfg.result(stdout_style=self.stdout_style)
+            case_result = self._new_result()
             attr(self.resources, case_result)
             method_report.extend(case_result.serialized_entries)
 
@@ -388,10 +537,7 @@ class MultiTest(Test):
         """
         @functools.wraps(func)
         def _wrapper():
-            case_result = self.cfg.result(
-                stdout_style=self.stdout_style,
-                _scratch=self.scratch,
-            )
+            case_result = self._new_result(_scratch=self.scratch)
 
             testcase_report = TestCaseReport(
                 name='{} - {}'.format(label, func.__name__),
@@ -414,9 +560,63 @@ class MultiTest(Test):
             self.pre_post_step_report.append(testcase_report)
         return _wrapper
 
+    def _shares_environment(self):
+        """
+        True if the environment is shared with other MultiTests, the parent
+        needs to be a pool worker keeping environments between tasks.
+        """
+        return bool(self.cfg.shared_environment and
+                    hasattr(self.parent, 'acquire_environment'))
+
+    def _run_batch_steps(self):
+        """
+        Same as the base class, but the environment is reused from or left
+        to the parent worker if ``shared_environment`` is set.
+        """
+        if not self._shares_environment():
+            return super(MultiTest, self)._run_batch_steps()
+
+        # Swap to the warm environment upfront, so that all the steps use
+        # the environment actually running.
+        self._environment_key = self.resources.config_key()
+        environment = self.parent.acquire_environment(self._environment_key)
+        self._environment_reused = environment is not None
+        if environment is not None:
+            self.logger.debug('{} reuses environment {}'.format(
+                self, self._environment_key))
+            environment.parent = self
+            self._environment = environment
+
+        self.pre_resource_steps()
+        self._add_step(self.start_shared_environment)
+        self.main_batch_steps()
+        self._add_step(self.release_shared_environment)
+        self.post_resource_steps()
+        self._run()
+
+    def start_shared_environment(self):
+        """Resets the reused environment or starts a new one."""
+        if self._environment_reused:
+            self.resources.reset()
+        else:
+            self.resources.start()
+
+    def release_shared_environment(self):
+        """
+        Leaves the environment to the parent worker for the next MultiTest,
+        or stops it if it failed to start or reset.
+        """
+        if self.resources.start_exceptions:
+            self.resources.stop(reversed=True)
+        else:
+            self.parent.release_environment(
+                self._environment_key, self.resources)
+
     def skip_step(self, step):
         """Step should be skipped."""
-        if step in (self.resources.start, self.resources.stop):
+        if step in (self.resources.start, self.resources.stop,
+                    self.start_shared_environment,
+                    self.release_shared_environment):
             return False
         elif self.resources.start_exceptions or self.resources.stop_exceptions:
             TESTPLAN_LOGGER.critical('Skipping step %s', step.__name__)
@@ -426,9 +626,9 @@ class MultiTest(Test):
     def post_step_call(self, step):
         """Callable to be executed after each step."""
         exceptions = None
-        if step == self.resources.start:
+        if step in (self.resources.start, self.start_shared_environment):
             exceptions = self.resources.start_exceptions
-        elif step == self.resources.stop:
+        elif step in (self.resources.stop, self.release_shared_environment):
             exceptions = self.resources.stop_exceptions
         if exceptions:
             for msg in exceptions.values():
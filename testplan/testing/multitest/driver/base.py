@@ -3,11 +3,12 @@
 import os
 import logging
 
+import six
 from schema import Or
 
 from testplan.common.config import ConfigOption
 from testplan.common.entity import Resource, ResourceConfig, FailedAction
-from testplan.common.utils.match import match_regexps_in_file
+from testplan.common.utils.match import LogWatcher, FileEventWaiter
 from testplan.common.utils.path import instantiate
 from testplan.common.utils.timing import wait
 
@@ -62,7 +63,8 @@ class DriverConfig(ResourceConfig):
                 Or(None, list),
             ConfigOption('stderr_regexps', default=None):
                 Or(None, list),
-            ConfigOption('async_start', default=False): bool
+            ConfigOption('async_start', default=False): bool,
+            ConfigOption('log_inotify', default=False): bool
         }
 
 
@@ -96,6 +98,10 @@ class Driver(Resource):
     :type stderr_regexps: ``list`` of ``_sre.SRE_Pattern``
     :param async_start: Enable driver asynchronous start within an environment.
     :type async_start: ``bool``
+    :param log_inotify: Wake up on inotify events for the files matched by
+      the regexps when waiting for the driver to start, instead of polling.
+      Falls back to polling where inotify is not available.
+    :type log_inotify: ``bool``
 
     Also inherits all
     :py:class:`~testplan.common.entity.base.Resource` options.
@@ -103,10 +109,18 @@ class Driver(Resource):
 
     CONFIG = DriverConfig
 
+    # Sleep interval between regexp checks while starting.
+    LOG_POLL_INTERVAL = 0.05
+    # Maximum wait for an inotify event between regexp checks.
+    LOG_INOTIFY_INTERVAL = 0.5
+
     def __init__(self, **options):
         super(Driver, self).__init__(**options)
         self.extracts = {}
         self.file_logger = None
+        self._log_watchers = {}
+        self._event_loop = None
+        self._event_loop_owner = None
 
     @property
     def name(self):
@@ -117,6 +131,39 @@ class Driver(Resource):
         """Driver uid."""
         return self.cfg.name
 
+    @property
+    def event_loop(self):
+        """
+        Event loop thread registered with :py:meth:`acquire_event_loop`, or
+        ``None``.
+        """
+        return self._event_loop
+
+    def acquire_event_loop(self):
+        """
+        Register with the asyncio event loop thread shared by the drivers of
+        the environment, so that their connections are served by a single
+        thread. Requires Python 3.
+
+        :return: Running event loop thread.
+        :rtype: :py:class:`~testplan.common.utils.sockets.aio.EventLoopThread`
+        """
+        if self._event_loop is None:
+            if not six.PY3:
+                raise RuntimeError('Event loop requires Python 3.')
+            from testplan.common.utils.sockets.aio import EventLoopThread
+            self._event_loop_owner = \
+                self.context if self.context is not None else self
+            self._event_loop = EventLoopThread.acquire(self._event_loop_owner)
+        return self._event_loop
+
+    def release_event_loop(self):
+        """Unregister from the shared event loop thread."""
+        if self._event_loop is not None:
+            self._event_loop.release(self._event_loop_owner)
+            self._event_loop = None
+            self._event_loop_owner = None
+
     def pre_start(self):
         """Callable to be executed right before driver starts."""
 
@@ -125,8 +172,27 @@ class Driver(Resource):
 
     def started_check(self, timeout=None):
         """Driver started status condition check."""
-        wait(lambda: self.extract_values(), self.cfg.timeout,
-             raise_on_timeout=True)
+        if not self.cfg.log_inotify:
+            wait(lambda: self.extract_values(), self.cfg.timeout,
+                 interval=self.LOG_POLL_INTERVAL, raise_on_timeout=True)
+            return
+
+        waiter = FileEventWaiter(
+            [watcher.logpath for watcher in self._regex_watchers()])
+        checked = []
+
+        def check():
+            # Block on file events between checks, not before the first one.
+            if checked:
+                waiter.wait(self.LOG_INOTIFY_INTERVAL if waiter.active
+                            else self.LOG_POLL_INTERVAL)
+            checked.append(True)
+            return self.extract_values()
+
+        try:
+            wait(check, self.cfg.timeout, interval=0, raise_on_timeout=True)
+        finally:
+            waiter.close()
 
     def pre_stop(self):
         """Callable to be executed right before driver stops."""
@@ -139,6 +205,7 @@ class Driver(Resource):
 
     def starting(self):
         """Trigger driver start."""
+        self._log_watchers = {}
         self.make_runpath_dirs()
         self.pre_start()
 
@@ -175,8 +242,30 @@ class Driver(Resource):
         """Path for stderr file regex matching."""
         return None
 
+    def _log_watcher(self, path, regexps):
+        """
+        Watcher of the file at the path, that keeps the position reached
+        and the regexps matched so far until the driver starts again.
+        """
+        key = (path, id(regexps))
+        if key not in self._log_watchers:
+            self._log_watchers[key] = LogWatcher(path, regexps)
+        return self._log_watchers[key]
+
+    def _regex_watchers(self):
+        """Log, stdout and stderr watchers for the configured regexps."""
+        sources = ((self.logpath, self.cfg.log_regexps),
+                   (self.outpath, self.cfg.stdout_regexps),
+                   (self.errpath, self.cfg.stderr_regexps))
+        return [self._log_watcher(path, regexps)
+                for path, regexps in sources if path and regexps]
+
     def extract_values(self):
-        """Extract matching values from input regex configuration options."""
+        """
+        Extract matching values from input regex configuration options.
+        Only the lines appended to the files since the previous call are
+        matched, against the regexps that have not matched yet.
+        """
         log_unmatched = []
         stdout_unmatched = []
         stderr_unmatched = []
@@ -194,13 +283,10 @@ class Driver(Resource):
                 (self.errpath, self.cfg.stderr_regexps, stderr_unmatched))
 
         for outfile, regexps, unmatched in regex_sources:
-            file_result, file_extracts, file_unmatched = match_regexps_in_file(
-                logpath=outfile,
-                log_extracts=regexps,
-                return_unmatched=True
-            )
-            unmatched.extend(file_unmatched)
-            self.extracts.update(file_extracts)
+            watcher = self._log_watcher(outfile, regexps)
+            file_result = watcher.update()
+            unmatched.extend(watcher.unmatched)
+            self.extracts.update(watcher.extracted_values)
             result = result and file_result
 
         if log_unmatched or stdout_unmatched or stderr_unmatched:
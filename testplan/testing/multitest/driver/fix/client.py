@@ -221,6 +221,18 @@ class FixClient(Driver):
         """
         return self._client.send(msg)
 
+    def send_many(self, msgs):
+        """
+        Send messages with a single write.
+
+        :param msgs: Messages to be sent.
+        :type msgs: ``list`` of ``FixMessage``
+
+        :return: msgs
+        :rtype: ``list`` of ``FixMessage``
+        """
+        return self._client.send_many(msgs)[1]
+
     def receive(self, timeout=None):
         """
         Receive message.
@@ -245,6 +257,32 @@ class FixClient(Driver):
         self.file_logger.debug('Received msg {}.'.format(received))
         return received
 
+    def receive_many(self, count, timeout=None):
+        """
+        Receive up to ``count`` messages. Unlike :py:meth:`receive`, no
+        exception is raised on timeout and the messages received so far are
+        returned.
+
+        :param count: Number of messages to receive.
+        :type count: ``int``
+        :param timeout: Timeout in seconds, ``None`` for the
+          ``receive_timeout`` option, 0 to only return the messages already
+          received.
+        :type timeout: ``int``
+
+        :return: received ``FixMessage`` objects, fewer than ``count`` if
+          timed out.
+        :rtype: ``list`` of ``FixMessage``
+        """
+        timeout = timeout if timeout is not None else self.cfg.receive_timeout
+        received = self._client.receive_many(count, timeout=timeout)
+        if len(received) < count:
+            self.logger.debug(
+                'Received {} of {} messages in {} seconds.'.format(
+                    len(received), count, timeout))
+        self.file_logger.debug('Received {} msgs.'.format(len(received)))
+        return received
+
     def flush(self, timeout=0):
         """
         Flush all inbound messages.
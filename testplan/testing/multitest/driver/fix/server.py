@@ -4,7 +4,7 @@ import os
 
 from six.moves import queue as Queue
 
-from schema import Use
+from schema import Or, Use
 
 from testplan.common.config import ConfigOption
 from testplan.common.utils.strings import slugify
@@ -31,7 +31,8 @@ class FixServerConfig(DriverConfig):
             'codec': object,
             ConfigOption('host', default='localhost'): str,
             ConfigOption('port', default=0): Use(int),
-            ConfigOption('version', default='FIX.4.2'): str
+            ConfigOption('version', default='FIX.4.2'): str,
+            ConfigOption('receive_timeout', default=60): Or(int, float)
         }
 
 
@@ -58,6 +59,9 @@ class FixServer(Driver):
     :param version: FIX version, defaults to "FIX.4.2". This string is used
       as the contents of tag 8 (BeginString).
     :type version: ``str``
+    :param receive_timeout: Default timeout of :py:meth:`receive_many`.
+      Default: 60
+    :type receive_timeout: ``int`` or ``float``
 
     Also inherits all
     :py:class:`~testplan.testing.multitest.driver.base.Driver`` options.
@@ -120,6 +124,13 @@ class FixServer(Driver):
         return self._server.send(msg, conn_name)
     send.__doc__ = Server.send.__doc__
 
+    def send_many(self, msgs, conn_name=(None, None)):
+        """
+        Docstring from Server.send_many
+        """
+        return self._server.send_many(msgs, conn_name)
+    send_many.__doc__ = Server.send_many.__doc__
+
     def receive(self, conn_name=(None, None), timeout=60):
         """
         Receive a FIX message from the given connection.
@@ -163,6 +174,38 @@ class FixServer(Driver):
             conn_name, received))
         return received
 
+    def receive_many(self, count, conn_name=(None, None), timeout=None):
+        """
+        Receive up to ``count`` FIX messages from the given connection.
+
+        Messages are taken from the receive queue in a single batch. Unlike
+        :py:meth:`receive`, no exception is raised on timeout and the messages
+        received so far are returned.
+
+        :param count: Number of messages to receive.
+        :type count: ``int``
+        :param conn_name:  Connection name (sender and target ids) to receive
+          messages from.
+        :type conn_name: ``tuple`` of ``str`` and ``str``
+        :param timeout: Timeout in seconds, ``None`` for the
+          ``receive_timeout`` option, 0 to only return the messages already
+          received.
+        :type timeout: ``int``
+
+        :return: received FixMessage objects, fewer than ``count`` if timed
+          out.
+        :rtype: ``list`` of ``FixMessage``
+        """
+        timeout = timeout if timeout is not None else self.cfg.receive_timeout
+        received = self._server.receive_many(count, conn_name, timeout=timeout)
+        if len(received) < count:
+            self.logger.debug(
+                'Received {} of {} messages in {} seconds.'.format(
+                    len(received), count, timeout))
+        self.file_logger.debug('Received from connection {} {} msgs'.format(
+            conn_name, len(received)))
+        return received
+
     def flush(self):
         """
         Flush the receive queues
@@ -28,7 +28,8 @@ class TCPClientConfig(DriverConfig):
                        lambda x: is_context(x)),
             'port': Or(Use(int), lambda x: is_context(x)),
             ConfigOption('interface', default=None): tuple,
-            ConfigOption('connect_at_start', default=True): bool
+            ConfigOption('connect_at_start', default=True): bool,
+            ConfigOption('event_loop', default=False): bool
         }
 
 
@@ -52,6 +53,11 @@ class TCPClient(Driver):
     :type interface: ``tuple``(``str, ``int``)
     :param connect_at_start: Connect to server on start. Default: True
     :type connect_at_start: ``bool``
+    :param event_loop: Run the connection on the event loop thread shared
+      by the drivers of the environment. The coroutines of
+      :py:attr:`async_client` can then be awaited on ``event_loop``.
+      Requires Python 3. Default: False
+    :type event_loop: ``bool``
 
     Also inherits all
     :py:class:`~testplan.testing.multitest.driver.base.Driver`` options.
@@ -75,6 +81,14 @@ class TCPClient(Driver):
         """Client port number assigned."""
         return self._port
 
+    @property
+    def async_client(self):
+        """
+        :py:class:`~testplan.common.utils.sockets.aio.AsyncClient` of the
+        driver when the ``event_loop`` option is set, or ``None``.
+        """
+        return self._client.obj if self.event_loop else None
+
     def connect(self):
         """
         Connect client.
@@ -114,6 +128,18 @@ class TCPClient(Driver):
         """
         return self._client.send(msg)
 
+    def send_frame(self, msg):
+        """
+        Sends bytes prefixed by their length.
+
+        :param msg: Message to be sent
+        :type msg: ``bytes``
+
+        :return: Number of bytes sent, including the length header
+        :rtype: ``int``
+        """
+        return self._client.send_frame(msg)[1]
+
     def receive_text(self, standard='utf-8', **kwargs):
         """
         Calls
@@ -122,12 +148,31 @@ class TCPClient(Driver):
         """
         return self.receive(**kwargs).decode(standard)
 
-    def receive(self, size=1024, timeout=30):
+    def receive(self, size=1024, timeout=30, wait_full_size=False):
         """Receive bytes from the given connection."""
+        return self._receive(self._client.receive, timeout,
+                             size=size, wait_full_size=wait_full_size)
+
+    def receive_until(self, delimiter, timeout=30, max_size=None):
+        """
+        Receive bytes terminated by the given delimiter, the delimiter is not
+        returned.
+        """
+        return self._receive(self._client.receive_until, timeout,
+                             delimiter=delimiter, max_size=max_size)
+
+    def receive_frame(self, timeout=30):
+        """
+        Receive bytes prefixed by their length, as sent by
+        :py:meth:`TCPServer.send_frame <testplan.testing.multitest.driver.tcp.server.TCPServer.send_frame>`.
+        """
+        return self._receive(self._client.receive_frame, timeout)
+
+    def _receive(self, method, timeout, **kwargs):
         received = None
         timeout_info = TimeoutExceptionInfo()
         try:
-            received = self._client.receive(size, timeout=timeout or 0)
+            received = method(timeout=timeout or 0, **kwargs)
         except socket.timeout:
             if timeout is not None:
                 raise TimeoutException(
@@ -145,17 +190,30 @@ class TCPClient(Driver):
         super(TCPClient, self).starting()
         server_host = expand(self.cfg.host, self.context)
         server_port = expand(self.cfg.port, self.context, int)
-        self._client = Client(host=server_host, port=server_port)
+        if self.cfg.event_loop:
+            event_loop = self.acquire_event_loop()
+            # Only imported when used, as it requires Python 3.
+            from testplan.common.utils.sockets.aio import AsyncClient, Blocking
+            self._client = Blocking(
+                AsyncClient(host=server_host, port=server_port),
+                event_loop)
+        else:
+            self._client = Client(host=server_host, port=server_port)
         if self.cfg.connect_at_start:
             self.connect()
 
+    def _stop_logic(self):
+        if self._client:
+            self._client.close()
+        if self.event_loop:
+            self._client = None
+            self.release_event_loop()
+
     def stopping(self):
         """Close the client connection."""
         super(TCPClient, self).stopping()
-        if self._client:
-            self._client.close()
+        self._stop_logic()
 
     def aborting(self):
         """Abort logic that stops the client."""
-        if self._client:
-            self._client.close()
+        self._stop_logic()
@@ -24,7 +24,8 @@ class TCPServerConfig(DriverConfig):
         """
         return {
             ConfigOption('host', default='localhost'): str,
-            ConfigOption('port', default=0): Use(int)
+            ConfigOption('port', default=0): Use(int),
+            ConfigOption('event_loop', default=False): bool
         }
 
 
@@ -41,6 +42,11 @@ class TCPServer(Driver):
     :type host: ``str``
     :param port: Port number to bind to. Default: 0 (Random port)
     :type port: ``int``
+    :param event_loop: Serve connections on the event loop thread shared by
+      the drivers of the environment, instead of a dedicated thread. The
+      coroutines of :py:attr:`async_server` can then be awaited on
+      ``event_loop``. Requires Python 3. Default: False
+    :type event_loop: ``bool``
 
     Also inherits all
     :py:class:`~testplan.testing.multitest.driver.base.Driver`` options.
@@ -71,6 +77,14 @@ class TCPServer(Driver):
         """
         return self._server.socket
 
+    @property
+    def async_server(self):
+        """
+        :py:class:`~testplan.common.utils.sockets.aio.AsyncServer` of the
+        driver when the ``event_loop`` option is set, or ``None``.
+        """
+        return self._server.obj if self.event_loop else None
+
     def accept_connection(self, timeout=10):
         """Doc from Server."""
         return self._server.accept_connection(timeout=timeout)
@@ -88,6 +102,12 @@ class TCPServer(Driver):
         return self._server.send(msg=msg, conn_idx=conn_idx, timeout=timeout)
     send.__doc__ = Server.send.__doc__
 
+    def send_frame(self, msg, conn_idx=None, timeout=30):
+        """Doc from Server."""
+        return self._server.send_frame(
+            msg=msg, conn_idx=conn_idx, timeout=timeout)
+    send_frame.__doc__ = Server.send_frame.__doc__
+
     def receive_text(self, standard='utf-8', **kwargs):
         """
         Calls
@@ -98,19 +118,38 @@ class TCPServer(Driver):
 
     def receive(self, size=None, conn_idx=None, timeout=30):
         """Receive bytes from the given connection."""
+        if size is None:
+            return self._receive(self._server.receive, timeout,
+                                 size=1024, conn_idx=conn_idx,
+                                 wait_full_size=False)
+        return self._receive(self._server.receive, timeout,
+                             size=size, conn_idx=conn_idx,
+                             wait_full_size=True)
+
+    def receive_until(self, delimiter, conn_idx=None, timeout=30,
+                      max_size=None):
+        """
+        Receive bytes terminated by the given delimiter from the given
+        connection, the delimiter is not returned.
+        """
+        return self._receive(self._server.receive_until, timeout,
+                             delimiter=delimiter, conn_idx=conn_idx,
+                             max_size=max_size)
+
+    def receive_frame(self, conn_idx=None, timeout=30):
+        """
+        Receive bytes prefixed by their length from the given connection,
+        as sent by
+        :py:meth:`TCPClient.send_frame <testplan.testing.multitest.driver.tcp.client.TCPClient.send_frame>`.
+        """
+        return self._receive(self._server.receive_frame, timeout,
+                             conn_idx=conn_idx)
+
+    def _receive(self, method, timeout, **kwargs):
         received = None
         timeout_info = TimeoutExceptionInfo()
         try:
-            receive_kwargs = dict(conn_idx=conn_idx,
-                                  timeout=timeout or 0)
-            if size is None:
-                receive_kwargs['size'] = 1024
-                receive_kwargs['wait_full_size'] = False
-            else:
-                receive_kwargs['size'] = size
-                receive_kwargs['wait_full_size'] = True
-
-            received = self._server.receive(**receive_kwargs)
+            received = method(timeout=timeout or 0, **kwargs)
         except socket.timeout:
             if timeout is not None:
                 raise TimeoutException(
@@ -121,15 +160,27 @@ class TCPServer(Driver):
     def starting(self):
         """Starts the TCP server."""
         super(TCPServer, self).starting()
-        self._server = Server(host=self.cfg.host, port=self.cfg.port)
-        self._server.bind()
-        self._server.serve()
+        if self.cfg.event_loop:
+            event_loop = self.acquire_event_loop()
+            # Only imported when used, as it requires Python 3.
+            from testplan.common.utils.sockets.aio import AsyncServer, Blocking
+            self._server = Blocking(
+                AsyncServer(host=self.cfg.host, port=self.cfg.port),
+                event_loop)
+            self._server.start()
+        else:
+            self._server = Server(host=self.cfg.host, port=self.cfg.port)
+            self._server.bind()
+            self._server.serve()
         self._host = self.cfg.host
         self._port = self._server.port
 
     def _stop_logic(self):
         if self._server:
             self._server.close()
+        if self.event_loop:
+            self._server = None
+            self.release_event_loop()
 
     def stopping(self):
         """Stops the TCP server."""
@@ -6,9 +6,9 @@ import zmq
 from testplan.common.config import ConfigOption as Optional
 from testplan.common.utils.context import ContextValue, expand
 from testplan.common.utils.convert import make_iterables
-from testplan.common.utils.timing import retry_until_timeout
 
 from ..base import Driver, DriverConfig
+from . import utils
 
 
 class ZMQClientConfig(DriverConfig):
@@ -108,38 +108,91 @@ class ZMQClient(Driver):
         self.disconnect()
         self.connect()
 
-    def send(self, data, timeout=30):
+    def send(self, data, timeout=30, copy=True):
         """
-        Try to send the message until it either sends or hits timeout.
+        Send the message as soon as the socket is ready to send it, or raise
+        a ``TimeoutException`` after timeout.
 
         :param data: The content of the message.
         :type data: ``bytes`` or ``zmq.sugar.frame.Frame`` or ``memoryview``
-        :param timeout: Timeout to retry sending the message.
+        :param timeout: Timeout to wait for the socket to be ready to send.
         :type timeout: ``int``
+        :param copy: Copy the message, or send it without copying.
+        :type copy: ``bool``
+        """
+        return utils.send(self._socket, data, timeout, self.cfg.name,
+                          copy=copy)
+
+    def send_multipart(self, msg_parts, timeout=30, copy=True):
+        """
+        Send a multipart message as soon as the socket is ready to send it,
+        or raise a ``TimeoutException`` after timeout.
 
-        :return: ``None``
-        :rtype: ``NoneType``
+        :param msg_parts: The frames of the message.
+        :type msg_parts: ``list`` of ``bytes`` or ``zmq.sugar.frame.Frame``
+        :param timeout: Timeout to wait for the socket to be ready to send.
+        :type timeout: ``int``
+        :param copy: Copy the message frames, or send them without copying.
+        :type copy: ``bool``
         """
-        return retry_until_timeout(exception=zmq.ZMQError,
-                                   item=self._socket.send,
-                                   kwargs={'data': data, 'flags': zmq.NOBLOCK},
-                                   timeout=timeout, raise_on_timeout=True)
+        return utils.send_multipart(self._socket, msg_parts, timeout,
+                                    self.cfg.name, copy=copy)
 
-    def receive(self, timeout=30):
+    def receive(self, timeout=30, copy=True):
         """
-        Try to receive the message until it has either been received or
-        hits timeout.
+        Receive a message as soon as it arrives, or raise a
+        ``TimeoutException`` after timeout.
 
-        :param timeout: Timeout to retry receiving the message.
+        :param timeout: Timeout to wait for the message.
         :type timeout: ``int``
+        :param copy: Return the message as ``bytes``, otherwise as a
+          ``zmq.sugar.frame.Frame`` which references the received buffer
+          without copying it.
+        :type copy: ``bool``
 
         :return: The received message.
-        :rtype: ``bytes`` or ``zmq.sugar.frame.Frame`` or ``memoryview``
+        :rtype: ``bytes`` or ``zmq.sugar.frame.Frame``
+        """
+        return utils.receive(self._socket, timeout, self.cfg.name,
+                             copy=copy)
+
+    def receive_multipart(self, timeout=30, copy=True):
+        """
+        Receive a multipart message as soon as it arrives, or raise a
+        ``TimeoutException`` after timeout.
+
+        :param timeout: Timeout to wait for the message.
+        :type timeout: ``int``
+        :param copy: Return the frames as ``bytes`` or as
+          ``zmq.sugar.frame.Frame`` objects.
+        :type copy: ``bool``
+
+        :return: The frames of the received message.
+        :rtype: ``list`` of ``bytes`` or ``zmq.sugar.frame.Frame``
+        """
+        return utils.receive(self._socket, timeout, self.cfg.name,
+                             multipart=True, copy=copy)
+
+    def receive_many(self, count, timeout=30, multipart=False, copy=True):
+        """
+        Receive up to ``count`` messages. Messages already queued are
+        drained without waiting, and no exception is raised on timeout.
+
+        :param count: Number of messages to receive.
+        :type count: ``int``
+        :param timeout: Timeout to wait for the messages.
+        :type timeout: ``int``
+        :param multipart: Receive multipart messages as lists of frames.
+        :type multipart: ``bool``
+        :param copy: Return messages as ``bytes`` or as
+          ``zmq.sugar.frame.Frame`` objects.
+        :type copy: ``bool``
+
+        :return: The received messages, fewer than ``count`` if timed out.
+        :rtype: ``list``
         """
-        return retry_until_timeout(exception=zmq.ZMQError,
-                                   item=self._socket.recv,
-                                   kwargs={'flags': zmq.NOBLOCK},
-                                   timeout=timeout, raise_on_timeout=True)
+        return utils.receive_many(self._socket, count, timeout,
+                                  multipart=multipart, copy=copy)
 
     def subscribe(self, topic_filter):
         """
@@ -0,0 +1,82 @@
+"""Send and receive helpers for ZMQ driver sockets."""
+
+import math
+import time
+
+import zmq
+
+from testplan.common.utils.timing import (TimeoutException,
+                                          TimeoutExceptionInfo)
+
+
+def _wait(socket, event, end_time):
+    """
+    Wait until the socket is ready for the given event, returns False if the
+    end time is reached first. An end time of ``None`` waits forever.
+    """
+    if end_time is None:
+        return bool(socket.poll(None, event))
+    remaining = max(0, end_time - time.time())
+    return bool(socket.poll(int(math.ceil(remaining * 1000)), event))
+
+
+def _call(socket, event, method, timeout, name, action):
+    """
+    Call a non blocking socket method as soon as the socket is ready for the
+    event, instead of retrying it after a sleep.
+    """
+    timeout_info = TimeoutExceptionInfo()
+    end_time = None if timeout is None else timeout_info.started + timeout
+    while _wait(socket, event, end_time):
+        try:
+            return method()
+        except zmq.Again:
+            continue
+    raise TimeoutException('Timed out waiting to {0} on {1}. {2}'.format(
+        action, name, timeout_info.msg()))
+
+
+def send(socket, data, timeout, name, copy=True):
+    """Send a message when the socket is ready, see ZMQ drivers ``send``."""
+    return _call(
+        socket, zmq.POLLOUT,
+        lambda: socket.send(data, flags=zmq.NOBLOCK, copy=copy),
+        timeout, name, 'send message')
+
+
+def send_multipart(socket, msg_parts, timeout, name, copy=True):
+    """Send a multipart message when the socket is ready."""
+    return _call(
+        socket, zmq.POLLOUT,
+        lambda: socket.send_multipart(
+            msg_parts, flags=zmq.NOBLOCK, copy=copy),
+        timeout, name, 'send message')
+
+
+def _recv(socket, multipart, copy):
+    if multipart:
+        return lambda: socket.recv_multipart(flags=zmq.NOBLOCK, copy=copy)
+    return lambda: socket.recv(flags=zmq.NOBLOCK, copy=copy)
+
+
+def receive(socket, timeout, name, multipart=False, copy=True):
+    """Receive a message as soon as it arrives, see ZMQ drivers ``receive``."""
+    return _call(socket, zmq.POLLIN, _recv(socket, multipart, copy),
+                 timeout, name, 'receive message')
+
+
+def receive_many(socket, count, timeout, multipart=False, copy=True):
+    """
+    Receive up to ``count`` messages, draining the messages already queued
+    without waiting and waiting for the rest until timeout.
+    """
+    recv = _recv(socket, multipart, copy)
+    end_time = None if timeout is None else time.time() + timeout
+    received = []
+    while len(received) < count:
+        try:
+            received.append(recv())
+        except zmq.Again:
+            if not _wait(socket, zmq.POLLIN, end_time):
+                break
+    return received
@@ -1082,10 +1082,13 @@ class DictMatchAll(Assertion):
     def __init__(
         self, values, comparisons,
         key_weightings=None, description=None, category=None,
+        key_index=None, processes=None,
     ):
         self.comparisons = comparisons
         self.values = values
         self.key_weightings = key_weightings
+        self.key_index = key_index
+        self.processes = processes
 
         self.matches = None
         self.result = None  # will be set by evaluate
@@ -1099,6 +1102,8 @@ class DictMatchAll(Assertion):
             values=self.values,
             key_weightings=self.key_weightings,
             description=self.description,
+            key_index=self.key_index,
+            processes=self.processes,
         )
 
         for match in self.matches:
@@ -1115,6 +1120,7 @@ class FixMatchAll(DictMatchAll):
     def __init__(
         self, values, comparisons,
         tag_weightings=None, description=None, category=None,
+        tag_index=None, processes=None,
     ):
         super(FixMatchAll, self).__init__(
             values=values,
@@ -1122,4 +1128,6 @@ class FixMatchAll(DictMatchAll):
             key_weightings=tag_weightings,
             description=description,
             category=category,
+            key_index=tag_index,
+            processes=processes,
         )
@@ -1,8 +1,8 @@
 """TODO."""
 import functools
-import inspect
 import os
 import re
+import sys
 import uuid
 
 from testplan import defaults
@@ -12,6 +12,28 @@ from .entries.schemas.base import registry as schema_registry
 from .entries.stdout.base import registry as stdout_registry
 
 
+class CaptureMode(object):
+    """
+    Modes of capturing the code location (file path and line number) of
+    assertions, ``OFF`` skips the caller frame lookup entirely.
+    """
+
+    FULL = 'full'
+    OFF = 'off'
+
+
+def capture_location(entry, mode, depth=2):
+    """
+    Sets the file path and line number of the code that made an entry, which
+    is ``depth`` frames above the caller of this function.
+    """
+    if mode == CaptureMode.OFF:
+        return
+    frame = sys._getframe(depth)  # pylint: disable=protected-access
+    entry.file_path = os.path.abspath(frame.f_code.co_filename)
+    entry.line_no = frame.f_lineno
+
+
 class ExceptionCapture(object):
     """
     Exception capture scope, will be used by exception related assertions.
@@ -60,9 +82,7 @@ class ExceptionCapture(object):
             description=self.description,
         )
 
-        caller_frame = inspect.stack()[1]
-        exc_assertion.file_path = os.path.abspath(caller_frame[1])
-        exc_assertion.line_no = caller_frame[2]
+        capture_location(exc_assertion, self.result.capture_mode)
 
         # We cannot use `bind_entry` here as this block will
         # be run when an exception is raised
@@ -83,11 +103,6 @@ def bind_entry(method):
     def _wrapper(obj, *args, **kwargs):
         entry = method(obj, *args, **kwargs)
 
-        # Second element is the caller
-        caller_frame = inspect.stack()[1]
-        entry.file_path = os.path.abspath(caller_frame[1])
-        entry.line_no = caller_frame[2]
-
         if isinstance(obj, AssertionNamespace):
             result_obj = obj.result
         elif isinstance(obj, Result):
@@ -95,6 +110,7 @@ def bind_entry(method):
         else:
             raise TypeError('Invalid assertion container: {}'.format(obj))
 
+        capture_location(entry, result_obj.capture_mode)
         result_obj.entries.append(entry)
 
         stdout_registry.log_entry(
@@ -737,7 +753,8 @@ class DictNamespace(AssertionNamespace):
     @bind_entry
     def match_all(
         self, values, comparisons,
-        description=None, category=None, key_weightings=None
+        description=None, category=None, key_weightings=None,
+        key_index=None, processes=None
     ):
         """
         Match multiple unordered dictionaries.
@@ -769,6 +786,10 @@ class DictNamespace(AssertionNamespace):
                 # twice the default weight of 100
                 key_weightings={'foo': 200})
 
+        If some keys identify the values, only values and comparisons that
+        have the same values for these keys are compared when they are
+        given as a ``key_index``.
+
         :param values: Original values.
         :type values: ``list`` of ``dict``
         :param comparisons: Comparison objects.
@@ -777,6 +798,12 @@ class DictNamespace(AssertionNamespace):
         :param key_weightings: Per-key overrides that specify a different
                                weight for different keys.
         :type key_weightings: ``dict``
+        :param key_index: Keys that must have the same value (compared as
+                          strings) for a value to match a comparison.
+        :type key_index: ``list``
+        :param processes: Number of processes used to compare large
+                          numbers of values and comparisons.
+        :type processes: ``int``
         :param description: Text description for the assertion.
         :type description: ``str``
         :param category: Custom category that will be used for summarization.
@@ -790,6 +817,8 @@ class DictNamespace(AssertionNamespace):
             key_weightings=key_weightings,
             description=description,
             category=category,
+            key_index=key_index,
+            processes=processes,
         )
 
 
@@ -909,7 +938,8 @@ class FixNamespace(AssertionNamespace):
     @bind_entry
     def match_all(
         self, values, comparisons,
-        description=None, category=None, tag_weightings=None
+        description=None, category=None, tag_weightings=None,
+        tag_index=None, processes=None
     ):
         """
         Match multiple unordered FIX messages.
@@ -943,6 +973,9 @@ class FixNamespace(AssertionNamespace):
                 # twice the default weight of 100
                 key_weightings={36: 200})
 
+        Matching a large number of messages is faster with a ``tag_index``
+        of identifier tags (e.g. ClOrdID), as only messages with the same
+        values for these tags are compared.
 
         :param values: Original values.
         :type values: ``list`` of ``dict``
@@ -952,6 +985,12 @@ class FixNamespace(AssertionNamespace):
         :param tag_weightings: Per-tag overrides that specify a different
                                weight for different tags.
         :type tag_weightings: ``dict``
+        :param tag_index: Tags that must have the same value (compared as
+                          strings) for a message to match a comparison.
+        :type tag_index: ``list``
+        :param processes: Number of processes used to compare large
+                          numbers of messages and comparisons.
+        :type processes: ``int``
         :param description: Text description for the assertion.
         :type description: ``str``
         :param category: Custom category that will be used for summarization.
@@ -965,6 +1004,8 @@ class FixNamespace(AssertionNamespace):
             tag_weightings=tag_weightings,
             description=description,
             category=category,
+            tag_index=tag_index,
+            processes=processes,
         )
 
 
@@ -973,6 +1014,14 @@ class Result(object):
     Contains assertion methods and namespaces for generating test data.
     A new instance of ``Result`` object is passed to each testcase when a
     suite is run.
+
+    :param stdout_style: Style of the assertions logged to stdout.
+    :type stdout_style: :py:class:`~testplan.report.testing.styles.Style`
+    :param continue_on_failure: Continue the testcase after a failure.
+    :type continue_on_failure: ``bool``
+    :param capture_mode: How the file path and line number of assertions are
+      captured, one of :py:class:`CaptureMode` values.
+    :type capture_mode: ``str``
     """
 
     namespaces = {
@@ -987,6 +1036,7 @@ class Result(object):
         self,
         stdout_style=None,
         continue_on_failure=True,
+        capture_mode=CaptureMode.FULL,
         _group_description=None,
         _parent=None,
         _summarize=False,
@@ -999,6 +1049,7 @@ class Result(object):
 
         self.stdout_style = stdout_style or STDOUT_STYLE
         self.continue_on_failure = continue_on_failure
+        self.capture_mode = capture_mode
 
         for key, value in self.get_namespaces().items():
             if hasattr(self, key):
@@ -1018,6 +1069,7 @@ class Result(object):
         return self.__class__(
             stdout_style=self.stdout_style,
             continue_on_failure=self.continue_on_failure,
+            capture_mode=self.capture_mode,
             _group_description=self._group_description,
             _parent=self._parent,
             _summarize=self._summarize,
@@ -1117,6 +1169,7 @@ class Result(object):
         return Result(
             stdout_style=self.stdout_style,
             continue_on_failure=self.continue_on_failure,
+            capture_mode=self.capture_mode,
             _group_description=description,
             _parent=self,
             _summarize=summarize,
@@ -361,7 +361,8 @@ def _testcase_meta(
     summarize=False,
     num_passing=defaults.SUMMARY_NUM_PASSING,
     num_failing=defaults.SUMMARY_NUM_FAILING,
-    key_combs_limit=defaults.SUMMARY_KEY_COMB_LIMIT
+    key_combs_limit=defaults.SUMMARY_KEY_COMB_LIMIT,
+    execution_group=None
 ):
     """
     Wrapper function that allows us to call :py:func:`@testcase <testcase>`
@@ -397,6 +398,7 @@ def _testcase_meta(
                 # this has to be called before wrappers otherwise wrappers can
                 # fail if they rely on __testcase__
                 _mark_function_as_testcase(func)
+                func.execution_group = execution_group
 
                 wrappers = custom_wrappers or []
 
@@ -418,6 +420,7 @@ def _testcase_meta(
             function.summarize_num_passing = num_passing
             function.summarize_num_failing = num_failing
             function.summarize_key_combs_limit = key_combs_limit
+            function.execution_group = execution_group
             function.__tags_index__ = copy.deepcopy(tag_dict)
 
             return _testcase(function)
@@ -456,6 +459,23 @@ def testcase(*args, **kwargs):
         def test_method_1(self):
           ...
 
+    Testcases of the same ``execution_group`` are run concurrently if the
+    MultiTest has a ``thread_pool_size``, other testcases run one at a time
+    before them:
+
+    .. code-block:: python
+
+      @testsuite
+      class SampleSuite(object):
+
+        @testcase(execution_group='fetch')
+        def test_fetch_first(self, env, result):
+          ...
+
+        @testcase(execution_group='fetch')
+        def test_fetch_second(self, env, result):
+          ...
+
     """
     return _selective_call(
         decorator_func=_testcase,